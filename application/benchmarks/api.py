@@ -0,0 +1,282 @@
+"""
+Нагрузочный бенчмарк HTTP API на реальной PostgreSQL.
+
+    python -m application.benchmarks.api [--users 1000] [--categories 20] [--ads 10000]
+                                         [--requests 2000] [--concurrency 50] [--output bench-api.json] [--keep]
+
+Засевает базу из настроек (миграции должны быть применены) пользователями, категориями и опубликованными
+объявлениями, затем прогоняет приложение in-process конкурентными клиентами с подписанными JWT
+по /advertisement/search, /advertisement/all, GET /advertisement/ и /user/search.
+По каждому сценарию в JSON пишутся RPS, p50/p95/p99 и число SQL-запросов на HTTP-запрос,
+так что регрессии слоёв репозиториев и сериализации видны до деплоя.
+/all и /search не проходят авторизацию (EXCLUDE_PATHS) и отдаются из кэша ответов, поэтому сценарии без
+суффикса _cached выполняются в обход кэша и с разными параметрами, а кэшированные вынесены отдельно.
+Сценарии _orm_loader повторяют /all и /search на прежнем загрузчике (ORM + selectin, см. legacy_loader),
+сводка loader_comparison сопоставляет запросы к БД и p50 обоих путей.
+Засеянные строки помечены идентификатором прогона и удаляются в конце, если не указан --keep.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import random
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional
+from urllib.parse import urlencode
+from uuid import UUID, uuid4
+
+from sqlalchemy import delete, insert
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from application.benchmarks.asgi import ASGIResponse, request, run_load
+from application.benchmarks.legacy_loader import orm_loader
+from application.benchmarks.middleware import issue_access_token
+from application.domain.value_objects.ad import Status as AdStatus
+from application.domain.value_objects.user import Role, Status as UserStatus
+from application.infrastructure.database import engine, replica_engine
+from application.infrastructure.instrumentation import RequestMetrics, register_engine_events, request_metrics
+from application.infrastructure.serialization import JSON_BACKEND, dumps
+from application.repos.models import Advertisement, Category, User
+from application.services.ad.cache import advertisement_response_cache
+from application.web.app import app
+
+SEED_CHUNK_SIZE = 1000
+USER_SEARCH_BATCH = 50
+CITIES: tuple[str, ...] = ("Москва", "Казань", "Самара", "Тверь", "Омск")
+TITLE_WORDS: tuple[str, ...] = ("Велосипед", "Диван", "Ноутбук", "Коляска", "Палатка", "Гитара")
+PRICE_BOUNDS: tuple[int, ...] = (0, 500, 1000, 5000, 10000, 50000)
+
+
+@dataclass(slots=True)
+class SeedData:
+    run_id: str
+    user_oids: list[UUID]
+    category_oids: list[UUID]
+    category_titles: list[str]
+    ad_oids: list[UUID]
+
+
+@dataclass(slots=True)
+class Scenario:
+    name: str
+    method: str
+    path: str
+    make_query: Callable[[], dict[str, Any]] = dict
+    make_body: Callable[[], bytes] = lambda: b""
+    authorized: bool = True
+    # False - кэш ответов /all и /search на время сценария не отдаёт сохранённые страницы
+    cached: bool = False
+    # True - объявления читаются прежним ORM-загрузчиком с selectin вместо проекции с JOIN
+    orm_loader: bool = False
+
+
+def chunked(rows: list[dict[str, Any]]) -> Iterator[list[dict[str, Any]]]:
+    for start in range(0, len(rows), SEED_CHUNK_SIZE):
+        yield rows[start:start + SEED_CHUNK_SIZE]
+
+
+async def insert_rows(connection: AsyncConnection, model: type, rows: list[dict[str, Any]]) -> None:
+    for chunk in chunked(rows):
+        await connection.execute(insert(model), chunk)
+
+
+async def seed(args: argparse.Namespace, rnd: random.Random) -> SeedData:
+    run_id: str = uuid4().hex[:8]
+    now: datetime = datetime.utcnow()
+    phone_base: int = rnd.randrange(10 ** 9 - args.users)
+
+    users: list[dict[str, Any]] = [{
+        "oid": uuid4(), "first_name": "Иван", "last_name": "Петров", "middle_name": None,
+        "email": f"bench-{run_id}-{number}@bench.local", "role": Role.USER.name,
+        "number_phone": f"79{phone_base + number:09d}", "time_call": "10-18", "status": UserStatus.ACTIVE.name,
+    } for number in range(args.users)]
+    categories: list[dict[str, Any]] = [{
+        "oid": uuid4(), "title": f"Бенчмарк {run_id} {number}", "code": f"bench-{run_id}-{number}",
+        "description": "",
+    } for number in range(args.categories)]
+    advertisements: list[dict[str, Any]] = [{
+        "oid": uuid4(), "title": f"{rnd.choice(TITLE_WORDS)} {number}", "city": rnd.choice(CITIES),
+        "description": f"{rnd.choice(TITLE_WORDS).lower()} в хорошем состоянии",
+        "approved_at": now - timedelta(seconds=number), "price": Decimal(rnd.randrange(100, 100000)),
+        "number_of_views": 0, "photo": [f"https://img.bench.local/{run_id}/{number}.jpg"],
+        "status": AdStatus.ACTIVE.name,
+        "author_id": rnd.choice(users)["oid"], "category_id": rnd.choice(categories)["oid"],
+    } for number in range(args.ads)]
+
+    async with engine.begin() as connection:
+        await insert_rows(connection, User, users)
+        await insert_rows(connection, Category, categories)
+        await insert_rows(connection, Advertisement, advertisements)
+
+    return SeedData(
+        run_id=run_id,
+        user_oids=[user["oid"] for user in users],
+        category_oids=[category["oid"] for category in categories],
+        category_titles=[category["title"] for category in categories],
+        ad_oids=[advertisement["oid"] for advertisement in advertisements],
+    )
+
+
+async def cleanup(data: SeedData) -> None:
+    async with engine.begin() as connection:
+        for start in range(0, len(data.user_oids), SEED_CHUNK_SIZE):
+            chunk: list[UUID] = data.user_oids[start:start + SEED_CHUNK_SIZE]
+            await connection.execute(delete(Advertisement).where(Advertisement.author_id.in_(chunk)))
+            await connection.execute(delete(User).where(User.oid.in_(chunk)))
+        await connection.execute(delete(Category).where(Category.oid.in_(data.category_oids)))
+
+
+@contextmanager
+def response_cache(enabled: bool) -> Iterator[None]:
+    """
+    Без кэша get всегда промахивается, а put по-прежнему выполняется: замеряется путь промаха целиком
+    """
+    advertisement_response_cache.invalidate()
+    if not enabled:
+        advertisement_response_cache.get = lambda key: None
+    try:
+        yield
+    finally:
+        if not enabled:
+            del advertisement_response_cache.get
+        advertisement_response_cache.invalidate()
+
+
+def build_scenarios(data: SeedData, rnd: random.Random) -> list[Scenario]:
+    def page_limit() -> int:
+        return rnd.randint(10, 30)
+
+    def search_query() -> dict[str, Any]:
+        price_from, price_to = sorted(rnd.sample(PRICE_BOUNDS, 2))
+        return {"city": rnd.choice(CITIES), "category": rnd.choice(data.category_titles),
+                "price_from": price_from, "price_to": price_to, "limit": page_limit()}
+
+    def popular_search_query() -> dict[str, Any]:
+        return {"city": rnd.choice(CITIES), "category": rnd.choice(data.category_titles), "limit": 20}
+
+    def full_text_query() -> dict[str, Any]:
+        first, second = rnd.sample(TITLE_WORDS, 2)
+        query_text: str = rnd.choice((first, f"{first} or {second}", f"{first} -{second}", f"{first} состоянии"))
+        return {"q": query_text.lower(), "limit": page_limit()}
+
+    def user_search_body() -> bytes:
+        return dumps([str(oid) for oid in rnd.sample(data.user_oids, min(USER_SEARCH_BATCH, len(data.user_oids)))])
+
+    return [
+        Scenario("advertisement_all", "GET", "/api/v1/advertisement/all", lambda: {"limit": page_limit()},
+                 authorized=False),
+        Scenario("advertisement_all_cached", "GET", "/api/v1/advertisement/all", lambda: {"limit": 20},
+                 authorized=False, cached=True),
+        Scenario("advertisement_search", "GET", "/api/v1/advertisement/search", search_query, authorized=False),
+        Scenario("advertisement_search_cached", "GET", "/api/v1/advertisement/search", popular_search_query,
+                 authorized=False, cached=True),
+        Scenario("advertisement_all_orm_loader", "GET", "/api/v1/advertisement/all", lambda: {"limit": page_limit()},
+                 authorized=False, orm_loader=True),
+        Scenario("advertisement_search_orm_loader", "GET", "/api/v1/advertisement/search", search_query,
+                 authorized=False, orm_loader=True),
+        Scenario("advertisement_full_text", "GET", "/api/v1/advertisement/search", full_text_query,
+                 authorized=False),
+        Scenario("advertisement_get", "GET", "/api/v1/advertisement/",
+                 lambda: {"advertisement_oid": rnd.choice(data.ad_oids)}),
+        Scenario("user_search", "POST", "/api/v1/user/search", make_body=user_search_body),
+    ]
+
+
+async def run_scenario(scenario: Scenario, token: str, args: argparse.Namespace) -> dict[str, Any]:
+    headers: list[tuple[str, str]] = [("Content-Type", "application/json")]
+    if scenario.authorized:
+        headers.append(("Authorization", f"Bearer {token}"))
+
+    collected: list[RequestMetrics] = []
+
+    async def send_request() -> ASGIResponse:
+        # Метрики ставятся в ContextVar задачи воркера: события движка видят их через greenlet SQLAlchemy
+        metrics = RequestMetrics(started=time.perf_counter())
+        context_token = request_metrics.set(metrics)
+        try:
+            return await request(app, scenario.method, scenario.path, headers=headers,
+                                 query_string=urlencode(scenario.make_query()), body=scenario.make_body())
+        finally:
+            request_metrics.reset(context_token)
+            collected.append(metrics)
+
+    with response_cache(enabled=scenario.cached), orm_loader(enabled=scenario.orm_loader):
+        await run_load(send_request, total=args.warmup, concurrency=args.concurrency)
+        collected.clear()
+
+        result = await run_load(send_request, total=args.requests, concurrency=args.concurrency)
+    summary: dict[str, Any] = result.to_dict()
+    summary["queries_per_request"] = round(sum(metrics.sql_statements for metrics in collected) / len(collected), 2)
+    summary["db_ms_per_request"] = round(sum(metrics.db_time for metrics in collected) / len(collected) * 1000, 3)
+    print(f"{scenario.name:36} {summary['rps']:10.1f} rps  p50 {summary['p50_ms']:8.2f} ms  "
+          f"p95 {summary['p95_ms']:8.2f} ms  p99 {summary['p99_ms']:8.2f} ms  "
+          f"{summary['queries_per_request']:5.2f} q/req  errors {summary['errors']}")
+    return summary
+
+
+def compare_loaders(scenarios: dict[str, Any]) -> dict[str, Any]:
+    """Проекция с JOIN против прежнего ORM-загрузчика на одних и тех же запросах без кэша"""
+    comparison: dict[str, Any] = {}
+    for name in ("advertisement_all", "advertisement_search"):
+        projection, orm = scenarios[name], scenarios[f"{name}_orm_loader"]
+        comparison[name] = {
+            "queries_per_request": {"orm_loader": orm["queries_per_request"],
+                                    "projection": projection["queries_per_request"]},
+            "p50_ms": {"orm_loader": orm["p50_ms"], "projection": projection["p50_ms"]},
+            "p50_speedup": round(orm["p50_ms"] / projection["p50_ms"], 2),
+        }
+        print(f"{name:36} queries {orm['queries_per_request']:5.2f} -> {projection['queries_per_request']:5.2f}  "
+              f"p50 {orm['p50_ms']:8.2f} -> {projection['p50_ms']:8.2f} ms")
+    return comparison
+
+
+async def run_benchmark(args: argparse.Namespace) -> dict[str, Any]:
+    rnd = random.Random(args.seed)
+    register_engine_events(engine, replica_engine)
+    data: Optional[SeedData] = None
+    try:
+        data = await seed(args, rnd)
+        token: str = issue_access_token()
+        scenarios: dict[str, Any] = {}
+        for scenario in build_scenarios(data, rnd):
+            scenarios[scenario.name] = await run_scenario(scenario, token, args)
+    finally:
+        if data and not args.keep:
+            await cleanup(data)
+        await engine.dispose()
+
+    return {
+        "timestamp": datetime.utcnow().isoformat(),
+        "json_backend": JSON_BACKEND,
+        "config": {name: value for name, value in vars(args).items() if name != "output"},
+        "scenarios": scenarios,
+        "loader_comparison": compare_loaders(scenarios),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Нагрузочный бенчмарк HTTP API на засеянной PostgreSQL")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--categories", type=int, default=20)
+    parser.add_argument("--ads", type=int, default=10000)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", type=Path, default=Path("bench-api.json"))
+    parser.add_argument("--keep", action="store_true", help="не удалять засеянные данные после прогона")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    report: dict[str, Any] = asyncio.run(run_benchmark(args))
+    args.output.write_text(json.dumps(report, ensure_ascii=False, indent=2))
+    print(f"results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Минимальный in-process ASGI клиент и нагрузочный цикл для бенчмарков: без сети и сторонних HTTP клиентов,
+чтобы в замер попадала только стоимость самого приложения.
+"""
+import asyncio
+import statistics
+import time
+from dataclasses import dataclass
+from typing import Callable, Iterable
+
+from starlette.types import ASGIApp, Message
+
+
+@dataclass(slots=True)
+class ASGIResponse:
+    status_code: int
+    headers: list[tuple[bytes, bytes]]
+    body: bytes
+
+
+async def request(
+    app: ASGIApp,
+    method: str,
+    path: str,
+    headers: Iterable[tuple[str, str]] = (),
+    query_string: str = "",
+    body: bytes = b"",
+) -> ASGIResponse:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": query_string.encode(),
+        "headers": [(name.lower().encode(), value.encode()) for name, value in headers],
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+    }
+    request_sent = False
+    response_complete = asyncio.Event()
+    response = ASGIResponse(status_code=0, headers=[], body=b"")
+
+    async def receive() -> Message:
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        await response_complete.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: Message) -> None:
+        if message["type"] == "http.response.start":
+            response.status_code = message["status"]
+            response.headers = list(message.get("headers", []))
+        elif message["type"] == "http.response.body":
+            response.body += message.get("body", b"")
+            if not message.get("more_body", False):
+                response_complete.set()
+
+    await app(scope, receive, send)
+    return response
+
+
+@dataclass(slots=True)
+class LoadResult:
+    requests: int
+    errors: int
+    elapsed: float
+    latencies: list[float]
+    # Сколько запросов реально выполнялось одновременно: воркеры без await внутри приложения идут по очереди
+    max_in_flight: int = 0
+
+    @property
+    def rps(self) -> float:
+        return self.requests / self.elapsed
+
+    def percentile(self, percent: float) -> float:
+        return statistics.quantiles(self.latencies, n=100, method="inclusive")[int(percent) - 1] * 1000
+
+    def to_dict(self) -> dict[str, float]:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "rps": round(self.rps, 1),
+            "p50_ms": round(self.percentile(50), 3),
+            "p95_ms": round(self.percentile(95), 3),
+            "p99_ms": round(self.percentile(99), 3),
+            "max_in_flight": self.max_in_flight,
+        }
+
+
+async def run_load(
+    send_request: Callable[[], "asyncio.Future[ASGIResponse]"],
+    total: int,
+    concurrency: int,
+    expected_status: int = 200,
+) -> LoadResult:
+    """
+    total запросов, которые выполняют concurrency воркеров; латентность замеряется на каждый запрос
+    """
+    latencies: list[float] = []
+    errors = 0
+    remaining = total
+    in_flight = 0
+    max_in_flight = 0
+
+    async def worker() -> None:
+        nonlocal errors, remaining, in_flight, max_in_flight
+        while remaining > 0:
+            remaining -= 1
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            started = time.perf_counter()
+            try:
+                response: ASGIResponse = await send_request()
+            finally:
+                in_flight -= 1
+            latencies.append(time.perf_counter() - started)
+            if response.status_code != expected_status:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return LoadResult(requests=total, errors=errors, elapsed=time.perf_counter() - started, latencies=latencies,
+                      max_in_flight=max_in_flight)
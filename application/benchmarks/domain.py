@@ -0,0 +1,99 @@
+"""
+Микробенчмарки доменного слоя: стоимость одного объекта на горячих путях.
+
+    python -m application.benchmarks.domain [--number 2000] [--repeat 5] [--output bench-domain.json]
+
+Замеряются валидаторы value objects (в т.ч. прежний вариант с регуляркой-строкой для сравнения),
+from_json сущностей, маппинг моделей from_entity/to_entity/from_row и to_schema/to_dict выходных схем.
+С --output результаты (µs на объект) пишутся в JSON.
+Те же случаи замеряет pytest-benchmark в application/tests/test_domain_benchmarks.py (make bench_domain):
+там сохранение результатов и сравнение между коммитами (--benchmark-autosave, --benchmark-compare).
+"""
+import argparse
+import json
+import re
+import timeit
+from pathlib import Path
+from typing import Any, Callable
+
+from application.benchmarks.entities import make_row
+from application.domain.entities.ad import Advertisement as DomainAdvertisement
+from application.domain.entities.category_ad import Category as DomainCategory
+from application.domain.entities.user import User as DomainUser
+from application.domain.value_objects.user import EMAIL_PATTERN, Email, FullName
+from application.repos.models import Advertisement, Category, User
+from application.web.views.ad.schemas import AdvertisementOutput
+from application.web.views.user.schemas import UserOutput
+
+EMAIL = "ivan.petrov@mail.ru"
+FULL_NAME = "Иванов"
+USER_JSON: dict[str, Any] = {
+    "first_name": "Иван", "last_name": "Петров", "middle_name": "Иванович", "email": EMAIL,
+    "number_phone": "79991234567", "time_call": "10-18", "status": "ACTIVE",
+}
+CATEGORY_JSON: dict[str, Any] = {"title": "Спорт и отдых", "description": "Велосипеды, лыжи, палатки"}
+
+
+def legacy_email_match(value: str) -> bool:
+    """Прежняя проверка: шаблон строкой, re ищет скомпилированный вариант в своём кэше на каждый вызов"""
+    return re.match(r"^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$", value) is not None
+
+
+def build_cases() -> dict[str, Callable[[], Any]]:
+    user: DomainUser = DomainUser.from_json(USER_JSON)
+    category: DomainCategory = DomainCategory.from_json(CATEGORY_JSON)
+    advertisement_json: dict[str, Any] = {
+        "title": "Велосипед", "city": "Москва", "description": "Почти новый", "price": "15000.00",
+        "photo": ["https://img/1.jpg"], "author": user, "category": category,
+    }
+    advertisement: DomainAdvertisement = DomainAdvertisement.from_json(advertisement_json)
+    user_model: User = User.from_entity(user)
+    category_model: Category = Category.from_entity(category)
+    row = make_row(1)
+
+    return {
+        "email regex (string pattern)": lambda: legacy_email_match(EMAIL),
+        "email regex (precompiled)": lambda: EMAIL_PATTERN.match(EMAIL) is not None,
+        "Email(...)": lambda: Email(EMAIL),
+        "FullName(...)": lambda: FullName(FULL_NAME),
+        "User.from_json": lambda: DomainUser.from_json(USER_JSON),
+        "Category.from_json": lambda: DomainCategory.from_json(CATEGORY_JSON),
+        "Advertisement.from_json": lambda: DomainAdvertisement.from_json(advertisement_json),
+        "models.User.from_entity": lambda: User.from_entity(user),
+        "models.User.to_entity": user_model.to_entity,
+        "models.Category.from_entity": lambda: Category.from_entity(category),
+        "models.Category.to_entity": category_model.to_entity,
+        "Category.trusted (field defaults)": lambda: DomainCategory.trusted(title="Спорт", code="sport"),
+        "models.Advertisement.from_entity": lambda: Advertisement.from_entity(advertisement),
+        "models.Advertisement.from_row": lambda: Advertisement.from_row(row),
+        "UserOutput.to_schema": lambda: UserOutput.to_schema(user),
+        "UserOutput.to_dict": lambda: UserOutput.to_dict(user),
+        "AdvertisementOutput.to_schema": lambda: AdvertisementOutput.to_schema(advertisement),
+        "AdvertisementOutput.to_dict": lambda: AdvertisementOutput.to_dict(advertisement),
+    }
+
+
+def measure(func: Callable[[], Any], number: int, repeat: int) -> float:
+    best: float = min(timeit.repeat(func, number=number, repeat=repeat))
+    return best / number * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Стоимость операций доменного слоя на один объект")
+    parser.add_argument("--number", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", type=Path, default=None)
+    args = parser.parse_args()
+
+    results: dict[str, float] = {}
+    for name, func in build_cases().items():
+        results[name] = round(measure(func, args.number, args.repeat), 3)
+        print(f"{name:40} {results[name]:10.3f} µs/op")
+
+    if args.output:
+        args.output.write_text(json.dumps(results, ensure_ascii=False, indent=2))
+        print(f"results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
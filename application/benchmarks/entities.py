@@ -0,0 +1,97 @@
+"""
+Микробенчмарк маппинга строк БД в доменные сущности.
+
+    python -m application.benchmarks.entities [--rows 1000] [--repeat 5]
+
+Сравнивает сборку с полной валидацией (pydantic + валидаторы value objects) с доверенной сборкой
+через trusted, которой пользуется слой репозиториев.
+UUID в строках - того же типа, что отдаёт asyncpg (Uuid SQLAlchemy их не конвертирует): его str()
+реализован в C и на порядок дешевле, чем у uuid.UUID из стандартной библиотеки.
+"""
+import argparse
+import timeit
+from collections import namedtuple
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Callable
+from uuid import uuid4
+
+from asyncpg.pgproto.pgproto import UUID as AsyncpgUUID
+
+from application.domain.entities.ad import Advertisement as DomainAdvertisement
+from application.domain.entities.category_ad import Category as DomainCategory
+from application.domain.entities.user import User as DomainUser
+from application.domain.value_objects import user as user_values
+from application.domain.value_objects.ad import Photo, Status
+from application.repos.ad import ADVERTISEMENT_PROJECTION
+from application.repos.models import Advertisement
+
+ProjectionRow = namedtuple("ProjectionRow", [column.key for column in ADVERTISEMENT_PROJECTION])
+
+
+def asyncpg_uuid() -> AsyncpgUUID:
+    return AsyncpgUUID(uuid4().bytes)
+
+
+def make_row(number: int) -> ProjectionRow:
+    now = datetime.utcnow()
+    return ProjectionRow(
+        oid=asyncpg_uuid(), title=f"Велосипед {number}", city="Москва", description="Почти новый", created_at=now,
+        updated_at=now, approved_at=now, price=Decimal("15000.00"), number_of_views=number,
+        photo=["https://img/1.jpg"], status="ACTIVE", author_id=asyncpg_uuid(), category_id=asyncpg_uuid(),
+        author_oid=asyncpg_uuid(), author_first_name="Иван", author_last_name="Петров", author_middle_name="Иванович",
+        author_email=f"user{number}@mail.ru", author_role="USER", author_number_phone="79991234567",
+        author_time_call="10-18", author_status="ACTIVE", author_created_at=now, author_updated_at=now,
+        category_oid=asyncpg_uuid(), category_title="Спорт", category_code="sport", category_description="",
+        category_created_at=now, category_updated_at=now,
+    )
+
+
+def validated_from_row(row: ProjectionRow) -> DomainAdvertisement:
+    return DomainAdvertisement(
+        oid=str(row.oid), title=row.title, city=row.city, description=row.description,
+        created_at=row.created_at, updated_at=row.updated_at, approved_at=row.approved_at, price=row.price,
+        number_of_views=row.number_of_views, photo=Photo(row.photo), status=Status[row.status],
+        author=DomainUser(
+            oid=str(row.author_oid),
+            first_name=user_values.FullName(row.author_first_name),
+            last_name=user_values.FullName(row.author_last_name),
+            middle_name=user_values.FullName(row.author_middle_name),
+            email=user_values.Email(row.author_email),
+            number_phone=user_values.Phone(row.author_number_phone),
+            role=user_values.Role[row.author_role],
+            time_call=row.author_time_call,
+            status=user_values.Status[row.author_status],
+            created_at=row.author_created_at,
+            updated_at=row.author_updated_at
+        ),
+        category=DomainCategory(
+            oid=str(row.category_oid), title=row.category_title, code=row.category_code,
+            description=row.category_description, created_at=row.category_created_at,
+            updated_at=row.category_updated_at
+        )
+    )
+
+
+def measure(name: str, func: Callable[[Any], Any], items: list[Any], repeat: int) -> float:
+    best: float = min(timeit.repeat(lambda: [func(item) for item in items], number=1, repeat=repeat))
+    per_row_us: float = best / len(items) * 1_000_000
+    print(f"{name:40} {per_row_us:10.2f} µs/row")
+    return per_row_us
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Стоимость маппинга строки БД в доменную сущность")
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rows: list[ProjectionRow] = [make_row(number) for number in range(args.rows)]
+
+    validated = measure("row -> entity (validated)", validated_from_row, rows, args.repeat)
+    trusted = measure("row -> entity (trusted)", Advertisement.from_row, rows, args.repeat)
+    print(f"{'speed-up':40} {validated / trusted:10.2f}x")
+
+
+if __name__ == "__main__":
+    main()
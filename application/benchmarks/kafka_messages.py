@@ -0,0 +1,109 @@
+"""
+Пропускная способность разбора событий Kafka на синтетических UserRegisteredEvent.
+
+    python -m application.benchmarks.kafka_messages [--messages 50000] [--repeat 5]
+
+Сравнивается прежний конвейер (bytes -> str, json.loads ради type, повторный json.loads в MessageHandler)
+с текущим: один разбор байтов декодером DecodeKafkaMessage. Обработчик пустой - замеряется только конвейер.
+"""
+import argparse
+import asyncio
+import json
+import time
+from typing import Any, Awaitable, Callable
+from uuid import uuid4
+
+from application.infrastructure.brokers.consumers.handlers import MessageHandler
+from application.infrastructure.brokers.consumers.utils import DecodeKafkaMessage, definition_message_type
+from application.infrastructure.serialization import JSON_BACKEND
+
+MESSAGE_TYPE = "UserRegisteredEvent"
+
+
+def make_payload(number: int) -> bytes:
+    event = {
+        "type": MESSAGE_TYPE,
+        "message": {
+            "oid": str(uuid4()),
+            "first_name": "Иван",
+            "last_name": "Петров",
+            "middle_name": "Иванович",
+            "email": f"user{number}@mail.ru",
+            "number_phone": "79991234567",
+            "time_call": "10-18",
+            "status": "ACTIVE",
+            "created_at": "2024-07-01T12:00:00",
+        },
+    }
+    return json.dumps(event, ensure_ascii=False).encode("utf-8")
+
+
+class LegacyMessageHandler(MessageHandler):
+    """
+    Прежняя реализация: сообщение приходит строкой и разбирается повторно
+    """
+
+    async def handle_message(self, message_type: str, message: str):
+        handler, predicate = self.handlers[message_type]
+        decoded_message: dict = json.loads(message)
+        if predicate(decoded_message):
+            await handler(decoded_message)
+
+
+def build_handler(handler_class: type[MessageHandler]) -> MessageHandler:
+    message_handler = handler_class()
+
+    @message_handler.register_handler(message_type=MESSAGE_TYPE, predicate=lambda message: True)
+    async def create_user(decode_message: dict) -> None:
+        return None
+
+    return message_handler
+
+
+async def legacy_pipeline(payloads: list[bytes]) -> None:
+    message_handler = build_handler(LegacyMessageHandler)
+    for payload in payloads:
+        decode_message: str = payload.decode("utf-8")
+        message_type: str = json.loads(decode_message).get("type")
+        await message_handler.handle_message(message_type, decode_message)
+
+
+def single_parse_pipeline(decoder: DecodeKafkaMessage) -> Callable[[list[bytes]], Awaitable[None]]:
+    async def pipeline(payloads: list[bytes]) -> None:
+        message_handler = build_handler(MessageHandler)
+        for payload in payloads:
+            decode_message: dict = decoder.decode(payload)
+            await message_handler.handle_message(definition_message_type(decode_message), decode_message)
+
+    return pipeline
+
+
+def measure(name: str, pipeline: Callable[[list[bytes]], Awaitable[Any]], payloads: list[bytes], repeat: int) -> float:
+    timings: list[float] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        asyncio.run(pipeline(payloads))
+        timings.append(time.perf_counter() - started)
+
+    rate: float = len(payloads) / min(timings)
+    print(f"{name:40} {rate:12.0f} msg/s")
+    return rate
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Пропускная способность разбора событий Kafka")
+    parser.add_argument("--messages", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    payloads: list[bytes] = [make_payload(number) for number in range(args.messages)]
+
+    legacy = measure("double parse (json)", legacy_pipeline, payloads, args.repeat)
+    measure("single parse (json)", single_parse_pipeline(DecodeKafkaMessage(json.loads)), payloads, args.repeat)
+    current = measure(f"single parse ({JSON_BACKEND})", single_parse_pipeline(DecodeKafkaMessage()), payloads,
+                      args.repeat)
+    print(f"{'speed-up':40} {current / legacy:12.2f}x")
+
+
+if __name__ == "__main__":
+    main()
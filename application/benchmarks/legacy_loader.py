@@ -0,0 +1,95 @@
+"""
+Прежний путь чтения объявлений для сравнения в бенчмарке API.
+
+ORM-объекты Advertisement с selectin-загрузкой автора, категории и истории модерации
+(отдельный запрос на каждую связь) вместо одной проекции с JOIN.
+Сущности собираются тем же trusted, что и в from_row, поэтому разница в замерах - только загрузчик.
+Поддерживаются первые страницы /all и /search без курсора и без полнотекстового запроса.
+"""
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+
+from sqlalchemy import Select, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import selectinload
+
+from application.domain.entities.ad import Advertisement as DomainAdvertisement
+from application.domain.value_objects.ad import Photo, Status
+from application.domain.value_objects.pagination import Cursor
+from application.exceptions.db import DBError
+from application.repos.ad import FEED_ORDER, SQLAlchemyAdvertisementRepository, status_filter
+from application.repos.models import Advertisement
+from application.repos.uow import unit_of_work
+
+RELATIONSHIP_LOADERS = (
+    selectinload(Advertisement.user),
+    selectinload(Advertisement.category),
+    selectinload(Advertisement.moderation),
+)
+
+
+def to_entity(model: Advertisement) -> DomainAdvertisement:
+    return DomainAdvertisement.trusted(
+        oid=str(model.oid),
+        title=model.title,
+        city=model.city,
+        description=model.description,
+        created_at=model.created_at,
+        updated_at=model.updated_at,
+        approved_at=model.approved_at,
+        price=model.price,
+        number_of_views=model.number_of_views,
+        photo=Photo.trusted(model.photo),
+        status=Status[model.status],
+        author=model.user.to_entity(),
+        category=model.category.to_entity()
+    )
+
+
+class ORMAdvertisementRepository(SQLAlchemyAdvertisementRepository):
+
+    async def all(self,
+                  limit: int,
+                  cursor: Optional[Cursor] = None,
+                  statuses: Optional[tuple[str, ...]] = None) -> list[DomainAdvertisement]:
+        query = select(Advertisement).options(*RELATIONSHIP_LOADERS)
+        if statuses:
+            query = query.where(status_filter(statuses))
+        return await self._load_first_page(query, limit=limit, cursor=cursor)
+
+    async def get_all_by_params(self,
+                                params: dict[str, Any],
+                                limit: int,
+                                cursor: Optional[Cursor] = None) -> list[DomainAdvertisement]:
+        # WHERE поискового запроса ссылается только на колонки advertisement, поэтому фильтры те же
+        projection: Select = self.build_search_query(params=params, limit=limit)
+        query = select(Advertisement).options(*RELATIONSHIP_LOADERS).where(projection.whereclause)
+        return await self._load_first_page(query, limit=limit, cursor=cursor)
+
+    async def _load_first_page(self, query: Select, limit: int, cursor: Optional[Cursor]) -> list[DomainAdvertisement]:
+        if cursor is not None:
+            raise ValueError("The ORM loader is measured on first pages only")
+
+        try:
+            result = await self.session.execute(query.order_by(*FEED_ORDER).limit(limit))
+            return [to_entity(model) for model in result.scalars()]
+
+        except SQLAlchemyError as exc:
+            raise DBError(exc)
+
+
+@contextmanager
+def orm_loader(enabled: bool) -> Iterator[None]:
+    """
+    Подменяет репозиторий объявлений в unit of work на время сценария
+    """
+    if not enabled:
+        yield
+        return
+
+    original: type[SQLAlchemyAdvertisementRepository] = unit_of_work.SQLAlchemyAdvertisementRepository
+    unit_of_work.SQLAlchemyAdvertisementRepository = ORMAdvertisementRepository
+    try:
+        yield
+    finally:
+        unit_of_work.SQLAlchemyAdvertisementRepository = original
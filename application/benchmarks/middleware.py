@@ -0,0 +1,115 @@
+"""
+Нагрузочное сравнение AuthMiddleware (чистый ASGI) с прежней реализацией на BaseHTTPMiddleware.
+
+    python -m application.benchmarks.middleware [--requests 20000] [--concurrency 50] [--repeat 3]
+
+Приложение с одним защищённым эндпоинтом прогоняется in-process, без сети и БД.
+Эндпоинт, как настоящий с I/O, один раз отдаёт управление циклу: иначе запросы через чистый ASGI
+ни разу не уступают друг другу и выполняются по очереди, а BaseHTTPMiddleware - конкурентно,
+и сравнение шло бы при разной фактической конкурентности (она выводится как in-flight).
+Токен подписывается PRIVATE_KEY из настроек и проверяется как в боевом приложении (включая кэш payload).
+"""
+import argparse
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+from uuid import uuid4
+
+import jwt
+from fastapi import FastAPI, Request, Response, status as status_code
+from fastapi.responses import JSONResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from application.benchmarks.asgi import ASGIResponse, LoadResult, request, run_load
+from application.config import settings
+from application.context import get_payload_current_user, user as user_context
+from application.exceptions.domain import InvalidTokenError
+from application.infrastructure.middlewares import AuthMiddleware
+from application.web.services.token.token_jwt import token_manager, ACCESS_TOKEN_TYPE
+
+PATH = "/api/v1/user/me"
+
+
+class LegacyAuthMiddleware(BaseHTTPMiddleware):
+    """
+    Прежняя реализация, оставлена только как база для сравнения
+    """
+    EXCLUDE_PATHS: tuple[str] = settings.auth_jwt.EXCLUDE_PATHS
+
+    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+        try:
+            if request.url.path.endswith(self.EXCLUDE_PATHS):
+                return await call_next(request)
+
+            access_token_payload: dict = await token_manager.get_current_token_payload(request=request)
+            token_manager.validate_token_type(access_token_payload, ACCESS_TOKEN_TYPE)
+            user_context.set(access_token_payload)
+            return await call_next(request)
+
+        except (jwt.PyJWTError, InvalidTokenError):
+            return JSONResponse(
+                status_code=status_code.HTTP_401_UNAUTHORIZED,
+                content={"status": "error", "data": f"{datetime.now()}", "detail": "Unauthorized"}
+            )
+
+
+def build_app(middleware_class: type) -> FastAPI:
+    app = FastAPI()
+
+    @app.get(PATH)
+    async def me() -> dict:
+        await asyncio.sleep(0)
+        return {"sub": get_payload_current_user()["sub"]}
+
+    app.add_middleware(middleware_class)
+    return app
+
+
+def issue_access_token() -> str:
+    payload = {
+        "sub": str(uuid4()),
+        "type": ACCESS_TOKEN_TYPE,
+        "exp": datetime.now(timezone.utc) + timedelta(minutes=settings.auth_jwt.ACCESS_TOKEN_EXPIRE_MINUTE),
+    }
+    return jwt.encode(payload, settings.auth_jwt.PRIVATE_KEY.read_text(), algorithm=settings.auth_jwt.ALGORITHM)
+
+
+async def measure(name: str, middleware_class: type, token: str, args: argparse.Namespace) -> LoadResult:
+    app = build_app(middleware_class)
+    headers = (("Authorization", f"Bearer {token}"),)
+
+    def send_request() -> "asyncio.Future[ASGIResponse]":
+        return request(app, "GET", PATH, headers=headers)
+
+    await run_load(send_request, total=min(args.requests, 1000), concurrency=args.concurrency)
+    results: list[LoadResult] = [
+        await run_load(send_request, total=args.requests, concurrency=args.concurrency) for _ in range(args.repeat)
+    ]
+    best: LoadResult = max(results, key=lambda result: result.rps)
+    stats = best.to_dict()
+    print(f"{name:22} {stats['rps']:10.1f} rps  p50 {stats['p50_ms']:7.3f} ms  "
+          f"p99 {stats['p99_ms']:7.3f} ms  in-flight {stats['max_in_flight']:4}  errors {stats['errors']}")
+    return best
+
+
+async def compare(args: argparse.Namespace) -> None:
+    token: str = issue_access_token()
+    legacy = await measure("BaseHTTPMiddleware", LegacyAuthMiddleware, token, args)
+    current = await measure("pure ASGI", AuthMiddleware, token, args)
+    print(f"{'speed-up (rps)':22} {current.rps / legacy.rps:10.2f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Нагрузочное сравнение реализаций AuthMiddleware")
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    logging.disable(logging.ERROR)
+    asyncio.run(compare(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Сериализация страницы объявлений: модели pydantic + response_model против dict + быстрого JSON.
+
+    python -m application.benchmarks.serialization [--items 100] [--requests 2000]
+
+Оба варианта прогоняются как эндпоинты FastAPI in-process, без БД: страница собирается заранее.
+"""
+import argparse
+import asyncio
+
+from fastapi import FastAPI
+
+from application.benchmarks.asgi import LoadResult, request, run_load
+from application.benchmarks.entities import make_row
+from application.domain.value_objects.pagination import Page
+from application.infrastructure.serialization import JSON_BACKEND
+from application.repos.models import Advertisement
+from application.web.responses import FastJSONResponse
+from application.web.views.ad.schemas import AdvertisementPageOutput
+
+
+def build_app(page: Page) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/models", response_model=AdvertisementPageOutput)
+    async def models() -> AdvertisementPageOutput:
+        return AdvertisementPageOutput.to_schema(page)
+
+    @app.get("/dicts", response_model=AdvertisementPageOutput)
+    async def dicts() -> FastJSONResponse:
+        return FastJSONResponse(content=AdvertisementPageOutput.to_dict(page))
+
+    return app
+
+
+async def compare(args: argparse.Namespace) -> None:
+    page = Page(items=[Advertisement.from_row(make_row(number)) for number in range(args.items)])
+    app = build_app(page)
+    models_body = (await request(app, "GET", "/models")).body
+    dicts_body = (await request(app, "GET", "/dicts")).body
+    print(f"identical bodies: {models_body == dicts_body}, {len(dicts_body)} bytes, backend {JSON_BACKEND}")
+
+    results: dict[str, LoadResult] = {}
+    for name, path in (("to_schema + response_model", "/models"), ("to_dict + FastJSONResponse", "/dicts")):
+        results[name] = await run_load(lambda: request(app, "GET", path), total=args.requests, concurrency=1)
+        stats = results[name].to_dict()
+        print(f"{name:30} {stats['rps']:9.1f} rps  p50 {stats['p50_ms']:8.3f} ms  p99 {stats['p99_ms']:8.3f} ms")
+
+    legacy, current = results.values()
+    print(f"{'speed-up (rps)':30} {current.rps / legacy.rps:9.2f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Стоимость сериализации страницы объявлений")
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(compare(args))
+
+
+if __name__ == "__main__":
+    main()
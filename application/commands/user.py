@@ -1,12 +1,18 @@
 import logging
+from typing import Optional
 
 from application.domain.entities.user import User as DomainUser
+from application.domain.value_objects.user import Email, Status
+from application.exceptions.base import ApplicationException
 from application.infrastructure.brokers.consumers.handlers import MessageHandler
-from application.services.user import UserService, get_user_service
+from application.services.user import UserService, UserIngestStatus, get_user_service
 
 logger = logging.getLogger(__name__)
 
 message_handler: MessageHandler = MessageHandler()
+# Ошибки разбора события: ValueError покрывает и валидаторы value objects, и ValidationError pydantic
+INVALID_EVENT_ERRORS: tuple[type[Exception], ...] = (ValueError, KeyError, TypeError, AttributeError,
+                                                      ApplicationException)
 
 
 def filter_by_is_approve_user(message: dict) -> bool:
@@ -20,11 +26,61 @@ async def create_user(decode_message: dict) -> None:
     await UserService().create_user(user)
 
 
+@message_handler.register_batch_handler(message_type="UserRegisteredEvent", predicate=filter_by_is_approve_user)
+async def create_users(decode_messages: list[dict]) -> list[UserIngestStatus]:
+    """Пакетная регистрация; сообщения, не прошедшие валидацию, помечаются INVALID и пропускаются"""
+    outcomes: list[Optional[UserIngestStatus]] = [None] * len(decode_messages)
+    users: list[DomainUser] = []
+    positions: list[int] = []
+    for position, decode_message in enumerate(decode_messages):
+        try:
+            users.append(DomainUser.from_json(decode_message.get("message")))
+            positions.append(position)
+
+        except INVALID_EVENT_ERRORS as ex:
+            logger.error(f"Invalid UserRegisteredEvent skipped: {ex}")
+            outcomes[position] = UserIngestStatus.INVALID
+
+    for position, outcome in zip(positions, await UserService().create_users(users)):
+        outcomes[position] = outcome
+    return outcomes
+
+
+def parse_status_event(decode_message: dict) -> tuple[str, Status]:
+    """Из события смены статуса нужны только email и статус, полная сущность User не собирается"""
+    message: dict = decode_message.get("message")
+    status: Status = Status[message["status"]] if message.get("status") else Status.PENDING
+    return Email(message["email"]).value, status
+
+
 @message_handler.register_handler(message_type="UserUpdatedStatusEvent", predicate=filter_by_is_approve_user)
 async def update_status_user(decode_message: dict) -> None:
-    update_user_by_status: DomainUser = DomainUser.from_json(decode_message.get("message"))
-    service: UserService = get_user_service()
-    user: DomainUser = await service.get_user_by_all_params({"email": update_user_by_status.email.value})
-    await service.update_user(user_oid=user.oid, new_user=update_user_by_status)
-    logger.info(f"Status user {user.oid} update to {update_user_by_status.status.value}")
+    email, status = parse_status_event(decode_message)
+    user_oid: str = await get_user_service().update_user_status(email=email, status=status)
+    logger.info(f"Status user {user_oid} update to {status.value}")
+
+
+@message_handler.register_batch_handler(message_type="UserUpdatedStatusEvent", predicate=filter_by_is_approve_user)
+async def update_status_users(decode_messages: list[dict]) -> list[UserIngestStatus]:
+    """Пачка смен статуса одним UPDATE; для повторяющегося email побеждает последнее событие"""
+    emails: list[Optional[str]] = []
+    statuses: dict[str, Status] = {}
+    for decode_message in decode_messages:
+        try:
+            email, status = parse_status_event(decode_message)
+
+        except INVALID_EVENT_ERRORS as ex:
+            logger.error(f"Invalid UserUpdatedStatusEvent skipped: {ex}")
+            emails.append(None)
+            continue
+
+        statuses[email] = status
+        emails.append(email)
 
+    updated: dict[str, str] = await get_user_service().update_users_status(statuses)
+    return [
+        UserIngestStatus.INVALID if email is None
+        else UserIngestStatus.UPDATED if email in updated
+        else UserIngestStatus.NOT_FOUND
+        for email in emails
+    ]
@@ -1,5 +1,8 @@
 from contextvars import ContextVar, Token
-from typing import Generic, TypeVar
+from typing import Generic, Optional, TYPE_CHECKING, TypeVar
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
 
 ContextVarType = TypeVar("ContextVarType")
 
@@ -12,12 +15,17 @@ class ContextWrapper(Generic[ContextVarType]):
     def set(self, value: ContextVarType) -> Token:
         return self.__variable.set(value)
 
+    def reset(self, token: Token) -> None:
+        self.__variable.reset(token)
+
     @property
     def value(self) -> ContextVarType:
         return self.__variable.get()
 
 
 user: ContextWrapper[dict] = ContextWrapper(ContextVar("user", default=None))
+# Сессия БД, общая для всех unit of work в рамках одного HTTP-запроса
+db_session: ContextWrapper[Optional["AsyncSession"]] = ContextWrapper(ContextVar("db_session", default=None))
 
 
 def get_payload_current_user() -> dict | None:
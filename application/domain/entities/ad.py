@@ -16,6 +16,7 @@ class Advertisement(BaseEntity):
     description: str = f(title="Описание", default_factory=str, max_length=250)
     price: Decimal = f(title="Цена", ge=0, decimal_places=2)
     approved_at: datetime | None = f(title="Дата публикации", default=None)
+    updated_at: datetime | None = f(title="Дата изменения", default=None)
     number_of_views: int = f(default=0, title="Количество просмотров", ge=0)
     photo: Photo = f(default_factory=list, title="Фотки", description="Ссылки на фото")
     status: Status = f(title="Cтатус", default=Status.DRAFT)
@@ -39,6 +40,17 @@ class Advertisement(BaseEntity):
     def to_json(self) -> dict:
         return self.model_dump(exclude_none=True)
 
+    def version_updated_at(self) -> datetime | None:
+        """
+        Версия представления для ETag/Last-Modified: в ответ входят автор и категория, поэтому берётся
+        самое позднее изменение из трёх, как GREATEST в запросе версии
+        """
+        dates: list[datetime] = [
+            updated_at for updated_at in (self.updated_at, self.author.updated_at, self.category.updated_at)
+            if updated_at is not None
+        ]
+        return max(dates) if dates else None
+
     def approve(self):
         self.status = Status.ACTIVE
         self.approved_at = datetime.utcnow()
@@ -1,12 +1,67 @@
 from abc import ABC
+from copy import deepcopy
 from datetime import datetime
+from typing import Any, Callable, Hashable, Self
 from uuid import uuid4
 
-from pydantic import BaseModel, Field as f
+from pydantic import BaseModel, Field as f, PrivateAttr
+
+_object_setattr = object.__setattr__
+# По классу сущности: (имя поля, default_factory или None, default) - см. BaseEntity._field_defaults
+_field_defaults_cache: dict[type, tuple[tuple[str, Callable[[], Any] | None, Any], ...]] = {}
 
 
 class BaseEntity(ABC, BaseModel):
     oid: str = f(title="Идентификатор", default_factory=lambda: str(uuid4()))
     created_at: datetime = f(title="Дата создание", default_factory=datetime.now)
 
+    # Поля, реально изменённые после загрузки/создания: по ним репозитории строят частичный UPDATE
+    _changed_fields: set[str] = PrivateAttr(default_factory=set)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name in self.__class__.model_fields and self.__dict__.get(name) != value:
+            self._changed_fields.add(name)
+        super().__setattr__(name, value)
+
+    @property
+    def changed_fields(self) -> frozenset[str]:
+        return frozenset(self._changed_fields)
+
+    def mark_clean(self) -> None:
+        """Сбросить отслеживание изменений после записи в хранилище"""
+        self._changed_fields.clear()
+
+    @classmethod
+    def trusted(cls, **data: Any) -> Self:
+        """
+        Сборка без валидации для строк из нашей БД: они уже прошли проверку при записи.
+        Дешевле model_construct, т.к. не обходит поля модели, когда переданы все значения.
+        """
+        defaults = _field_defaults_cache.get(cls) or cls._field_defaults()
+        if len(data) < len(defaults):
+            for name, default_factory, default in defaults:
+                if name not in data:
+                    if default_factory is not None:
+                        data[name] = default_factory()
+                    else:
+                        data[name] = default if isinstance(default, Hashable) else deepcopy(default)
+
+        instance = cls.__new__(cls)
+        _object_setattr(instance, "__dict__", data)
+        _object_setattr(instance, "__pydantic_fields_set__", set(data))
+        _object_setattr(instance, "__pydantic_extra__", None)
+        _object_setattr(instance, "__pydantic_private__", {"_changed_fields": set()})
+        return instance
 
+    @classmethod
+    def _field_defaults(cls) -> tuple[tuple[str, Callable[[], Any] | None, Any], ...]:
+        """
+        Значения по умолчанию полей, собранные один раз на класс.
+        FieldInfo.get_default на каждом вызове разбирает сигнатуру default_factory через inspect - это сотни µs.
+        """
+        defaults = _field_defaults_cache.get(cls)
+        if defaults is None:
+            defaults = _field_defaults_cache[cls] = tuple(
+                (name, field.default_factory, field.default) for name, field in cls.model_fields.items()
+            )
+        return defaults
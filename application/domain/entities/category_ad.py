@@ -1,3 +1,4 @@
+from datetime import datetime
 from uuid import uuid4
 
 from slugify import slugify
@@ -10,6 +11,7 @@ class Category(BaseEntity):
     title: str = f(title="Название", min_length=1, max_length=50)
     code: str = f(title="Код")
     description: str = f(title="Описание", default_factory=str, max_length=250)
+    updated_at: datetime | None = f(title="Дата изменения", default=None)
 
     @staticmethod
     def _generate_code_from_title(title: str) -> str:
@@ -1,3 +1,4 @@
+from datetime import datetime
 from uuid import uuid4
 
 from pydantic import Field as f
@@ -20,6 +21,7 @@ class User(BaseEntity):
         max_length=50
     )
     status: Status = f(title="Статус", default=Status.PENDING)
+    updated_at: datetime | None = f(title="Дата изменения", default=None)
 
     @classmethod
     def from_json(cls, json: dict[str, str]) -> "User":
@@ -2,6 +2,8 @@ from abc import ABC, abstractmethod
 from typing import Any, Optional
 
 from application.domain.entities.ad import Advertisement as DomainAdvertisement
+from application.domain.value_objects.ad import Version
+from application.domain.value_objects.pagination import Cursor
 
 
 class AbstractAdvertisementRepository(ABC):
@@ -15,7 +17,14 @@ class AbstractAdvertisementRepository(ABC):
         raise NotImplemented
 
     @abstractmethod
-    async def all(self) -> list[DomainAdvertisement] | None:
+    async def get_version(self, advertisement_oid: str) -> Optional[Version]:
+        raise NotImplemented
+
+    @abstractmethod
+    async def all(self,
+                  limit: int,
+                  cursor: Optional[Cursor] = None,
+                  statuses: Optional[tuple[str, ...]] = None) -> list[DomainAdvertisement]:
         raise NotImplemented
 
     @abstractmethod
@@ -23,7 +32,17 @@ class AbstractAdvertisementRepository(ABC):
         raise NotImplemented
 
     @abstractmethod
-    async def get_all_by_params(self, params: dict[str, Any], offset: int, limit: int) -> list[DomainAdvertisement]:
+    async def get_all_by_params(self,
+                                params: dict[str, Any],
+                                limit: int,
+                                cursor: Optional[Cursor] = None) -> list[DomainAdvertisement]:
+        raise NotImplemented
+
+    @abstractmethod
+    async def full_text_search(self,
+                               params: dict[str, Any],
+                               limit: int,
+                               cursor: Optional[Cursor] = None) -> list[tuple[DomainAdvertisement, float]]:
         raise NotImplemented
 
     @abstractmethod
@@ -33,3 +52,7 @@ class AbstractAdvertisementRepository(ABC):
     @abstractmethod
     async def update(self, user: DomainAdvertisement) -> DomainAdvertisement:
         raise NotImplemented
+
+    @abstractmethod
+    async def increment_views(self, views: dict[str, int]) -> None:
+        raise NotImplemented
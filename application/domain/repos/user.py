@@ -1,7 +1,9 @@
 from abc import ABC, abstractmethod
 from typing import Optional, Any
+from uuid import UUID
 
 from application.domain.entities.user import User as DomainUser
+from application.domain.value_objects.user import Status
 
 
 class AbstractUserRepository(ABC):
@@ -10,12 +12,16 @@ class AbstractUserRepository(ABC):
     async def add(self, user: DomainUser) -> DomainUser:
         raise NotImplemented
 
+    @abstractmethod
+    async def add_many(self, users: list[DomainUser]) -> set[str]:
+        raise NotImplemented
+
     @abstractmethod
     async def get(self, user_oid: str) -> DomainUser | None:
         raise NotImplemented
 
     @abstractmethod
-    async def get_multi(self, user_oids: list[str]) -> list[DomainUser]:
+    async def get_multi(self, user_oids: list[UUID]) -> list[DomainUser]:
         raise NotImplemented
 
     @abstractmethod
@@ -34,6 +40,14 @@ class AbstractUserRepository(ABC):
     async def update(self, user: DomainUser) -> DomainUser:
         raise NotImplemented
 
+    @abstractmethod
+    async def update_status_by_email(self, email: str, status: Status) -> Optional[str]:
+        raise NotImplemented
+
+    @abstractmethod
+    async def update_statuses_by_email(self, statuses: dict[str, Status]) -> dict[str, str]:
+        raise NotImplemented
+
     @abstractmethod
     async def delete(self, user_oid: str) -> None:
         raise NotImplemented
@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from datetime import datetime
 from enum import Enum
 
 from ..value_objects.base import BaseValueObjects
@@ -20,3 +21,11 @@ class Photo(BaseValueObjects):
     def validate(self) -> None:
         if not 0 < len(self.value) < 11:
             raise ValueError(COUNT_PHOTO_ERROR)
+
+
+@dataclass(frozen=True, slots=True)
+class Version:
+    """Версия объявления для условных GET: читается без загрузки полного представления"""
+    oid: str
+    updated_at: datetime
+    status: Status
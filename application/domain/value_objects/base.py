@@ -12,6 +12,13 @@ class BaseValueObjects(ABC, Generic[VT]):
     def __post_init__(self):
         self.validate()
 
+    @classmethod
+    def trusted(cls, value: VT) -> "BaseValueObjects[VT]":
+        """Создание без валидации, только для уже проверенных данных (строки из нашей БД)"""
+        instance = object.__new__(cls)
+        object.__setattr__(instance, "value", value)
+        return instance
+
     @abstractmethod
     def validate(self) -> None:
         raise NotImplemented
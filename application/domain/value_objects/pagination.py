@@ -0,0 +1,45 @@
+import base64
+import binascii
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Generic, TypeVar
+from uuid import UUID
+
+from application.exceptions.domain import InvalidCursorError
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True, slots=True)
+class Cursor:
+    """
+    Позиция последнего элемента страницы для keyset-пагинации по (approved_at, oid),
+    для полнотекстового поиска дополнительно по релевантности (rank, approved_at, oid)
+    """
+    approved_at: datetime | None
+    oid: str
+    rank: float | None = None
+
+    def encode(self) -> str:
+        raw: str = json.dumps([self.approved_at.isoformat() if self.approved_at else None, self.oid, self.rank])
+        return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+    @classmethod
+    def decode(cls, token: str) -> "Cursor":
+        try:
+            approved_at, oid, rank = json.loads(base64.urlsafe_b64decode(token.encode("ascii")))
+            return cls(
+                approved_at=datetime.fromisoformat(approved_at) if approved_at else None,
+                oid=str(UUID(oid)),
+                rank=float(rank) if rank is not None else None
+            )
+
+        except (ValueError, TypeError, binascii.Error):
+            raise InvalidCursorError
+
+
+@dataclass(slots=True)
+class Page(Generic[T]):
+    items: list[T] = field(default_factory=list)
+    next_cursor: str | None = None
@@ -7,15 +7,18 @@ from application.constants import (
 )
 from application.domain.value_objects.base import BaseValueObjects
 
+# Компилируются один раз при импорте, а не ищутся в кэше re на каждой валидации
+EMAIL_PATTERN: re.Pattern[str] = re.compile(r"^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$")
+FULL_NAME_PATTERN: re.Pattern[str] = re.compile(r"^[А-ЯЁ][а-яё]+$|^[A-Z][a-z]+$")
+
 
 @dataclass(frozen=True, slots=True)
 class Email(BaseValueObjects):
     value: str
 
     def validate(self) -> None:
-        EMAIL_REGEX = r"^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$"
         # Проверка формата email
-        if not re.match(EMAIL_REGEX, self.value):
+        if not EMAIL_PATTERN.match(self.value):
             raise ValueError(EMAIL_ERROR)
 
 
@@ -33,8 +36,7 @@ class FullName(BaseValueObjects):
     value: str
 
     def validate(self) -> None:
-        username_regex = r"^[А-ЯЁ][а-яё]+$|^[A-Z][a-z]+$"
-        if not re.match(username_regex, self.value) or len(self.value) > 50:
+        if len(self.value) > 50 or not FULL_NAME_PATTERN.match(self.value):
             raise ValueError(FULLNAME_ERROR)
 
 
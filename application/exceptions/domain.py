@@ -141,3 +141,10 @@ class AccessDeniedError(ApplicationException):
     def message(self) -> str:
         return "Access denied"
 
+
+class InvalidCursorError(ApplicationException):
+    status_code = 400
+
+    @property
+    def message(self) -> str:
+        return "Invalid pagination cursor"
@@ -1,22 +1,40 @@
+import asyncio
 import logging
-from typing import Any, Callable, Coroutine, Optional
+from dataclasses import dataclass
+from typing import Any, Callable, Coroutine, Hashable, Optional
 
 import aiokafka
+from aiokafka import ConsumerRecord, TopicPartition
 
 from application.exceptions.broker import KafkaError
+from application.infrastructure.metrics import kafka_consumer_lag, kafka_messages_skipped
 
 logger = logging.getLogger(__name__)
 
 
 class KafkaConsumer:
 
-    def __init__(self, group_id: str, topics: tuple) -> None:
+    def __init__(
+        self,
+        group_id: str,
+        topics: tuple,
+        enable_auto_commit: bool = True,
+        value_deserializer: Optional[Callable[[bytes], Any]] = None,
+    ) -> None:
         self.consumer: Optional[aiokafka.AIOKafkaConsumer] = None
         self.group_id = group_id
         self.topics = topics
+        self.enable_auto_commit = enable_auto_commit
+        self.value_deserializer = value_deserializer
 
     async def connect(self, url: str) -> aiokafka.AIOKafkaConsumer:
-        self.consumer = aiokafka.AIOKafkaConsumer(*self.topics, bootstrap_servers=url, group_id=self.group_id)
+        self.consumer = aiokafka.AIOKafkaConsumer(
+            *self.topics,
+            bootstrap_servers=url,
+            group_id=self.group_id,
+            enable_auto_commit=self.enable_auto_commit,
+            value_deserializer=self.value_deserializer,
+        )
         await self.consumer.start()
         logger.info("Успешное подключение к Kafka(consumers)")
         return self.consumer
@@ -32,7 +50,157 @@ class KafkaConsumer:
             if self.consumer:
                 async for message in self.consumer:
                     await handling_message(message)
+                    self._record_lag(TopicPartition(message.topic, message.partition), message.offset + 1)
 
         except aiokafka.errors.KafkaError:
             raise KafkaError
 
+    async def get_batches(
+        self,
+        handling_message: Callable[..., Coroutine[Any, Any, None]],
+        ordering_key: Callable[[ConsumerRecord], Hashable],
+        max_records: int,
+        timeout_ms: int,
+        concurrency: int,
+        batch_type: Optional[Callable[[ConsumerRecord], Optional[str]]] = None,
+        handling_batch: Optional[Callable[[list[ConsumerRecord]], Coroutine[Any, Any, None]]] = None,
+        max_attempts: int = 3,
+        retry_backoff_ms: int = 200,
+    ) -> None:
+        """
+        Пакетное чтение через getmany. Требует enable_auto_commit=False: оффсет партиции коммитится
+        только после обработки пакета, доставка at-least-once.
+        Подряд идущие записи, для которых batch_type не None, целиком отдаются в handling_batch.
+        Сообщение, которое не обработалось за max_attempts попыток, пропускается и учитывается в метриках,
+        чтобы одна плохая запись не останавливала партицию.
+        """
+        handlers = PartitionHandlers(
+            handling_message=handling_message,
+            ordering_key=ordering_key,
+            semaphore=asyncio.Semaphore(concurrency),
+            batch_type=batch_type,
+            handling_batch=handling_batch,
+            max_attempts=max_attempts,
+            retry_backoff=retry_backoff_ms / 1000,
+        )
+        try:
+            if self.consumer:
+                while True:
+                    batches: dict[TopicPartition, list[ConsumerRecord]] = await self.consumer.getmany(
+                        timeout_ms=timeout_ms, max_records=max_records
+                    )
+                    await asyncio.gather(*(
+                        self._process_partition(partition, records, handlers)
+                        for partition, records in batches.items()
+                    ))
+
+        except aiokafka.errors.KafkaError:
+            raise KafkaError
+
+    async def _process_partition(
+        self,
+        partition: TopicPartition,
+        records: list[ConsumerRecord],
+        handlers: "PartitionHandlers",
+    ) -> None:
+        """
+        Пакет партиции делится на сегменты подряд идущих записей и сегменты обрабатываются по очереди,
+        поэтому порядок событий разных типов сохраняется.
+        Упавший пакетный сегмент повторяется, а затем разбирается по одному сообщению,
+        чтобы пропущена была только сама плохая запись.
+        """
+        for segment_type, segment in self._split_segments(records, handlers.batch_type):
+            if segment_type is None or not await self._process_bulk(segment, handlers):
+                await self._process_chains(segment, handlers)
+
+        await self.consumer.commit({partition: records[-1].offset + 1})
+        self._record_lag(partition, records[-1].offset + 1)
+
+    def _record_lag(self, partition: TopicPartition, next_offset: int) -> None:
+        """
+        Лаг по high watermark из последнего fetch: сколько записей партиции ещё не обработано
+        """
+        highwater: Optional[int] = self.consumer.highwater(partition)
+        if highwater is not None:
+            kafka_consumer_lag.set(max(highwater - next_offset, 0), partition.topic, str(partition.partition))
+
+    @staticmethod
+    def _split_segments(
+        records: list[ConsumerRecord],
+        batch_type: Optional[Callable[[ConsumerRecord], Optional[str]]],
+    ) -> list[tuple[Optional[str], list[ConsumerRecord]]]:
+        if batch_type is None:
+            return [(None, records)]
+
+        segments: list[tuple[Optional[str], list[ConsumerRecord]]] = []
+        for record in records:
+            record_type: Optional[str] = batch_type(record)
+            if segments and segments[-1][0] == record_type:
+                segments[-1][1].append(record)
+            else:
+                segments.append((record_type, [record]))
+        return segments
+
+    @staticmethod
+    async def _process_chains(records: list[ConsumerRecord], handlers: "PartitionHandlers") -> None:
+        """
+        Сообщения с одним ключом обрабатываются последовательно в порядке оффсетов,
+        разные ключи - параллельно (не больше concurrency одновременно).
+        """
+        chains: dict[Hashable, list[ConsumerRecord]] = {}
+        for record in records:
+            chains.setdefault(handlers.ordering_key(record), []).append(record)
+
+        async def process_chain(chain: list[ConsumerRecord]) -> None:
+            for record in chain:
+                await KafkaConsumer._retry(record, handlers)
+
+        await asyncio.gather(*(process_chain(chain) for chain in chains.values()))
+
+    @staticmethod
+    async def _process_bulk(records: list[ConsumerRecord], handlers: "PartitionHandlers") -> bool:
+        for attempt in range(1, handlers.max_attempts + 1):
+            try:
+                async with handlers.semaphore:
+                    await handlers.handling_batch(records)
+                return True
+
+            except Exception as ex:
+                logger.error(f"Batch {records[0].topic}[{records[0].partition}]@{records[0].offset}"
+                             f"-{records[-1].offset} attempt {attempt}/{handlers.max_attempts} failed: {ex}")
+                if attempt < handlers.max_attempts:
+                    await asyncio.sleep(handlers.retry_backoff * attempt)
+
+        return False
+
+    @staticmethod
+    async def _retry(record: ConsumerRecord, handlers: "PartitionHandlers") -> None:
+        """
+        Повторяет обработку сообщения с линейной задержкой; после max_attempts неудач сообщение пропускается
+        """
+        for attempt in range(1, handlers.max_attempts + 1):
+            try:
+                async with handlers.semaphore:
+                    await handlers.handling_message(record)
+                return
+
+            except Exception as ex:
+                logger.error(f"Message {record.topic}[{record.partition}]@{record.offset} "
+                             f"attempt {attempt}/{handlers.max_attempts} failed: {ex}")
+                if attempt < handlers.max_attempts:
+                    await asyncio.sleep(handlers.retry_backoff * attempt)
+
+        kafka_messages_skipped.inc(record.topic, str(record.partition))
+        logger.error(f"Message {record.topic}[{record.partition}]@{record.offset} skipped "
+                     f"after {handlers.max_attempts} attempts")
+
+
+@dataclass(slots=True)
+class PartitionHandlers:
+    handling_message: Callable[..., Coroutine[Any, Any, None]]
+    ordering_key: Callable[[ConsumerRecord], Hashable]
+    semaphore: asyncio.Semaphore
+    batch_type: Optional[Callable[[ConsumerRecord], Optional[str]]] = None
+    handling_batch: Optional[Callable[[list[ConsumerRecord]], Coroutine[Any, Any, None]]] = None
+    max_attempts: int = 3
+    retry_backoff: float = 0.2
@@ -8,11 +8,22 @@ class ConnectionParamsKafka:
     url: str
     topics: tuple
     group_id: str
+    batch_mode: bool = False
+    max_records: int = 500
+    timeout_ms: int = 1000
+    concurrency: int = 10
+    max_attempts: int = 3
+    retry_backoff_ms: int = 200
 
 
 data_connect_kafka = ConnectionParamsKafka(
     url=settings.kafka.url,
     topics=(settings.kafka.USER_TOPIC, settings.kafka.TOKEN_TOPIC),
     group_id=settings.kafka.GROUP_ID,
+    batch_mode=settings.kafka.BATCH_MODE,
+    max_records=settings.kafka.BATCH_MAX_RECORDS,
+    timeout_ms=settings.kafka.BATCH_TIMEOUT_MS,
+    concurrency=settings.kafka.BATCH_CONCURRENCY,
+    max_attempts=settings.kafka.BATCH_MAX_ATTEMPTS,
+    retry_backoff_ms=settings.kafka.BATCH_RETRY_BACKOFF_MS,
 )
-
@@ -1,13 +1,16 @@
-import json
 import logging
+import time
 from typing import Any, Callable, Coroutine
 
+from application.infrastructure.metrics import kafka_message_duration, kafka_message_errors
+
 logger = logging.getLogger(__name__)
 
 
 class MessageHandler:
     def __init__(self):
         self.handlers = {}
+        self.batch_handlers = {}
 
     def register_handler(self, message_type: str, predicate: Callable[[dict], bool]):
         def decorator(handler: Callable[[Any], Coroutine[Any, Any, None]]):
@@ -16,13 +19,56 @@ class MessageHandler:
 
         return decorator
 
-    async def handle_message(self, message_type: str, message: str):
+    def register_batch_handler(self, message_type: str, predicate: Callable[[dict], bool]):
+        """
+        Обработчик пачки сообщений одного типа, возвращает исход обработки по каждому сообщению
+        """
+        def decorator(handler: Callable[[list[dict]], Coroutine[Any, Any, list[Any]]]):
+            self.batch_handlers[message_type] = (handler, predicate)
+            return handler
+
+        return decorator
+
+    def has_batch_handler(self, message_type: str) -> bool:
+        return message_type in self.batch_handlers
+
+    async def handle_message(self, message_type: str, message: dict):
         if message_type in self.handlers:
             handler, predicate = self.handlers[message_type]
-            decoded_message: dict = json.loads(message)
-            if predicate and predicate(decoded_message):
-                await handler(decoded_message)
+            if predicate and predicate(message):
+                started: float = time.perf_counter()
+                try:
+                    await handler(message)
+                except Exception:
+                    kafka_message_errors.inc(message_type, "exception")
+                    raise
+                finally:
+                    kafka_message_duration.observe(time.perf_counter() - started, message_type, "single")
             else:
+                kafka_message_errors.inc(message_type, "predicate")
                 logger.error(f"Predicate check failed for message: {message_type}")
         else:
+            kafka_message_errors.inc(str(message_type), "no_handler")
             logger.error(f"No handler registered for message type {message_type}")
+
+    async def handle_batch(self, message_type: str, messages: list[dict]) -> list[Any]:
+        handler, predicate = self.batch_handlers[message_type]
+        accepted: list[dict] = [message for message in messages if predicate and predicate(message)]
+        if len(accepted) < len(messages):
+            kafka_message_errors.inc(message_type, "predicate", amount=len(messages) - len(accepted))
+            logger.error(f"Predicate check failed for {len(messages) - len(accepted)} messages: {message_type}")
+
+        if not accepted:
+            return []
+
+        started: float = time.perf_counter()
+        try:
+            return await handler(accepted)
+        except Exception:
+            kafka_message_errors.inc(message_type, "exception", amount=len(accepted))
+            raise
+        finally:
+            # Латентность пачки делится поровну: гистограмма остаётся в секундах на сообщение
+            elapsed: float = (time.perf_counter() - started) / len(accepted)
+            for _ in accepted:
+                kafka_message_duration.observe(elapsed, message_type, "batch")
@@ -1,24 +1,54 @@
 import asyncio
+import logging
 import sys
 from typing import Any, Callable, Coroutine
 
+from aiohttp import web
+
+from application.config import settings
 from application.infrastructure.brokers.client.kafka.broker import KafkaConsumer
 from application.infrastructure.brokers.client.schemas import data_connect_kafka, ConnectionParamsKafka
+from application.infrastructure.metrics import start_metrics_server
+from application.infrastructure.serialization import JSON_BACKEND
 from application.logging_config import init_logger
 from .base import Consumer
-from .utils import process_message_kafka
+from .utils import (
+    DecodeKafkaMessage, message_batch_type, message_ordering_key,
+    process_batch_kafka, process_message_kafka
+)
+
+logger = logging.getLogger(__name__)
 
 
 class ConsumerKafka(Consumer):
     def __init__(self, data: ConnectionParamsKafka):
         self.data = data
-        self.consumer = KafkaConsumer(group_id=data.group_id, topics=data.topics)
+        self.consumer = KafkaConsumer(
+            group_id=data.group_id,
+            topics=data.topics,
+            enable_auto_commit=not data.batch_mode,
+            value_deserializer=DecodeKafkaMessage().decode,
+        )
 
     async def initialization(self) -> None:
         await self.consumer.connect(url=self.data.url)
 
     async def get_message(self, handling_message: Callable[..., Coroutine[Any, Any, None]]) -> None:
-        await self.consumer.get_message(handling_message=handling_message)
+        if not self.data.batch_mode:
+            await self.consumer.get_message(handling_message=handling_message)
+            return
+
+        await self.consumer.get_batches(
+            handling_message=handling_message,
+            ordering_key=message_ordering_key,
+            max_records=self.data.max_records,
+            timeout_ms=self.data.timeout_ms,
+            concurrency=self.data.concurrency,
+            batch_type=message_batch_type,
+            handling_batch=process_batch_kafka,
+            max_attempts=self.data.max_attempts,
+            retry_backoff_ms=self.data.retry_backoff_ms,
+        )
 
     async def finalization(self) -> None:
         await self.consumer.disconnect()
@@ -26,11 +56,18 @@ class ConsumerKafka(Consumer):
 
 async def kafka_message_flow() -> None:
     consumer = ConsumerKafka(data=data_connect_kafka)
+    metrics_runner: web.AppRunner | None = None
+    logger.info(f"JSON backend: {JSON_BACKEND}")
     try:
+        if settings.monitoring.METRICS_ENABLED:
+            metrics_runner = await start_metrics_server(settings.monitoring.METRICS_HOST,
+                                                        settings.monitoring.CONSUMER_METRICS_PORT)
         await consumer.initialization()
         await consumer.get_message(process_message_kafka)
     finally:
         await consumer.finalization()
+        if metrics_runner:
+            await metrics_runner.cleanup()
 
 
 if __name__ == "__main__":
@@ -1,37 +1,111 @@
-import json
 import logging
 from abc import ABC, abstractmethod
-from typing import Generic, TypeVar
+from collections import Counter
+from typing import Any, Callable, Generic, Optional, TypeVar
 
 from aiokafka import ConsumerRecord
 
 from application.commands.user import message_handler
+from application.infrastructure.metrics import kafka_message_errors
+from application.infrastructure.serialization import DECODE_ERRORS, loads
 
 logger = logging.getLogger(__name__)
 T = TypeVar("T")
+UNKNOWN_MESSAGE_TYPE = "unknown"
+
+
+class UndecodableMessage:
+    """
+    Значение записи, которую не удалось разобрать. Исключение из value_deserializer вылетело бы
+    из getmany до обработки, и консьюмер бесконечно перечитывал бы одну и ту же запись
+    """
+
+    def __repr__(self) -> str:
+        return "UNDECODABLE_MESSAGE"
+
+
+UNDECODABLE_MESSAGE = UndecodableMessage()
 
 
 class DecodeMessage(Generic[T], ABC):
 
     @abstractmethod
-    def decode(self, message: T) -> str:
+    def decode(self, message: T) -> dict:
         raise NotImplementedError
 
 
-class DecodeKafkaMessage(DecodeMessage[ConsumerRecord]):
+class DecodeKafkaMessage(DecodeMessage[bytes]):
+    """
+    Байты записи сразу в dict, без промежуточной строки.
+    Используется как value_deserializer консьюмера, поэтому запись разбирается ровно один раз.
+    """
+
+    def __init__(self,
+                 json_loads: Callable[[bytes], Any] = loads,
+                 decode_errors: tuple[type[Exception], ...] = DECODE_ERRORS):
+        self.json_loads = json_loads
+        self.decode_errors = decode_errors
+
+    def decode(self, message: Optional[bytes]) -> dict | UndecodableMessage:
+        if not message:
+            # Tombstone-запись (value=None) или пустое значение
+            logger.error("Kafka message has an empty value")
+            return UNDECODABLE_MESSAGE
 
-    def decode(self, message: ConsumerRecord) -> str:
-        return message.value.decode("utf-8")
+        try:
+            decoded: Any = self.json_loads(message)
+        except self.decode_errors as exc:
+            logger.error(f"Kafka message is not valid JSON: {exc}")
+            return UNDECODABLE_MESSAGE
 
+        if not isinstance(decoded, dict):
+            logger.error(f"Kafka message is not a JSON object: {type(decoded).__name__}")
+            return UNDECODABLE_MESSAGE
+        return decoded
 
-def definition_message_type(decode_message: str) -> str:
-    data_message = json.loads(decode_message)
-    return data_message.get('type')
+
+def definition_message_type(decode_message: dict) -> str:
+    return decode_message.get('type')
+
+
+def message_ordering_key(message: ConsumerRecord) -> bytes | str:
+    """
+    Ключ упорядочивания: ключ записи Kafka, иначе email пользователя из события.
+    События без ключа и email попадают в одну общую последовательную цепочку.
+    """
+    if message.key:
+        return message.key
+
+    event: Any = message.value.get("message") if isinstance(message.value, dict) else None
+    return event.get("email") or "" if isinstance(event, dict) else ""
 
 
 async def process_message_kafka(message: ConsumerRecord) -> None:
-    decode_message: str = DecodeKafkaMessage().decode(message=message)
+    """
+    Неразобранная запись считается обработанной: она учитывается как invalid и не блокирует коммит пакета
+    """
+    if message.value is UNDECODABLE_MESSAGE:
+        kafka_message_errors.inc(UNKNOWN_MESSAGE_TYPE, "invalid")
+        logger.error(f"Message {message.topic}[{message.partition}]@{message.offset} skipped: undecodable value")
+        return
+
+    decode_message: dict = message.value
     message_type: str = definition_message_type(decode_message)
     await message_handler.handle_message(message_type, decode_message)
 
 
+def message_batch_type(message: ConsumerRecord) -> Optional[str]:
+    """
+    Тип сообщения, если для него зарегистрирован пакетный обработчик
+    """
+    message_type: Optional[str] = definition_message_type(message.value) if isinstance(message.value, dict) else None
+    return message_type if message_handler.has_batch_handler(message_type) else None
+
+
+async def process_batch_kafka(messages: list[ConsumerRecord]) -> None:
+    message_type: str = definition_message_type(messages[0].value)
+    outcomes: list[Any] = await message_handler.handle_batch(message_type, [message.value for message in messages])
+    summary: Counter = Counter(getattr(outcome, "value", outcome) for outcome in outcomes)
+    if summary.get("invalid"):
+        kafka_message_errors.inc(message_type, "invalid", amount=summary["invalid"])
+    logger.info(f"{message_type}: {len(messages)} messages processed in batch, outcomes {dict(summary)}")
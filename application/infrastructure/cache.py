@@ -0,0 +1,67 @@
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """
+    In-process LRU-кэш с индивидуальным сроком жизни записи (unix time).
+    Помимо числа записей может ограничиваться суммарным размером значений (max_bytes + size_of).
+    Рассчитан на однопоточный event loop, блокировок нет.
+    """
+
+    def __init__(self, maxsize: int, max_bytes: Optional[int] = None, size_of: Callable[[V], int] = len):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.size_of = size_of
+        self.hits: int = 0
+        self.misses: int = 0
+        self._bytes: int = 0
+        self._data: OrderedDict[K, tuple[V, float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: K) -> Optional[V]:
+        entry: Optional[tuple[V, float]] = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        value, expires_at = entry
+        if expires_at <= time.time():
+            self._discard(key)
+            self.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: K, value: V, expires_at: float) -> None:
+        self._discard(key)
+        if self.max_bytes is not None:
+            size: int = self.size_of(value)
+            if size > self.max_bytes:
+                return
+
+            self._bytes += size
+
+        self._data[key] = (value, expires_at)
+        while len(self._data) > self.maxsize or (self.max_bytes is not None and self._bytes > self.max_bytes):
+            self._discard(next(iter(self._data)))
+
+    def clear(self) -> None:
+        self._data.clear()
+        self._bytes = 0
+
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._data), "bytes": self._bytes}
+
+    def _discard(self, key: K) -> None:
+        entry: Optional[tuple[V, float]] = self._data.pop(key, None)
+        if entry is not None and self.max_bytes is not None:
+            self._bytes -= self.size_of(entry[0])
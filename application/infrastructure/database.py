@@ -1,19 +1,62 @@
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator, Optional
 
+from sqlalchemy import Engine, Select
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.dml import UpdateBase
 
 from application.config import settings
+from application.infrastructure.metrics import LabelValues, registry
 
 DATABASE_URL: str = settings.db.database_url_asyncpg
+REPLICA_DATABASE_URL: Optional[str] = settings.db.DB_REPLICA_URL or None
 
-engine: AsyncEngine = create_async_engine(DATABASE_URL,
-                                          echo=settings.db.ECHO,
-                                          echo_pool=settings.db.ECHO_POOL,
-                                          pool_size=settings.db.POOL_SIZE,
-                                          max_overflow=settings.db.MAX_OVERFLOW)
+# Ключ в session.info: после первой записи сессия до конца читает только с primary (read-your-writes)
+PRIMARY_PINNED_KEY = "primary_pinned"
+
+
+def build_engine(url: str) -> AsyncEngine:
+    return create_async_engine(url,
+                               echo=settings.db.ECHO,
+                               echo_pool=settings.db.ECHO_POOL,
+                               pool_size=settings.db.POOL_SIZE,
+                               max_overflow=settings.db.MAX_OVERFLOW,
+                               pool_pre_ping=settings.db.POOL_PRE_PING,
+                               pool_recycle=settings.db.POOL_RECYCLE,
+                               pool_timeout=settings.db.POOL_TIMEOUT)
+
+
+engine: AsyncEngine = build_engine(DATABASE_URL)
+replica_engine: Optional[AsyncEngine] = build_engine(REPLICA_DATABASE_URL) if REPLICA_DATABASE_URL else None
+
+
+class RoutingSession(Session):
+    """
+    Сессия с разделением чтения и записи: SELECT уходит на реплику, всё остальное - на primary.
+    Первая запись (flush или INSERT/UPDATE/DELETE) закрепляет сессию за primary,
+    поэтому дальнейшие чтения в том же запросе, в том числе после commit, видят свои изменения.
+    """
+
+    def get_bind(self, mapper: Any = None, clause: Any = None, **kwargs: Any) -> Engine:
+        if self._flushing or isinstance(clause, UpdateBase):
+            self.info[PRIMARY_PINNED_KEY] = True
+            return engine.sync_engine
+
+        if (
+            isinstance(clause, Select)
+            and clause._for_update_arg is None
+            and not self.info.get(PRIMARY_PINNED_KEY)
+        ):
+            return replica_engine.sync_engine
+
+        return engine.sync_engine
+
+
+# Без реплики остаётся обычная сессия: маршрутизация не добавляет накладных расходов
 async_session_maker: async_sessionmaker[AsyncSession] = async_sessionmaker(
     bind=engine,
     class_=AsyncSession,
+    sync_session_class=RoutingSession if replica_engine is not None else Session,
     expire_on_commit=False,
     autoflush=False
 )
@@ -22,3 +65,27 @@ async_session_maker: async_sessionmaker[AsyncSession] = async_sessionmaker(
 async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
     async with async_session_maker() as session:
         yield session
+
+
+def get_pool_statistics(target: AsyncEngine = engine) -> dict[str, int]:
+    """Текущее состояние пула соединений: размер, свободные, выданные и overflow-соединения"""
+    pool = target.pool
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+    }
+
+
+def collect_pool_statistics() -> dict[LabelValues, float]:
+    engines: dict[str, Optional[AsyncEngine]] = {"primary": engine, "replica": replica_engine}
+    return {
+        (name, state): value
+        for name, target in engines.items() if target is not None
+        for state, value in get_pool_statistics(target).items()
+    }
+
+
+registry.gauge("db_pool_connections", "SQLAlchemy connection pool state", ("engine", "state"),
+               collect=collect_pool_statistics)
@@ -0,0 +1,107 @@
+"""
+Раскладка времени HTTP-запроса по составляющим: SQL, выдачи соединений из пула, unit of work, JWT и сериализация.
+
+Включается настройкой INSTRUMENTATION_ENABLED. Выключенная, не регистрирует ни событий движка, ни middleware,
+а точки замера в коде сводятся к чтению ContextVar со значением None.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+QUERY_STARTED_KEY = "instrumentation_query_started"
+
+
+@dataclass(slots=True)
+class RequestMetrics:
+    started: float
+    sql_statements: int = 0
+    db_time: float = 0.0
+    session_checkouts: int = 0
+    units_of_work: int = 0
+    jwt_time: float = 0.0
+    serialization_time: float = 0.0
+
+    def server_timing(self) -> str:
+        total_ms: float = (time.perf_counter() - self.started) * 1000
+        return ", ".join((
+            f"total;dur={total_ms:.2f}",
+            f'db;dur={self.db_time * 1000:.2f};desc="{self.sql_statements} queries"',
+            f'pool;desc="{self.session_checkouts} checkouts, {self.units_of_work} uow"',
+            f"jwt;dur={self.jwt_time * 1000:.2f}",
+            f"serialization;dur={self.serialization_time * 1000:.2f}",
+        ))
+
+    def to_log_fields(self) -> dict[str, Any]:
+        return {
+            "total_ms": round((time.perf_counter() - self.started) * 1000, 2),
+            "queries": self.sql_statements,
+            "db_ms": round(self.db_time * 1000, 2),
+            "checkouts": self.session_checkouts,
+            "uow": self.units_of_work,
+            "jwt_ms": round(self.jwt_time * 1000, 2),
+            "serialization_ms": round(self.serialization_time * 1000, 2),
+        }
+
+
+request_metrics: ContextVar[Optional[RequestMetrics]] = ContextVar("request_metrics", default=None)
+
+
+@contextmanager
+def track(field: str) -> Iterator[None]:
+    """Добавить время выполнения блока к полю метрик текущего запроса, если замер включён"""
+    metrics: Optional[RequestMetrics] = request_metrics.get()
+    if metrics is None:
+        yield
+        return
+
+    started: float = time.perf_counter()
+    try:
+        yield
+    finally:
+        setattr(metrics, field, getattr(metrics, field) + time.perf_counter() - started)
+
+
+def count_unit_of_work() -> None:
+    metrics: Optional[RequestMetrics] = request_metrics.get()
+    if metrics is not None:
+        metrics.units_of_work += 1
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault(QUERY_STARTED_KEY, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    started: float = conn.info[QUERY_STARTED_KEY].pop()
+    metrics: Optional[RequestMetrics] = request_metrics.get()
+    if metrics is not None:
+        metrics.sql_statements += 1
+        metrics.db_time += time.perf_counter() - started
+
+
+def _handle_error(exception_context) -> None:
+    connection = exception_context.connection
+    if connection is not None and connection.info.get(QUERY_STARTED_KEY):
+        connection.info[QUERY_STARTED_KEY].pop()
+
+
+def _checkout(dbapi_connection, connection_record, connection_proxy) -> None:
+    metrics: Optional[RequestMetrics] = request_metrics.get()
+    if metrics is not None:
+        metrics.session_checkouts += 1
+
+
+def register_engine_events(*engines: Optional[AsyncEngine]) -> None:
+    for engine in engines:
+        if engine is None or event.contains(engine.sync_engine, "before_cursor_execute", _before_cursor_execute):
+            continue
+
+        event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine.sync_engine, "handle_error", _handle_error)
+        event.listen(engine.sync_engine.pool, "checkout", _checkout)
@@ -0,0 +1,195 @@
+"""
+Минимальный реестр метрик в текстовом формате Prometheus (exposition format 0.0.4).
+
+Сервис и consumer Kafka отдают его на /metrics отдельным aiohttp-сервером на внутреннем порту,
+а не через публичное приложение: публиковать этот порт наружу не нужно.
+Рассчитан на однопоточный event loop, блокировок нет.
+"""
+import math
+from bisect import bisect_left
+from typing import Callable, Iterable, Iterator, Optional
+
+from aiohttp import web
+
+LabelValues = tuple[str, ...]
+Sample = tuple[str, LabelValues, float]
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_BUCKETS: tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Metric:
+    type_name: str = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames: LabelValues = tuple(labelnames)
+
+    def samples(self) -> Iterator[Sample]:
+        raise NotImplementedError
+
+    def render(self) -> list[str]:
+        lines: list[str] = [f"# HELP {self.name} {_escape(self.documentation)}", f"# TYPE {self.name} {self.type_name}"]
+        for name, labels, value in self.samples():
+            lines.append(f"{name}{self._format_labels(labels)} {_format_value(value)}")
+        return lines
+
+    def _format_labels(self, values: LabelValues, extra: Optional[tuple[str, str]] = None) -> str:
+        pairs: list[tuple[str, str]] = list(zip(self.labelnames, values))
+        if extra:
+            pairs.append(extra)
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in pairs) + "}"
+
+    def _check_labels(self, values: LabelValues) -> None:
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"Metric {self.name} expects labels {self.labelnames}, got {values}")
+
+
+class Counter(Metric):
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self._check_labels(labels)
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def samples(self) -> Iterator[Sample]:
+        for labels, value in self._values.items():
+            yield f"{self.name}_total", labels, value
+
+
+class Gauge(Metric):
+    """
+    Gauge с явной установкой значения либо с функцией, которая вычисляет значения в момент чтения
+    """
+    type_name = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                 collect: Optional[Callable[[], dict[LabelValues, float]]] = None):
+        super().__init__(name, documentation, labelnames)
+        self.collect = collect
+        self._values: dict[LabelValues, float] = {}
+
+    def set(self, value: float, *labels: str) -> None:
+        self._check_labels(labels)
+        self._values[labels] = value
+
+    def samples(self) -> Iterator[Sample]:
+        values: dict[LabelValues, float] = self.collect() if self.collect else self._values
+        for labels, value in values.items():
+            yield self.name, labels, value
+
+
+class Histogram(Metric):
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                 buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets: tuple[float, ...] = tuple(sorted(buckets))
+        # По каждой комбинации меток: счётчики попаданий в бакеты (последний - +Inf) и сумма
+        self._counts: dict[LabelValues, list[int]] = {}
+        self._sums: dict[LabelValues, float] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        counts: Optional[list[int]] = self._counts.get(labels)
+        if counts is None:
+            self._check_labels(labels)
+            counts = self._counts[labels] = [0] * (len(self.buckets) + 1)
+            self._sums[labels] = 0.0
+
+        counts[bisect_left(self.buckets, value)] += 1
+        self._sums[labels] += value
+
+    def render(self) -> list[str]:
+        lines: list[str] = [f"# HELP {self.name} {_escape(self.documentation)}", f"# TYPE {self.name} {self.type_name}"]
+        for labels, counts in self._counts.items():
+            cumulative: int = 0
+            for bound, count in zip((*self.buckets, math.inf), counts):
+                cumulative += count
+                bucket_labels: str = self._format_labels(labels, ("le", _format_value(bound)))
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+
+            lines.append(f"{self.name}_sum{self._format_labels(labels)} {_format_value(self._sums[labels])}")
+            lines.append(f"{self.name}_count{self._format_labels(labels)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+
+    def __init__(self):
+        self._metrics: dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+              collect: Optional[Callable[[], dict[LabelValues, float]]] = None) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames, collect))
+
+    def histogram(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                  buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> bytes:
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return ("\n".join(lines) + "\n").encode()
+
+
+registry = MetricsRegistry()
+
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template", ("method", "route", "status")
+)
+kafka_consumer_lag = registry.gauge(
+    "kafka_consumer_lag", "Records between the last handled offset and the partition high watermark",
+    ("topic", "partition")
+)
+kafka_message_duration = registry.histogram(
+    "kafka_message_handling_seconds", "Kafka message handling latency by message type", ("type", "mode")
+)
+kafka_message_errors = registry.counter(
+    "kafka_message_errors", "Kafka messages that failed handling by message type", ("type", "reason")
+)
+kafka_messages_skipped = registry.counter(
+    "kafka_messages_skipped", "Kafka messages committed without handling after all retry attempts failed",
+    ("topic", "partition")
+)
+
+
+async def start_metrics_server(host: str, port: int) -> web.AppRunner:
+    """/metrics процесса на отдельном порту; остановка - runner.cleanup()"""
+    async def metrics(_: web.Request) -> web.Response:
+        return web.Response(body=registry.render(), headers={"Content-Type": CONTENT_TYPE})
+
+    app = web.Application()
+    app.router.add_get("/metrics", metrics)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, host=host, port=port).start()
+    return runner
@@ -1,5 +1,12 @@
+
 __all__ = (
-    "AuthMiddleware"
+    "AuthMiddleware",
+    "DBSessionMiddleware",
+    "InstrumentationMiddleware",
+    "MetricsMiddleware",
 )
 
 from .middleware import AuthMiddleware
+from .instrumentation import InstrumentationMiddleware
+from .metrics import MetricsMiddleware
+from .session import DBSessionMiddleware
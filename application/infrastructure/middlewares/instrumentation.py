@@ -0,0 +1,41 @@
+import logging
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from application.infrastructure.instrumentation import RequestMetrics, request_metrics
+
+logger = logging.getLogger(__name__)
+
+
+class InstrumentationMiddleware:
+    """
+    Собирает метрики запроса, отдаёт их в заголовке Server-Timing и пишет одной строкой key=value в лог.
+    Регистрируется только при включённой инструментации.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metrics = RequestMetrics(started=time.perf_counter())
+        response_status: list[int] = [0]
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                response_status[0] = message["status"]
+                MutableHeaders(scope=message).append("Server-Timing", metrics.server_timing())
+            await send(message)
+
+        context_token = request_metrics.set(metrics)
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            request_metrics.reset(context_token)
+            fields: str = " ".join(f"{name}={value}" for name, value in metrics.to_log_fields().items())
+            logger.info(f"method={scope['method']} path={scope['path']} status={response_status[0]} {fields}")
@@ -0,0 +1,40 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from application.infrastructure.metrics import http_request_duration
+
+
+class MetricsMiddleware:
+    """
+    Гистограмма длительности запросов по шаблону маршрута (/api/v1/advertisement/, а не конкретный путь),
+    поэтому число серий не растёт вместе с числом идентификаторов в URL
+    """
+    UNMATCHED_ROUTE = "unmatched"
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started: float = time.perf_counter()
+        response_status: list[int] = [500]
+
+        async def send_with_status(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                response_status[0] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            http_request_duration.observe(
+                time.perf_counter() - started,
+                scope["method"],
+                getattr(route, "path", self.UNMATCHED_ROUTE),
+                str(response_status[0]),
+            )
@@ -1,38 +1,54 @@
 import logging
-from typing import Callable
 from datetime import datetime
 
 import jwt
-from fastapi import Request, Response, status as status_code
+from fastapi import status as status_code
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from application.config import settings
 from application.context import user as user_context
 
 from application.exceptions.domain import InvalidTokenError
+from application.infrastructure.instrumentation import track
 from application.web.services.token.token_jwt import token_manager, ACCESS_TOKEN_TYPE
 
 logger = logging.getLogger(__name__)
 
 
-class AuthMiddleware(BaseHTTPMiddleware):
+class AuthMiddleware:
+    """
+    Чистый ASGI middleware: в отличие от BaseHTTPMiddleware не создаёт на запрос
+    отдельную задачу и memory streams и не буферизует потоковые ответы.
+    """
     EXCLUDE_PATHS: tuple[str] = settings.auth_jwt.EXCLUDE_PATHS
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        try:
-            if request.url.path.endswith(self.EXCLUDE_PATHS):
-                return await call_next(request)
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].endswith(self.EXCLUDE_PATHS):
+            await self.app(scope, receive, send)
+            return
 
-            access_token_payload: dict = await token_manager.get_current_token_payload(request=request)
+        try:
+            authorization: str | None = Headers(scope=scope).get("Authorization")
+            with track("jwt_time"):
+                access_token_payload: dict = token_manager.get_token_payload(authorization=authorization)
             token_manager.validate_token_type(access_token_payload, ACCESS_TOKEN_TYPE)
-            user_context.set(access_token_payload)
-            response: Response = await call_next(request)
-            return response
 
         except (jwt.PyJWTError, InvalidTokenError) as ex:
             logger.error(f"Token decoding error: {ex}")
-            return JSONResponse(
+            response = JSONResponse(
                 status_code=status_code.HTTP_401_UNAUTHORIZED,
                 content={"status": "error", "data": f"{datetime.now()}", "detail": "Unauthorized"}
             )
+            await response(scope, receive, send)
+            return
+
+        context_token = user_context.set(access_token_payload)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            user_context.reset(context_token)
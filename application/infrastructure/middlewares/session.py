@@ -0,0 +1,30 @@
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from application.context import db_session as db_session_context
+from application.infrastructure.database import async_session_maker
+
+
+class DBSessionMiddleware:
+    """
+    Одна сессия БД на HTTP-запрос: все unit of work запроса работают через неё,
+    поэтому соединение берётся из пула один раз, а не на каждый сервисный вызов.
+    Сессия ленивая: соединение занимается только при первом запросе к БД.
+    Транзакция завершается на выходе из каждого unit of work, и соединение возвращается в пул,
+    так что пока отправляется тело ответа, оно не висит "idle in transaction".
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        session = async_session_maker()
+        context_token = db_session_context.set(session)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            db_session_context.reset(context_token)
+            await session.close()
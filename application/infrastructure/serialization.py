@@ -0,0 +1,60 @@
+"""
+Быстрый JSON с опциональными бэкендами: orjson, затем msgspec, иначе stdlib json.
+Ни один из ускорителей не обязателен - модуль всегда работает на стандартной библиотеке;
+orjson ставится экстрой fast-json (poetry install --extras fast-json).
+Формат совпадает с JSON-режимом pydantic: Decimal - строкой, datetime - ISO 8601,
+нулевое смещение - суффиксом Z, а не +00:00 (msgspec пишет UTC так сам, orjson - с OPT_UTC_Z).
+"""
+import json
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Any, Callable
+from uuid import UUID
+
+loads: Callable[[bytes | str], Any]
+dumps: Callable[[Any], bytes]
+JSON_BACKEND: str
+# Исключения loads на некорректном JSON и на значении не того типа (None у tombstone-записи) у выбранного бэкенда
+DECODE_ERRORS: tuple[type[Exception], ...]
+
+
+def _isoformat(value: date) -> str:
+    if isinstance(value, datetime) and value.utcoffset() == timedelta(0):
+        return value.replace(tzinfo=None).isoformat() + "Z"
+    return value.isoformat()
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, (Decimal, UUID)):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return _isoformat(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+try:
+    import orjson
+
+    loads = orjson.loads
+    JSON_BACKEND = "orjson"
+    DECODE_ERRORS = (orjson.JSONDecodeError,)
+
+    def dumps(value: Any) -> bytes:
+        return orjson.dumps(value, default=_default, option=orjson.OPT_UTC_Z)
+
+except ImportError:
+    try:
+        import msgspec
+
+        loads = msgspec.json.decode
+        dumps = msgspec.json.Encoder(enc_hook=_default).encode
+        JSON_BACKEND = "msgspec"
+        DECODE_ERRORS = (msgspec.DecodeError, TypeError)
+
+    except ImportError:
+        loads = json.loads
+        JSON_BACKEND = "json"
+        DECODE_ERRORS = (ValueError, TypeError)
+
+        def dumps(value: Any) -> bytes:
+            return json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=_default).encode("utf-8")
@@ -2,6 +2,6 @@ from .database import async_session_maker
 from application.repos.uow.unit_of_work import SqlAlchemyUnitOfWork
 
 
-def get_unit_of_work() -> SqlAlchemyUnitOfWork:
-    return SqlAlchemyUnitOfWork(session_factory=async_session_maker)
+def get_unit_of_work(isolated: bool = False) -> SqlAlchemyUnitOfWork:
+    return SqlAlchemyUnitOfWork(session_factory=async_session_maker, isolated=isolated)
 
@@ -1,16 +1,100 @@
 from typing import Optional, Any
 
-from sqlalchemy import select, delete, update, Result, and_
+from sqlalchemy import (
+    select, delete, update, func, literal, literal_column, values, column, cast, types,
+    Result, and_, or_, tuple_, union_all, Select, ColumnElement
+)
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from application.domain.entities.ad import Advertisement as DomainAdvertisement
 from application.domain.repos.ad import AbstractAdvertisementRepository
+from application.domain.value_objects.ad import Status, Version
+from application.domain.value_objects.pagination import Cursor
 from application.exceptions.db import DBError
-from application.repos.models import Advertisement
+from application.repos.models import Advertisement, Category, User
+from application.repos.models.ad import SEARCH_CONFIG
+
+# Только колонки, нужные для доменной сущности: без tsvector и без ORM-объектов в identity map
+ADVERTISEMENT_PROJECTION = (
+    *(column for column in Advertisement.__table__.c if column.key != "search_vector"),
+    *(column.label(f"author_{column.key}") for column in User.__table__.c),
+    *(column.label(f"category_{column.key}") for column in Category.__table__.c),
+)
+
+
+def _select_projection(*extra_columns: ColumnElement[Any]) -> Select:
+    return (
+        select(*ADVERTISEMENT_PROJECTION, *extra_columns)
+        .join(User, Advertisement.author_id == User.oid)
+        .join(Category, Advertisement.category_id == Category.oid)
+    )
+
+
+FEED_ORDER = (Advertisement.approved_at.desc().nulls_last(), Advertisement.oid.desc())
+
+
+def status_filter(statuses: tuple[str, ...]) -> ColumnElement[bool]:
+    """
+    Статусы попадают в SQL литералами, а не параметрами: частичные индексы объявлены с WHERE status = 'ACTIVE',
+    и обобщённый план подготовленного запроса asyncpg с $n на месте статуса их не выбирает
+    """
+    if len(statuses) == 1:
+        return Advertisement.status == literal(statuses[0], literal_execute=True)
+    return Advertisement.status.in_([literal(status, literal_execute=True) for status in statuses])
+
+
+def _dated_after_cursor(cursor: Cursor) -> ColumnElement[bool]:
+    """
+    Опубликованные строго после курсора. Сравнение строк (approved_at, oid) < (x, y) PostgreSQL
+    превращает в границу диапазона индекса ленты, строки с approved_at IS NULL оно не пропускает
+    """
+    return (
+        tuple_(Advertisement.approved_at, Advertisement.oid)
+        < tuple_(cursor.approved_at, cursor.oid, types=(Advertisement.approved_at.type, Advertisement.oid.type))
+    )
+
+
+def _undated_after_cursor(cursor: Cursor) -> ColumnElement[bool]:
+    """Хвост ленты без даты публикации: после курсора, который уже стоит в этом хвосте"""
+    return and_(Advertisement.approved_at.is_(None), Advertisement.oid < cursor.oid)
+
+
+def _after_cursor(cursor: Cursor) -> ColumnElement[bool]:
+    """Условие "строго после курсора" для сортировки approved_at DESC NULLS LAST, oid DESC"""
+    if cursor.approved_at is None:
+        return _undated_after_cursor(cursor)
+
+    return or_(_dated_after_cursor(cursor), Advertisement.approved_at.is_(None))
+
+
+def _paginate(query: Select,
+              limit: int,
+              cursor: Optional[Cursor],
+              rank: Optional[ColumnElement[float]] = None) -> Select:
+    if rank is not None:
+        # порядок задаёт релевантность, индекс ленты здесь не помогает, поэтому условие остаётся одним OR
+        if cursor:
+            query = query.where(or_(rank < cursor.rank, and_(rank == cursor.rank, _after_cursor(cursor))))
+        return query.order_by(rank.desc(), *FEED_ORDER).limit(limit)
+
+    if cursor is None:
+        return query.order_by(*FEED_ORDER).limit(limit)
+
+    if cursor.approved_at is None:
+        return query.where(_undated_after_cursor(cursor)).order_by(*FEED_ORDER).limit(limit)
+
+    # OR с хвостом approved_at IS NULL не даёт планировщику диапазон по индексу, и страница N стоила бы O(N).
+    # Поэтому две ветки, каждая читает не больше limit строк своего диапазона, а объединение досортировывается
+    dated: Select = query.where(_dated_after_cursor(cursor)).order_by(*FEED_ORDER).limit(limit)
+    undated: Select = query.where(Advertisement.approved_at.is_(None)).order_by(*FEED_ORDER).limit(limit)
+    feed = union_all(dated, undated).subquery("feed")
+    return select(*feed.c).order_by(feed.c.approved_at.desc().nulls_last(), feed.c.oid.desc()).limit(limit)
 
 
 class SQLAlchemyAdvertisementRepository(AbstractAdvertisementRepository):
+    VIEWS_CHUNK_SIZE: int = 1000
+
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
 
@@ -25,11 +109,35 @@ class SQLAlchemyAdvertisementRepository(AbstractAdvertisementRepository):
 
     async def get(self, advertisement_oid: str) -> DomainAdvertisement | None:
         try:
-            query = select(Advertisement).where(Advertisement.oid == advertisement_oid)
+            query = _select_projection().where(Advertisement.oid == advertisement_oid)
             result = await self.session.execute(query)
-            advertisement_model: Optional[Advertisement] = result.scalar_one_or_none()
-            if advertisement_model:
-                return advertisement_model.to_entity()
+            row = result.one_or_none()
+            if row:
+                return Advertisement.from_row(row)
+
+        except SQLAlchemyError as exc:
+            raise DBError(exc)
+
+    async def get_version(self, advertisement_oid: str) -> Optional[Version]:
+        """
+        Только версия и статус: три поиска по первичному ключу без чтения остальных колонок.
+        Автор и категория входят в ответ, поэтому версия - самое позднее изменение из трёх строк
+        """
+        try:
+            query = (
+                select(
+                    Advertisement.oid,
+                    func.greatest(Advertisement.updated_at, User.updated_at, Category.updated_at).label("updated_at"),
+                    Advertisement.status,
+                )
+                .join(User, Advertisement.author_id == User.oid)
+                .join(Category, Advertisement.category_id == Category.oid)
+                .where(Advertisement.oid == advertisement_oid)
+            )
+            result = await self.session.execute(query)
+            row = result.one_or_none()
+            if row:
+                return Version(oid=str(row.oid), updated_at=row.updated_at, status=Status[row.status])
 
         except SQLAlchemyError as exc:
             raise DBError(exc)
@@ -42,52 +150,119 @@ class SQLAlchemyAdvertisementRepository(AbstractAdvertisementRepository):
         except SQLAlchemyError as exc:
             raise DBError(exc)
 
-    async def all(self) -> list[DomainAdvertisement]:
+    async def all(self,
+                  limit: int,
+                  cursor: Optional[Cursor] = None,
+                  statuses: Optional[tuple[str, ...]] = None) -> list[DomainAdvertisement]:
         try:
-            result: Result = await self.session.execute(select(Advertisement))
-            return [advertisement.to_entity() for advertisement in result.scalars().all()]
+            query = _select_projection()
+            if statuses:
+                query = query.where(status_filter(statuses))
+
+            query = _paginate(query, limit=limit, cursor=cursor)
+            result: Result = await self.session.execute(query)
+            return [Advertisement.from_row(row) for row in result]
 
         except SQLAlchemyError as exc:
             raise DBError(exc)
 
-    async def get_all_by_params(self, params: dict[str, Any], offset: int, limit: int) -> list[DomainAdvertisement]:
+    @staticmethod
+    def build_search_query(params: dict[str, Any], limit: int, cursor: Optional[Cursor] = None) -> Select:
+        mapping_filter = {
+            "price_from": lambda value_params: Advertisement.price >= value_params,
+            "price_to": lambda value_params: Advertisement.price <= value_params,
+            "category_id": lambda value_params: Advertisement.category_id == value_params,
+            "city": lambda value_params: Advertisement.city == value_params,
+        }
+        filters = [status_filter(("ACTIVE",))]
+
+        for name_field, value in params.items():
+            if name_field in mapping_filter:
+                filters.append(mapping_filter[name_field](value))
+
+        query_text: Optional[str] = params.get("q")
+        if not query_text:
+            return _paginate(_select_projection().filter(and_(*filters)), limit=limit, cursor=cursor)
+
+        ts_query = func.websearch_to_tsquery(literal_column(f"'{SEARCH_CONFIG}'::regconfig"), query_text)
+        rank = func.ts_rank_cd(Advertisement.search_vector, ts_query)
+        filters.append(Advertisement.search_vector.bool_op("@@")(ts_query))
+        query = _select_projection(rank.label("rank")).filter(and_(*filters))
+        return _paginate(query, limit=limit, cursor=cursor, rank=rank)
+
+    async def get_all_by_params(self,
+                                params: dict[str, Any],
+                                limit: int,
+                                cursor: Optional[Cursor] = None) -> list[DomainAdvertisement]:
         try:
-            mapping_filter = {
-                "price_from": lambda value_params: Advertisement.price >= value_params,
-                "price_to": lambda value_params: Advertisement.price <= value_params,
-                "category": lambda value_params: Advertisement.category == value_params,
-                "city": lambda value_params: Advertisement.city == value_params,
-            }
-            filters = [Advertisement.status == "ACTIVE"]
-
-            for name_field, value in params.items():
-                if name_field in mapping_filter:
-                    filters.append(mapping_filter[name_field](value))
-
-            query = select(Advertisement).filter(and_(*filters)).offset(offset).limit(limit)
+            query = self.build_search_query(params=params, limit=limit, cursor=cursor)
             result = await self.session.execute(query)
-            return [advertisement.to_entity() for advertisement in result.scalars().all()]
+            return [Advertisement.from_row(row) for row in result]
 
         except SQLAlchemyError as exc:
             raise DBError(exc)
 
-    async def get_one_by_all_params(self, params: dict[str, Any]) -> Optional[Advertisement]:
+    async def full_text_search(self,
+                               params: dict[str, Any],
+                               limit: int,
+                               cursor: Optional[Cursor] = None) -> list[tuple[DomainAdvertisement, float]]:
         try:
-            query = select(Advertisement).filter_by(**params)
+            query = self.build_search_query(params=params, limit=limit, cursor=cursor)
             result = await self.session.execute(query)
-            ad_model: Optional[Advertisement] = result.scalar_one_or_none()
-            if ad_model:
-                return ad_model.to_entity()
+            return [(Advertisement.from_row(row), row.rank) for row in result]
+
+        except SQLAlchemyError as exc:
+            raise DBError(exc)
+
+    async def get_one_by_all_params(self, params: dict[str, Any]) -> Optional[DomainAdvertisement]:
+        try:
+            filters = [getattr(Advertisement, field) == value for field, value in params.items()]
+            query = _select_projection().where(*filters)
+            result = await self.session.execute(query)
+            row = result.one_or_none()
+            if row:
+                return Advertisement.from_row(row)
 
         except SQLAlchemyError as exc:
             raise DBError(exc)
 
     async def update(self, advertisement: DomainAdvertisement) -> DomainAdvertisement:
         try:
-            updated_ad: dict[str, str] = Advertisement.to_dict(advertisement=advertisement)
+            updated_ad: dict[str, str] = Advertisement.to_dict(advertisement=advertisement,
+                                                               fields=advertisement.changed_fields)
+            if not updated_ad:
+                return advertisement
+
             stmt = update(Advertisement).where(Advertisement.oid == advertisement.oid).values(updated_ad)
             await self.session.execute(stmt)
+            advertisement.mark_clean()
             return advertisement
 
         except SQLAlchemyError as exc:
             raise DBError(exc)
+
+    async def increment_views(self, views: dict[str, int]) -> None:
+        """
+        Пакетное прибавление просмотров: UPDATE ... FROM (VALUES (oid, n), ...) на VIEWS_CHUNK_SIZE объявлений.
+        Строки сортируются по oid, чтобы воркеры блокировали их в одном порядке и не ловили deadlock.
+        """
+        try:
+            rows: list[tuple[str, int]] = sorted(views.items())
+            for start in range(0, len(rows), self.VIEWS_CHUNK_SIZE):
+                new_views = (
+                    values(column("oid", types.Uuid), column("views", types.Integer), name="new_views")
+                    .data(rows[start:start + self.VIEWS_CHUNK_SIZE])
+                )
+                stmt = (
+                    update(Advertisement)
+                    .where(Advertisement.oid == new_views.c.oid)
+                    # параметры внутри VALUES PostgreSQL выводит как text, поэтому явный CAST
+                    .values(number_of_views=Advertisement.number_of_views + cast(new_views.c.views, types.Integer),
+                            # просмотры не меняют представление объявления, версия для ETag остаётся прежней
+                            updated_at=Advertisement.updated_at)
+                    .execution_options(synchronize_session=False)
+                )
+                await self.session.execute(stmt)
+
+        except SQLAlchemyError as exc:
+            raise DBError(exc)
@@ -0,0 +1,142 @@
+"""
+Проверка планов запросов поиска объявлений.
+
+    python -m application.repos.explain [--no-seqscan]
+
+Для каждого типового набора фильтров /advertisement/search выполняется EXPLAIN и проверяется,
+что таблица advertisement читается по индексу, а не последовательным сканированием.
+Случаи "page N" строят запрос следующей страницы от курсора из середины ленты: такая страница тоже должна
+читаться диапазоном индекса, а не перебором всех строк перед курсором.
+Проверяется тот же SQL, что отправляет приложение: диалект asyncpg с параметрами $n. Запрос готовится
+через PREPARE, и с plan_cache_mode = force_generic_plan EXPLAIN показывает обобщённый план - тот, которым
+asyncpg выполняет подготовленный запрос после первых вызовов и который не видит значений параметров.
+На маленькой dev-базе планировщик честно выбирает Seq Scan, поэтому там стоит запускать с --no-seqscan.
+"""
+import argparse
+import asyncio
+import json
+import sys
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Iterator, Optional
+from uuid import uuid4
+
+from sqlalchemy import Select, literal, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.engine import Compiled
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from application.domain.value_objects.pagination import Cursor
+from application.infrastructure.database import engine
+from application.repos.ad import SQLAlchemyAdvertisementRepository
+
+TABLE_NAME = "advertisement"
+CURSOR_OFFSET = 1000
+STATEMENT_NAME = "advertisement_search_plan"
+
+
+def iter_plan_nodes(plan: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from iter_plan_nodes(child)
+
+
+async def sample_filter_values(connection: AsyncConnection) -> tuple[str, Any]:
+    result = await connection.execute(
+        text("SELECT city, category_id FROM advertisement WHERE status = 'ACTIVE' LIMIT 1")
+    )
+    row = result.first()
+    if row:
+        return row.city, row.category_id
+
+    return "Москва", uuid4()
+
+
+async def sample_cursor(connection: AsyncConnection) -> Cursor:
+    """Курсор из середины ленты, если в базе достаточно строк, иначе с последнего объявления"""
+    result = await connection.execute(
+        text("SELECT approved_at, oid FROM advertisement WHERE status = 'ACTIVE' AND approved_at IS NOT NULL "
+             "ORDER BY approved_at DESC, oid DESC OFFSET :offset LIMIT 1"),
+        {"offset": CURSOR_OFFSET},
+    )
+    row = result.first()
+    if row:
+        return Cursor(approved_at=row.approved_at, oid=str(row.oid))
+
+    return Cursor(approved_at=datetime.utcnow(), oid=str(uuid4()))
+
+
+def build_cases(city: str, category_id: Any, cursor: Cursor) -> dict[str, tuple[dict[str, Any], Optional[Cursor]]]:
+    return {
+        "feed": ({}, None),
+        "city": ({"city": city}, None),
+        "category": ({"category_id": category_id}, None),
+        "city+category": ({"city": city, "category_id": category_id}, None),
+        "city+category+price": ({"city": city, "category_id": category_id,
+                                 "price_from": Decimal("100"), "price_to": Decimal("10000")}, None),
+        "price": ({"price_from": Decimal("100"), "price_to": Decimal("10000")}, None),
+        "full-text": ({"q": "велосипед"}, None),
+        "feed page N": ({}, cursor),
+        "city+category page N": ({"city": city, "category_id": category_id}, cursor),
+    }
+
+
+def compile_as_sent(query: Select) -> tuple[str, list[str]]:
+    """
+    SQL в том виде, в каком его готовит asyncpg, и значения параметров $1..$n литералами для EXECUTE
+    """
+    compiled: Compiled = query.compile(dialect=engine.dialect, compile_kwargs={"render_postcompile": True})
+    arguments: list[str] = [
+        str(literal(compiled.params[name], compiled.binds[name].type).compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+        ))
+        for name in compiled.positiontup
+    ]
+    return str(compiled), arguments
+
+
+async def explain(connection: AsyncConnection,
+                  params: dict[str, Any],
+                  cursor: Optional[Cursor]) -> list[dict[str, Any]]:
+    query = SQLAlchemyAdvertisementRepository.build_search_query(params=params, limit=21, cursor=cursor)
+    sql, arguments = compile_as_sent(query)
+    await connection.exec_driver_sql(f"PREPARE {STATEMENT_NAME} AS {sql}")
+    try:
+        execute: str = f"EXECUTE {STATEMENT_NAME}({', '.join(arguments)})" if arguments else f"EXECUTE {STATEMENT_NAME}"
+        result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {execute}")
+        raw_plan = result.scalar_one()
+    finally:
+        await connection.exec_driver_sql(f"DEALLOCATE {STATEMENT_NAME}")
+    plan: dict[str, Any] = (json.loads(raw_plan) if isinstance(raw_plan, str) else raw_plan)[0]["Plan"]
+    return [node for node in iter_plan_nodes(plan) if node.get("Relation Name") == TABLE_NAME]
+
+
+async def check_search_plans(no_seqscan: bool) -> bool:
+    success = True
+    async with engine.connect() as connection:
+        await connection.execute(text("SET plan_cache_mode = force_generic_plan"))
+        if no_seqscan:
+            await connection.execute(text("SET enable_seqscan = off"))
+
+        city, category_id = await sample_filter_values(connection)
+        cursor: Cursor = await sample_cursor(connection)
+        for name, (params, page_cursor) in build_cases(city, category_id, cursor).items():
+            nodes: list[dict[str, Any]] = await explain(connection, params, page_cursor)
+            scans: list[str] = [f"{node['Node Type']}({node.get('Index Name', '-')})" for node in nodes]
+            uses_seq_scan: bool = any(node["Node Type"] == "Seq Scan" for node in nodes)
+            success = success and not uses_seq_scan
+            print(f"{'FAIL' if uses_seq_scan else 'OK':4} {name:20} {', '.join(scans)}")
+
+    await engine.dispose()
+    return success
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="EXPLAIN-проверка индексов поиска объявлений")
+    parser.add_argument("--no-seqscan", action="store_true", help="запретить планировщику Seq Scan (для dev-базы)")
+    args = parser.parse_args()
+    sys.exit(0 if asyncio.run(check_search_plans(no_seqscan=args.no_seqscan)) else 1)
+
+
+if __name__ == "__main__":
+    main()
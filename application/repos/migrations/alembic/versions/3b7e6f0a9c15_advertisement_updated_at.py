@@ -0,0 +1,28 @@
+"""Advertisement updated_at
+
+Revision ID: 3b7e6f0a9c15
+Revises: 9e4b1d7c2a63
+Create Date: 2026-10-18 19:24:41.312870
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b7e6f0a9c15'
+down_revision: Union[str, None] = '9e4b1d7c2a63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # now() стабильна в пределах транзакции: PostgreSQL 11+ добавляет такую колонку без перезаписи таблицы
+    op.add_column('advertisement', sa.Column('updated_at', sa.DateTime(),
+                                             server_default=sa.text("TIMEZONE('utc', now())"), nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('advertisement', 'updated_at')
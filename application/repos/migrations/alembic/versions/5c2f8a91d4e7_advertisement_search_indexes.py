@@ -0,0 +1,47 @@
+"""Advertisement search indexes
+
+Revision ID: 5c2f8a91d4e7
+Revises: 1e119aeb298f
+Create Date: 2026-10-18 10:12:44.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c2f8a91d4e7'
+down_revision: Union[str, None] = '1e119aeb298f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ACTIVE_ONLY = sa.text("status = 'ACTIVE'")
+FEED_ORDER = [sa.text('approved_at DESC NULLS LAST'), sa.text('oid DESC')]
+
+INDEXES = (
+    ('ix_advertisement_author_id', 'advertisement', ['author_id'], None),
+    ('ix_advertisement_category_id', 'advertisement', ['category_id'], None),
+    ('ix_moderation_advertisement_id', 'moderation', ['advertisement_id'], None),
+    ('ix_moderation_moderator_id', 'moderation', ['moderator_id'], None),
+    ('ix_advertisement_active_feed', 'advertisement', FEED_ORDER, ACTIVE_ONLY),
+    ('ix_advertisement_active_city_category_feed', 'advertisement', ['city', 'category_id', *FEED_ORDER], ACTIVE_ONLY),
+    ('ix_advertisement_active_category_feed', 'advertisement', ['category_id', *FEED_ORDER], ACTIVE_ONLY),
+    ('ix_advertisement_active_price', 'advertisement', ['price'], ACTIVE_ONLY),
+    ('ix_advertisement_status_feed', 'advertisement', ['status', *FEED_ORDER], None),
+)
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY не может выполняться внутри транзакции
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(name, table, columns, unique=False,
+                            postgresql_where=where, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,84 @@
+"""Advertisement full text search
+
+Revision ID: 9e4b1d7c2a63
+Revises: 5c2f8a91d4e7
+Create Date: 2026-10-18 11:02:17.904551
+
+Колонка search_vector добавляется без перезаписи таблицы: STORED generated column заставила бы PostgreSQL
+переписать всю advertisement под ACCESS EXCLUSIVE, и чтение с записью стояли бы до конца миграции.
+Вместо этого:
+- обычная nullable колонка (ADD COLUMN без DEFAULT меняет только каталог, блокировка мгновенная);
+- BEFORE-триггер заполняет её для новых и изменённых строк;
+- существующие строки дозаполняются пачками по BACKFILL_BATCH_SIZE, каждая пачка в своей транзакции,
+  поэтому блокируются только строки текущей пачки;
+- GIN-индекс строится CONCURRENTLY.
+Пока идёт backfill, строки без search_vector просто не находятся полнотекстовым поиском.
+"""
+import uuid
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e4b1d7c2a63'
+down_revision: Union[str, None] = '5c2f8a91d4e7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 5000
+SEARCH_VECTOR = "to_tsvector('russian', coalesce({row}title, '') || ' ' || coalesce({row}description, ''))"
+
+
+def backfill_search_vector(connection: sa.Connection) -> None:
+    # Пачки идут по первичному ключу, чтобы каждая читала диапазон индекса, а не всю таблицу заново
+    backfill = sa.text(f"""
+        UPDATE advertisement SET search_vector = {SEARCH_VECTOR.format(row='')}
+        FROM (SELECT oid FROM advertisement WHERE oid > :after ORDER BY oid LIMIT :batch_size) AS batch
+        WHERE advertisement.oid = batch.oid
+        RETURNING advertisement.oid
+    """).bindparams(sa.bindparam('after', type_=sa.Uuid))
+    after: uuid.UUID = uuid.UUID(int=0)
+    while oids := connection.execute(backfill, {"after": after, "batch_size": BACKFILL_BATCH_SIZE}).scalars().all():
+        after = max(oids)
+
+
+def upgrade() -> None:
+    op.add_column('advertisement', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+    op.execute(f"""
+        CREATE FUNCTION advertisement_search_vector_update() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector := {SEARCH_VECTOR.format(row='NEW.')};
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER advertisement_search_vector_update
+        BEFORE INSERT OR UPDATE OF title, description ON advertisement
+        FOR EACH ROW EXECUTE FUNCTION advertisement_search_vector_update()
+    """)
+
+    # Пачки и CREATE INDEX CONCURRENTLY - вне транзакции миграции, иначе блокировки держались бы до её конца
+    with op.get_context().autocommit_block():
+        if op.get_context().as_sql:
+            # В offline-режиме (--sql) результатов нет, пачки по такому скрипту нарезает тот, кто его применяет
+            op.execute(f"UPDATE advertisement SET search_vector = {SEARCH_VECTOR.format(row='')} "
+                       "WHERE search_vector IS NULL")
+        else:
+            backfill_search_vector(op.get_bind())
+
+        op.create_index('ix_advertisement_active_search_vector', 'advertisement', ['search_vector'], unique=False,
+                        postgresql_using='gin', postgresql_where=sa.text("status = 'ACTIVE'"),
+                        postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_advertisement_active_search_vector', table_name='advertisement',
+                      postgresql_concurrently=True, if_exists=True)
+    op.execute("DROP TRIGGER advertisement_search_vector_update ON advertisement")
+    op.execute("DROP FUNCTION advertisement_search_vector_update()")
+    op.drop_column('advertisement', 'search_vector')
@@ -0,0 +1,30 @@
+"""User and category updated_at
+
+Revision ID: c4a8e2f61b07
+Revises: 3b7e6f0a9c15
+Create Date: 2026-10-18 20:05:13.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4a8e2f61b07'
+down_revision: Union[str, None] = '3b7e6f0a9c15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Как и у advertisement.updated_at: now() стабильна в пределах транзакции, таблицы не перезаписываются
+    for table in ('user', 'category'):
+        op.add_column(table, sa.Column('updated_at', sa.DateTime(),
+                                       server_default=sa.text("TIMEZONE('utc', now())"), nullable=False))
+
+
+def downgrade() -> None:
+    for table in ('category', 'user'):
+        op.drop_column(table, 'updated_at')
@@ -1,14 +1,23 @@
 from decimal import Decimal
 from datetime import datetime
+from typing import Iterable, Optional
 from uuid import UUID
 
-from sqlalchemy import ForeignKey, String, text, types, JSON
+from sqlalchemy import ForeignKey, Index, Row, String, func, text, types, JSON
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from application.domain.entities.ad import Advertisement as DomainAdvertisement
+from application.domain.entities.category_ad import Category as DomainCategory
+from application.domain.entities.user import User as DomainUser
+from application.domain.value_objects import user as user_values
 from application.domain.value_objects.ad import Status, Photo
 from . import Base
 
+SEARCH_CONFIG = "russian"
+# Поля-сущности доменной модели хранятся внешними ключами
+ENTITY_FIELD_TO_COLUMN: dict[str, str] = {"author": "author_id", "category": "category_id"}
+
 
 class Advertisement(Base):
     __tablename__ = "advertisement"
@@ -20,17 +29,24 @@ class Advertisement(Base):
     city: Mapped[str] = mapped_column(String(50))
     description: Mapped[str] = mapped_column(String(250))
     created_at: Mapped[datetime] = mapped_column(server_default=text("TIMEZONE('utc', now())"))
+    # Версия строки для ETag/Last-Modified: меняется при любом UPDATE через SQLAlchemy, кроме счётчика просмотров
+    updated_at: Mapped[datetime] = mapped_column(server_default=text("TIMEZONE('utc', now())"),
+                                                 onupdate=func.timezone("utc", func.now()))
     approved_at: Mapped[datetime | None] = mapped_column(default=None)
     price: Mapped[Decimal]
     number_of_views: Mapped[int]
     photo: Mapped[list] = mapped_column(JSON)
     status: Mapped[str]
-    author_id: Mapped[UUID] = mapped_column(ForeignKey(column="user.oid", ondelete="CASCADE"))
-    category_id: Mapped[UUID] = mapped_column(ForeignKey(column="category.oid", ondelete="CASCADE"))
+    author_id: Mapped[UUID] = mapped_column(ForeignKey(column="user.oid", ondelete="CASCADE"), index=True)
+    category_id: Mapped[UUID] = mapped_column(ForeignKey(column="category.oid", ondelete="CASCADE"), index=True)
+    # Заполняет триггер advertisement_search_vector_update из миграции 9e4b1d7c2a63 при INSERT и UPDATE
+    # title или description. NULL - только у строк, до которых ещё не дошёл backfill той же миграции
+    search_vector: Mapped[str | None] = mapped_column(TSVECTOR, deferred=True)
 
-    user = relationship("User", back_populates="advertisements", lazy="selectin")
-    category = relationship("Category", back_populates="advertisements", lazy="selectin")
-    moderation = relationship("Moderation", back_populates="advertisement", lazy="selectin")
+    # Чтение идёт через проекцию с JOIN (см. repos.ad), связи не подгружаются неявно
+    user = relationship("User", back_populates="advertisements", lazy="raise")
+    category = relationship("Category", back_populates="advertisements", lazy="raise")
+    moderation = relationship("Moderation", back_populates="advertisement", lazy="raise")
 
     @classmethod
     def from_entity(cls, advertisement: DomainAdvertisement) -> "Advertisement":
@@ -49,25 +65,53 @@ class Advertisement(Base):
                 category_id=advertisement.category.oid
             )
 
-    def to_entity(self) -> DomainAdvertisement:
-        return DomainAdvertisement(
-            oid=str(self.oid),
-            title=self.title,
-            city=self.city,
-            description=self.description,
-            created_at=self.created_at,
-            approved_at=self.approved_at,
-            price=self.price,
-            number_of_views=self.number_of_views,
-            photo=Photo(self.photo),
-            status=Status[self.status],
-            author=self.user.to_entity(),
-            category=self.category.to_entity()
+    @staticmethod
+    def from_row(row: Row) -> DomainAdvertisement:
+        """
+        Строка проекции: колонки объявления, author_* и category_*.
+        Данные из нашей БД уже валидны, поэтому сущности собираются без повторной проверки.
+        """
+        return DomainAdvertisement.trusted(
+            oid=str(row.oid),
+            title=row.title,
+            city=row.city,
+            description=row.description,
+            created_at=row.created_at,
+            updated_at=row.updated_at,
+            approved_at=row.approved_at,
+            price=row.price,
+            number_of_views=row.number_of_views,
+            photo=Photo.trusted(row.photo),
+            status=Status[row.status],
+            author=DomainUser.trusted(
+                oid=str(row.author_oid),
+                first_name=user_values.FullName.trusted(row.author_first_name),
+                last_name=user_values.FullName.trusted(row.author_last_name),
+                middle_name=user_values.FullName.trusted(row.author_middle_name),
+                email=user_values.Email.trusted(row.author_email),
+                number_phone=user_values.Phone.trusted(row.author_number_phone),
+                role=user_values.Role[row.author_role],
+                time_call=row.author_time_call,
+                status=user_values.Status[row.author_status],
+                created_at=row.author_created_at,
+                updated_at=row.author_updated_at
+            ),
+            category=DomainCategory.trusted(
+                oid=str(row.category_oid),
+                title=row.category_title,
+                code=row.category_code,
+                description=row.category_description,
+                created_at=row.category_created_at,
+                updated_at=row.category_updated_at
+            )
         )
 
     @staticmethod
-    def to_dict(advertisement: DomainAdvertisement) -> dict[str, str]:
-        return {
+    def to_dict(advertisement: DomainAdvertisement, fields: Optional[Iterable[str]] = None) -> dict[str, str]:
+        """
+        Колонки для записи; fields - имена полей сущности, чтобы получить только изменённые колонки
+        """
+        data = {
             "oid": advertisement.oid,
             "title": advertisement.title,
             "city": advertisement.city,
@@ -76,9 +120,28 @@ class Advertisement(Base):
             "approved_at": advertisement.approved_at,
             "price": advertisement.price,
             "number_of_views": advertisement.number_of_views,
-            "photo": advertisement.photo,
+            "photo": advertisement.photo.value,
             "status": advertisement.status.name if isinstance(advertisement.status, Status) else advertisement.status,
             "author_id": advertisement.author.oid,
             "category_id": advertisement.category.oid
         }
+        if fields is None:
+            return data
+
+        columns: set[str] = {ENTITY_FIELD_TO_COLUMN.get(field, field) for field in fields}
+        return {column: value for column, value in data.items() if column in columns}
+
+
+# Частичные индексы под сортировку ленты (approved_at DESC NULLS LAST, oid DESC) и фильтры поиска
+_ACTIVE_ONLY = text("status = 'ACTIVE'")
+_FEED_ORDER = (Advertisement.approved_at.desc().nulls_last(), Advertisement.oid.desc())
 
+Index("ix_advertisement_active_feed", *_FEED_ORDER, postgresql_where=_ACTIVE_ONLY)
+Index("ix_advertisement_active_city_category_feed",
+      Advertisement.city, Advertisement.category_id, *_FEED_ORDER,
+      postgresql_where=_ACTIVE_ONLY)
+Index("ix_advertisement_active_category_feed", Advertisement.category_id, *_FEED_ORDER, postgresql_where=_ACTIVE_ONLY)
+Index("ix_advertisement_active_price", Advertisement.price, postgresql_where=_ACTIVE_ONLY)
+Index("ix_advertisement_status_feed", Advertisement.status, *_FEED_ORDER)
+Index("ix_advertisement_active_search_vector", Advertisement.search_vector,
+      postgresql_using="gin", postgresql_where=_ACTIVE_ONLY)
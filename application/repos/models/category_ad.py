@@ -1,7 +1,7 @@
 from datetime import datetime
 from uuid import UUID
 
-from sqlalchemy import String, text, types
+from sqlalchemy import String, func, text, types
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from application.domain.entities.category_ad import Category as DomainCategory
@@ -18,6 +18,9 @@ class Category(Base):
     code: Mapped[str] = mapped_column(String(50), unique=True, index=True)
     description: Mapped[str] = mapped_column(String(250))
     created_at: Mapped[datetime] = mapped_column(server_default=text("TIMEZONE('utc', now())"))
+    # Входит в версию объявлений категории для ETag/Last-Modified
+    updated_at: Mapped[datetime] = mapped_column(server_default=text("TIMEZONE('utc', now())"),
+                                                 onupdate=func.timezone("utc", func.now()))
 
     advertisements = relationship("Advertisement", back_populates="category")
 
@@ -31,9 +34,11 @@ class Category(Base):
         )
 
     def to_entity(self) -> DomainCategory:
-        return DomainCategory(
+        return DomainCategory.trusted(
             oid=str(self.oid),
             title=self.title,
             code=self.code,
             description=self.description,
+            created_at=self.created_at,
+            updated_at=self.updated_at
         )
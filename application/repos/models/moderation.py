@@ -19,9 +19,9 @@ class Moderation(Base):
     is_approved: Mapped[bool]
     rejection_reason: Mapped[str]
 
-    moderator_id: Mapped[UUID] = mapped_column(ForeignKey(column="user.oid", ondelete="CASCADE"))
+    moderator_id: Mapped[UUID] = mapped_column(ForeignKey(column="user.oid", ondelete="CASCADE"), index=True)
     advertisement_id: Mapped[Optional[UUID]] = mapped_column(
-        ForeignKey(column="advertisement.oid", ondelete="SET NULL"))
+        ForeignKey(column="advertisement.oid", ondelete="SET NULL"), index=True)
 
     user = relationship("User", back_populates="moderations", lazy="selectin")
     advertisement = relationship("Advertisement", back_populates="moderation")
@@ -38,7 +38,7 @@ class Moderation(Base):
         )
 
     def to_entity(self) -> DomainModeration:
-        return DomainModeration(
+        return DomainModeration.trusted(
             oid=str(self.oid),
             created_at=self.created_at,
             is_approved=self.is_approved,
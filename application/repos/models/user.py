@@ -1,7 +1,8 @@
 from datetime import datetime
+from typing import Iterable, Optional
 from uuid import UUID
 
-from sqlalchemy import String, text, types
+from sqlalchemy import String, func, text, types
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from application.domain.entities.user import User as DomainUser
@@ -24,22 +25,26 @@ class User(Base):
     time_call: Mapped[str] = mapped_column(String(50))
     status: Mapped[str]
     created_at: Mapped[datetime] = mapped_column(server_default=text("TIMEZONE('utc', now())"))
+    # Входит в версию объявлений автора для ETag/Last-Modified
+    updated_at: Mapped[datetime] = mapped_column(server_default=text("TIMEZONE('utc', now())"),
+                                                 onupdate=func.timezone("utc", func.now()))
 
     advertisements = relationship("Advertisement", back_populates="user")
     moderations = relationship("Moderation", back_populates="user")
 
     def to_entity(self) -> DomainUser:
-        return DomainUser(
+        return DomainUser.trusted(
             oid=str(self.oid),
-            first_name=FullName(self.first_name),
-            last_name=FullName(self.last_name),
-            middle_name=FullName(self.middle_name),
-            email=Email(self.email),
-            number_phone=Phone(self.number_phone),
+            first_name=FullName.trusted(self.first_name),
+            last_name=FullName.trusted(self.last_name),
+            middle_name=FullName.trusted(self.middle_name),
+            email=Email.trusted(self.email),
+            number_phone=Phone.trusted(self.number_phone),
             role=Role[self.role],
             time_call=self.time_call,
             status=Status[self.status],
-            created_at=self.created_at
+            created_at=self.created_at,
+            updated_at=self.updated_at
         )
 
     @classmethod
@@ -58,15 +63,22 @@ class User(Base):
         )
 
     @staticmethod
-    def to_dict(user: DomainUser) -> dict[str, str]:
-        return {
+    def to_dict(user: DomainUser, fields: Optional[Iterable[str]] = None) -> dict[str, str]:
+        """
+        Колонки для записи; fields - имена полей сущности, чтобы получить только изменённые колонки
+        """
+        data = {
             "oid": user.oid,
             "first_name": user.first_name.value,
             "last_name": user.last_name.value,
-            "middle_name": user.middle_name.value,
+            "middle_name": user.middle_name.value if user.middle_name else None,
             "email": user.email.value,
             "role": user.role.name,
             "number_phone": user.number_phone.value,
             "time_call": user.time_call,
             "status": user.status.name
         }
+        if fields is None:
+            return data
+
+        return {column: value for column, value in data.items() if column in fields}
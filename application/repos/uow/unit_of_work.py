@@ -1,4 +1,10 @@
 from abc import abstractmethod, ABC
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from application.context import db_session as db_session_context
+from application.infrastructure.instrumentation import count_unit_of_work
 
 from application.repos.ad import AbstractAdvertisementRepository, SQLAlchemyAdvertisementRepository
 from application.repos.category_ad import AbstractCategoryAdRepository, SQLAlchemyCategoryAdRepository
@@ -34,19 +40,32 @@ class AbstractUnitOfWork(ABC):
 
 
 class SqlAlchemyUnitOfWork(AbstractUnitOfWork):
-    def __init__(self, session_factory) -> None:
+    def __init__(self, session_factory, isolated: bool = False) -> None:
         self.session_factory = session_factory
+        # isolated: всегда своя сессия, даже внутри HTTP-запроса - для параллельных запросов к БД
+        self.isolated = isolated
+        self.owns_session: bool = True
 
     async def __aenter__(self) -> None:
-        self.session = self.session_factory()
+        count_unit_of_work()
+        # Внутри HTTP-запроса используется общая сессия запроса, вне его (consumer, фоновые задачи) - своя
+        shared_session: Optional[AsyncSession] = None if self.isolated else db_session_context.value
+        self.owns_session = shared_session is None
+        self.session = self.session_factory() if self.owns_session else shared_session
         self.users = SQLAlchemyUserRepository(self.session)
         self.category = SQLAlchemyCategoryAdRepository(self.session)
         self.advertisement = SQLAlchemyAdvertisementRepository(self.session)
         self.moderation = SQLAlchemyModerationRepository(self.session)
 
     async def __aexit__(self, *args) -> None:
-        await self.rollback()
-        await self.session.close()
+        if self.owns_session:
+            # close сам откатывает открытую транзакцию, а без транзакции лишний ROLLBACK не нужен
+            await self.session.close()
+        elif self.session.in_transaction():
+            # Общая сессия живёт до конца ответа, поэтому транзакция завершается здесь, как при close своей сессии:
+            # соединение не висит "idle in transaction", пока отправляется тело, а незафиксированные изменения
+            # упавшего блока не попадают в commit следующего сервиса
+            await self.rollback()
 
     async def commit(self) -> None:
         await self.session.commit()
@@ -1,17 +1,23 @@
 from typing import Optional, Any
 from uuid import UUID
 
-from sqlalchemy import select, Result, update, delete, or_
+from sqlalchemy import any_, bindparam, select, Result, String, column, types, update, delete, or_, values
+from sqlalchemy.dialects.postgresql import ARRAY, insert
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from application.domain.entities.user import User as DomainUser
+from application.domain.value_objects.user import Status
 from application.domain.repos.user import AbstractUserRepository
 from application.exceptions.db import DBError
 from application.repos.models.user import User
 
 
 class SQLAlchemyUserRepository(AbstractUserRepository):
+    # 10 колонок на строку: 1000 строк укладываются в лимит 32767 параметров asyncpg
+    INSERT_CHUNK_SIZE: int = 1000
+    UPDATE_CHUNK_SIZE: int = 5000
+
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
 
@@ -24,6 +30,28 @@ class SQLAlchemyUserRepository(AbstractUserRepository):
         except SQLAlchemyError as exc:
             raise DBError(exc)
 
+    async def add_many(self, users: list[DomainUser]) -> set[str]:
+        """
+        INSERT ... ON CONFLICT DO NOTHING пачками по INSERT_CHUNK_SIZE строк.
+        Возвращает oid реально вставленных пользователей: занятые oid, email или телефон пропускаются.
+        """
+        try:
+            rows: list[dict[str, Any]] = [User.to_dict(user=user) | {"created_at": user.created_at} for user in users]
+            created: set[str] = set()
+            for start in range(0, len(rows), self.INSERT_CHUNK_SIZE):
+                stmt = (
+                    insert(User)
+                    .values(rows[start:start + self.INSERT_CHUNK_SIZE])
+                    .on_conflict_do_nothing()
+                    .returning(User.oid)
+                )
+                result: Result = await self.session.execute(stmt)
+                created.update(str(oid) for oid in result.scalars())
+            return created
+
+        except SQLAlchemyError as exc:
+            raise DBError(exc)
+
     async def get(self, user_oid: str) -> DomainUser | None:
         try:
             query = select(User).where(User.oid == user_oid)
@@ -59,8 +87,12 @@ class SQLAlchemyUserRepository(AbstractUserRepository):
             raise DBError(exc)
 
     async def get_multi(self, user_oids: list[UUID]) -> list[DomainUser]:
+        """
+        oid = ANY(:user_oids) с одним параметром-массивом: текст запроса не зависит от числа идентификаторов,
+        поэтому prepared statement asyncpg переиспользуется, а лимит параметров не упирается в длину списка
+        """
         try:
-            query = select(User).where(User.oid.in_(user_oids))
+            query = select(User).where(User.oid == any_(bindparam("user_oids", user_oids, type_=ARRAY(types.Uuid))))
             result: Result = await self.session.execute(query)
             return [user.to_entity() for user in result.scalars().all()]
 
@@ -77,14 +109,64 @@ class SQLAlchemyUserRepository(AbstractUserRepository):
 
     async def update(self, user: DomainUser) -> DomainUser:
         try:
-            updated_user: dict[str, str] = User.to_dict(user=user)
+            updated_user: dict[str, str] = User.to_dict(user=user, fields=user.changed_fields)
+            if not updated_user:
+                return user
+
             stmt = update(User).where(User.oid == user.oid).values(updated_user)
             await self.session.execute(stmt)
+            user.mark_clean()
             return user
 
         except SQLAlchemyError as exc:
             raise DBError(exc)
 
+    async def update_status_by_email(self, email: str, status: Status) -> Optional[str]:
+        """
+        UPDATE user SET status = ... WHERE email = ... RETURNING oid; None, если пользователя нет
+        """
+        try:
+            stmt = (
+                update(User)
+                .where(User.email == email)
+                .values(status=status.name)
+                .returning(User.oid)
+                .execution_options(synchronize_session=False)
+            )
+            result: Result = await self.session.execute(stmt)
+            user_oid: Optional[UUID] = result.scalar_one_or_none()
+            return str(user_oid) if user_oid else None
+
+        except SQLAlchemyError as exc:
+            raise DBError(exc)
+
+    async def update_statuses_by_email(self, statuses: dict[str, Status]) -> dict[str, str]:
+        """
+        Пакетная смена статусов одним UPDATE ... FROM (VALUES ...) на UPDATE_CHUNK_SIZE email.
+        Возвращает email -> oid обновлённых пользователей.
+        """
+        try:
+            rows: list[tuple[str, str]] = [(email, status.name) for email, status in statuses.items()]
+            updated: dict[str, str] = {}
+            for start in range(0, len(rows), self.UPDATE_CHUNK_SIZE):
+                new_statuses = (
+                    values(column("email", String), column("status", String), name="new_statuses")
+                    .data(rows[start:start + self.UPDATE_CHUNK_SIZE])
+                )
+                stmt = (
+                    update(User)
+                    .where(User.email == new_statuses.c.email)
+                    .values(status=new_statuses.c.status)
+                    .returning(User.email, User.oid)
+                    .execution_options(synchronize_session=False)
+                )
+                result: Result = await self.session.execute(stmt)
+                updated.update((email, str(user_oid)) for email, user_oid in result.all())
+            return updated
+
+        except SQLAlchemyError as exc:
+            raise DBError(exc)
+
     async def delete(self, user_oid: UUID) -> None:
         try:
             stmt = delete(User).where(User.oid == user_oid)
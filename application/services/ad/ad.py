@@ -3,14 +3,32 @@ from typing import Optional, Any
 from application.context import get_payload_current_user
 from application.domain.entities.ad import Advertisement as DomainAdvertisement
 from application.domain.entities.category_ad import Category as DomainCategory
+from application.domain.value_objects.ad import Photo, Status, Version
+from application.domain.value_objects.pagination import Cursor, Page
 from application.exceptions.domain import (
     AdvertisementNotFoundError,
     AdvertisementAlreadyExistsError,
-    AccessDeniedError, AdvertisementStatusError
+    AccessDeniedError, AdvertisementStatusError,
+    InvalidCursorError, CategoryNotFoundError
 )
 from application.infrastructure.unit_of_work_manager import get_unit_of_work
 from application.repos.uow.unit_of_work import AbstractUnitOfWork
 from application.services.category_ad import CategoryAdService
+from .cache import advertisement_response_cache
+from .views import view_counter
+
+
+def _to_page(advertisements: list[DomainAdvertisement],
+             limit: int,
+             ranks: Optional[list[float]] = None) -> Page[DomainAdvertisement]:
+    """Репозиторий запрашивается с limit + 1, лишняя строка означает наличие следующей страницы"""
+    if len(advertisements) <= limit:
+        return Page(items=advertisements)
+
+    items: list[DomainAdvertisement] = advertisements[:limit]
+    last: DomainAdvertisement = items[-1]
+    cursor = Cursor(approved_at=last.approved_at, oid=last.oid, rank=ranks[limit - 1] if ranks else None)
+    return Page(items=items, next_cursor=cursor.encode())
 
 
 class AdvertisementService:
@@ -36,18 +54,51 @@ class AdvertisementService:
 
             return advertisement
 
-    async def get_all_advertisements(self) -> list[DomainAdvertisement]:
+    async def view_advertisement_by_id(self, advertisement_oid: str) -> DomainAdvertisement:
+        """
+        Просмотр карточки: опубликованному объявлению засчитывается просмотр (в БД попадёт при сбросе счётчика)
+        """
+        advertisement: DomainAdvertisement = await self.get_advertisement_by_id(advertisement_oid)
+        if advertisement.status.name == "ACTIVE":
+            self.register_view(advertisement.oid)
+        return advertisement
+
+    async def get_published_version(self, advertisement_oid: str) -> Optional[Version]:
+        """
+        Версия опубликованного объявления для условного GET.
+        None - объявления нет или оно не опубликовано: нужна полная загрузка с проверкой доступа.
+        """
         async with self.uow:
-            advertisements: list[DomainAdvertisement] = await self.uow.advertisement.all()
-            if not advertisements:
-                raise AdvertisementNotFoundError
+            version: Optional[Version] = await self.uow.advertisement.get_version(advertisement_oid)
 
-            if self.user_current.get("role") in ("ADMIN", "MODERATOR"):
-                return advertisements
+        if version and version.status.name == "ACTIVE":
+            return version
+        return None
 
-        return [ad for ad in advertisements if ad.status.name == "ACTIVE"]
+    @staticmethod
+    def register_view(advertisement_oid: str) -> None:
+        view_counter.increment(advertisement_oid)
 
-    async def search_advertisements_by_filters(self, **kwargs: dict) -> list[DomainAdvertisement]:
+    async def get_all_advertisements(self, limit: int, cursor: str | None = None) -> Page[DomainAdvertisement]:
+        decoded_cursor: Optional[Cursor] = Cursor.decode(cursor) if cursor else None
+        statuses: Optional[tuple[str, ...]] = None
+        if (self.user_current or {}).get("role") not in ("ADMIN", "MODERATOR"):
+            statuses = ("ACTIVE",)
+
+        async with self.uow:
+            advertisements: list[DomainAdvertisement] = await self.uow.advertisement.all(limit=limit + 1,
+                                                                                          cursor=decoded_cursor,
+                                                                                          statuses=statuses)
+            if not advertisements and not decoded_cursor:
+                raise AdvertisementNotFoundError
+
+        return _to_page(advertisements, limit)
+
+    async def search_advertisements_by_filters(self,
+                                               limit: int,
+                                               cursor: str | None = None,
+                                               **kwargs: dict) -> Page[DomainAdvertisement]:
+        decoded_cursor: Optional[Cursor] = Cursor.decode(cursor) if cursor else None
         params = {}
 
         for name_field, value in kwargs.items():
@@ -56,26 +107,52 @@ class AdvertisementService:
 
             if name_field == "category":
                 param_search = {"title": value}
-                category_schema: DomainCategory = await CategoryAdService().check_existing_category(param_search)
+                category_schema: Optional[DomainCategory] = await CategoryAdService().check_existing_category(
+                    param_search
+                )
+                if not category_schema:
+                    raise CategoryNotFoundError
+
                 params["category_id"] = category_schema.oid
             else:
                 params[name_field] = value
 
+        if params.get("q"):
+            return await self._full_text_search(params=params, limit=limit, cursor=decoded_cursor)
+
+        async with self.uow:
+            advertisements: list[DomainAdvertisement] = await self.uow.advertisement.get_all_by_params(
+                params=params,
+                limit=limit + 1,
+                cursor=decoded_cursor
+            )
+        return _to_page(advertisements, limit)
+
+    async def _full_text_search(self,
+                                params: dict[str, Any],
+                                limit: int,
+                                cursor: Optional[Cursor]) -> Page[DomainAdvertisement]:
+        if cursor and cursor.rank is None:
+            raise InvalidCursorError
+
         async with self.uow:
-            advertisements: list[DomainAdvertisement] = await self.uow.advertisement.get_all_by_params(params=params,
-                                                                                                       offset=0,
-                                                                                                       limit=20)
-            return advertisements
+            rows: list[tuple[DomainAdvertisement, float]] = await self.uow.advertisement.full_text_search(
+                params=params,
+                limit=limit + 1,
+                cursor=cursor
+            )
+        return _to_page([ad for ad, _ in rows], limit, ranks=[rank for _, rank in rows])
 
     async def update_advertisement_status_to_removed_by_id(self, advertisement_oid: str) -> None:
         advertisement: DomainAdvertisement = await self.get_advertisement_by_id(advertisement_oid)
         if self.user_current.get("sub") != advertisement.author.oid:
             raise AccessDeniedError
 
-        advertisement.status = "REMOVED"
+        advertisement.status = Status.REMOVED
         async with self.uow:
             await self.uow.advertisement.update(advertisement)
             await self.uow.commit()
+        advertisement_response_cache.invalidate()
 
     async def create_advertisement(self, advertisement: DomainAdvertisement) -> DomainAdvertisement:
         async with self.uow:
@@ -101,15 +178,16 @@ class AdvertisementService:
         if self.user_current.get("sub") != existing_ad.author.oid:
             raise AccessDeniedError
 
-        if existing_ad.status not in ("DRAFT", "REJECTED_FOR_REVISION"):
+        if existing_ad.status.name not in ("DRAFT", "REJECTED_FOR_REVISION"):
             raise AdvertisementStatusError
 
         for field, value in updated_ad.items():
-            setattr(existing_ad, field, value)
+            setattr(existing_ad, field, Photo(value) if field == "photo" else value)
 
         async with self.uow:
             await self.uow.advertisement.update(existing_ad)
             await self.uow.commit()
+        advertisement_response_cache.invalidate()
         return existing_ad
 
     async def change_ad_status_on_active_or_rejected(self,
@@ -122,8 +200,9 @@ class AdvertisementService:
             advertisement.reject()
 
         async with self.uow:
-            await self.uow.advertisement.update(advertisement.to_domain())
+            await self.uow.advertisement.update(advertisement)
             await self.uow.commit()
+        advertisement_response_cache.invalidate()
         return advertisement
 
 
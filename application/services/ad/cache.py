@@ -0,0 +1,65 @@
+import time
+from decimal import Decimal
+from typing import Any, Hashable, Optional
+
+from application.config import settings
+from application.infrastructure.cache import TTLCache
+
+
+class AdvertisementResponseCache:
+    """
+    Кэш готовых JSON-ответов публичных /all и /search: попадание отдаёт байты без обращения к БД и pydantic.
+    Ключ - нормализованные параметры запроса. Какие выборки затронет изменение объявления, заранее не известно,
+    поэтому при одобрении, редактировании и снятии объявления, а также при удалении категории или пользователя
+    (объявления удаляются каскадом) кэш сбрасывается целиком, а короткий TTL ограничивает рассинхронизацию
+    между воркерами.
+    Поколение увеличивается при каждом сбросе: ответ, собранный до сброса, но дописываемый после него, отбрасывается.
+    """
+
+    def __init__(self, ttl: float, max_entries: int, max_bytes: int):
+        self.ttl = ttl
+        self.generation: int = 0
+        self._responses: TTLCache[Hashable, bytes] = TTLCache(maxsize=max_entries, max_bytes=max_bytes)
+
+    @staticmethod
+    def make_key(endpoint: str, **params: Any) -> Hashable:
+        """
+        Пустые значения отбрасываются (как и в сервисе поиска), Decimal приводится к каноничной записи:
+        price_from=100 и price_from=100.00 дают один ключ
+        """
+        normalized: list[tuple[str, str]] = []
+        for name, value in params.items():
+            if not value:
+                continue
+
+            if isinstance(value, Decimal):
+                value = format(value.normalize(), "f")
+            normalized.append((name, str(value)))
+
+        return endpoint, tuple(sorted(normalized))
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        return self._responses.get(key)
+
+    def put(self, key: Hashable, body: bytes, generation: int) -> None:
+        """
+        generation - значение self.generation, прочитанное до запроса в БД
+        """
+        if generation != self.generation:
+            return
+
+        self._responses.set(key, body, expires_at=time.time() + self.ttl)
+
+    def invalidate(self) -> None:
+        self.generation += 1
+        self._responses.clear()
+
+    def stats(self) -> dict[str, int]:
+        return self._responses.stats()
+
+
+advertisement_response_cache = AdvertisementResponseCache(
+    ttl=settings.cache.RESPONSE_CACHE_TTL,
+    max_entries=settings.cache.RESPONSE_CACHE_MAX_ENTRIES,
+    max_bytes=settings.cache.RESPONSE_CACHE_MAX_BYTES,
+)
@@ -0,0 +1,91 @@
+import asyncio
+import logging
+from collections import Counter
+from contextlib import suppress
+from typing import Optional
+
+from application.config import settings
+from application.infrastructure.unit_of_work_manager import get_unit_of_work
+
+logger = logging.getLogger(__name__)
+
+
+class ViewCounter:
+    """
+    Счётчик просмотров объявлений в памяти процесса.
+    Просмотры копятся в Counter и раз в flush_interval секунд (или при накоплении max_pending)
+    пишутся в БД одним пакетным UPDATE: популярное объявление даёт одну строку за интервал,
+    а не блокировку строки на каждый просмотр.
+    При аварийном завершении теряется не больше просмотров, чем накоплено с последнего сброса;
+    при штатной остановке (stop) выполняется финальный сброс.
+    """
+
+    def __init__(self, flush_interval: float, max_pending: int):
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._pending: Counter[str] = Counter()
+        self._pending_total: int = 0
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._stopping: bool = False
+        self._task: Optional[asyncio.Task] = None
+
+    def increment(self, advertisement_oid: str) -> None:
+        self._pending[advertisement_oid] += 1
+        self._pending_total += 1
+        if self._pending_total >= self.max_pending:
+            self._wakeup.set()
+
+    async def flush(self) -> None:
+        async with self._flush_lock:
+            if not self._pending:
+                return
+
+            # Подмена счётчика атомарна для event loop: новые просмотры копятся уже в новом Counter
+            views, pending_total = self._pending, self._pending_total
+            self._pending, self._pending_total = Counter(), 0
+            try:
+                uow = get_unit_of_work()
+                async with uow:
+                    await uow.advertisement.increment_views(dict(views))
+                    await uow.commit()
+
+            except Exception as ex:
+                self._restore(views, pending_total, ex)
+
+    def _restore(self, views: Counter[str], pending_total: int, error: Exception) -> None:
+        """Несохранённые просмотры возвращаются в очередь, пока она не превышает max_pending"""
+        if self._pending_total + pending_total > self.max_pending:
+            logger.error(f"View counter flush failed, {pending_total} views dropped: {error}")
+            return
+
+        logger.error(f"View counter flush failed, {pending_total} views will be retried: {error}")
+        self._pending.update(views)
+        self._pending_total += pending_total
+
+    async def run(self) -> None:
+        while not self._stopping:
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+
+            self._wakeup.clear()
+            await self.flush()
+
+    def start(self) -> None:
+        self._stopping = False
+        self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        self._stopping = True
+        self._wakeup.set()
+        if self._task:
+            await self._task
+            self._task = None
+
+        await self.flush()
+
+
+view_counter = ViewCounter(
+    flush_interval=settings.views.VIEWS_FLUSH_INTERVAL,
+    max_pending=settings.views.VIEWS_MAX_PENDING,
+)
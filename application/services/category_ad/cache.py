@@ -0,0 +1,57 @@
+import time
+from typing import Any, Optional
+
+from application.config import settings
+from application.domain.entities.category_ad import Category as DomainCategory
+
+
+class CategoryCache:
+    """
+    In-process кэш категорий с поиском по oid, title и code.
+    Категории меняются крайне редко: локально кэш сбрасывается при создании/удалении категории,
+    а TTL ограничивает рассинхронизацию между воркерами.
+    """
+    LOOKUP_FIELDS: tuple[str, ...] = ("oid", "title", "code")
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._by_oid: dict[str, tuple[DomainCategory, float]] = {}
+        self._oid_by_field: dict[str, dict[str, str]] = {"title": {}, "code": {}}
+
+    def get(self, params: dict[str, Any]) -> Optional[DomainCategory]:
+        if len(params) != 1:
+            return None
+
+        (field, value), = params.items()
+        if field not in self.LOOKUP_FIELDS:
+            return None
+
+        oid: Optional[str] = str(value) if field == "oid" else self._oid_by_field[field].get(value)
+        entry: Optional[tuple[DomainCategory, float]] = self._by_oid.get(oid) if oid else None
+        if not entry:
+            return None
+
+        category, expires_at = entry
+        if expires_at <= time.monotonic():
+            self._discard(category)
+            return None
+
+        return category
+
+    def put(self, category: DomainCategory) -> None:
+        self._by_oid[category.oid] = (category, time.monotonic() + self.ttl)
+        self._oid_by_field["title"][category.title] = category.oid
+        self._oid_by_field["code"][category.code] = category.oid
+
+    def invalidate(self) -> None:
+        self._by_oid.clear()
+        for index in self._oid_by_field.values():
+            index.clear()
+
+    def _discard(self, category: DomainCategory) -> None:
+        self._by_oid.pop(category.oid, None)
+        self._oid_by_field["title"].pop(category.title, None)
+        self._oid_by_field["code"].pop(category.code, None)
+
+
+category_cache = CategoryCache(ttl=settings.cache.CATEGORY_CACHE_TTL)
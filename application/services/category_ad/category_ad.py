@@ -4,6 +4,8 @@ from application.domain.entities.category_ad import Category as DomainCategory
 from application.exceptions.domain import CategoryNotFoundError, CategoryAlreadyExistsError
 from application.infrastructure.unit_of_work_manager import get_unit_of_work
 from application.repos.uow.unit_of_work import AbstractUnitOfWork
+from application.services.ad.cache import advertisement_response_cache
+from .cache import category_cache
 
 
 class CategoryAdService:
@@ -14,9 +16,14 @@ class CategoryAdService:
         self.uow = uow if uow else get_unit_of_work()
 
     async def get_category_by_id(self, category_oid: str) -> DomainCategory:
+        cached_category: Optional[DomainCategory] = category_cache.get({"oid": category_oid})
+        if cached_category:
+            return cached_category
+
         async with self.uow:
             category: DomainCategory | None = await self.uow.category.get(category_oid)
             if category:
+                category_cache.put(category)
                 return category
 
             raise CategoryNotFoundError
@@ -26,6 +33,9 @@ class CategoryAdService:
         async with self.uow:
             await self.uow.category.delete(category_oid)
             await self.uow.commit()
+        category_cache.invalidate()
+        # объявления категории удалены каскадом
+        advertisement_response_cache.invalidate()
 
     async def create_category(self, category: DomainCategory) -> DomainCategory:
         async with self.uow:
@@ -36,12 +46,18 @@ class CategoryAdService:
 
             await self.uow.category.add(category)
             await self.uow.commit()
-            return category
+        category_cache.invalidate()
+        return category
 
     async def check_existing_category(self, params: dict[str, Any]) -> Optional[DomainCategory]:
+        cached_category: Optional[DomainCategory] = category_cache.get(params)
+        if cached_category:
+            return cached_category
+
         async with self.uow:
             exist_category: DomainCategory | None = await self.uow.category.get_by_params(params)
             if exist_category:
+                category_cache.put(exist_category)
                 return exist_category
 
 
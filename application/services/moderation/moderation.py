@@ -6,6 +6,7 @@ from application.domain.entities.moderation import Moderation as DomainModeratio
 from application.exceptions.domain import ModerationNotFoundError, AdvertisementNotFoundError
 from application.infrastructure.unit_of_work_manager import get_unit_of_work
 from application.repos.uow.unit_of_work import AbstractUnitOfWork
+from application.services.ad.cache import advertisement_response_cache
 
 
 class ModerationService:
@@ -38,6 +39,7 @@ class ModerationService:
                 self.uow.advertisement.update(advertisement)
             )
             await self.uow.commit()
+        advertisement_response_cache.invalidate()
         return moderation
 
 
@@ -1 +1 @@
-from .user import UserService, get_user_service
+from .user import UserService, UserIngestStatus, get_user_service
@@ -1,20 +1,39 @@
+import asyncio
 import logging
-from typing import Optional, Any
+from collections import deque
+from enum import Enum
+from typing import AsyncIterator, Optional, Any
+from uuid import UUID
 
+from application.config import settings
 from application.context import get_payload_current_user
 from application.domain.entities.user import User as DomainUser
+from application.domain.value_objects.user import Status
 from application.exceptions.domain import (
     UserNotFoundError, UserAlreadyExistsError,
     AccessDeniedError
 )
 from application.infrastructure.unit_of_work_manager import get_unit_of_work
 from application.repos.uow.unit_of_work import AbstractUnitOfWork
+from application.services.ad.cache import advertisement_response_cache
 
 logger = logging.getLogger(__name__)
 
 
+class UserIngestStatus(str, Enum):
+    CREATED = "created"
+    ALREADY_EXISTS = "already_exists"
+    UPDATED = "updated"
+    NOT_FOUND = "not_found"
+    INVALID = "invalid"
+
+
 class UserService:
     uow: AbstractUnitOfWork
+    LOOKUP_CHUNK_SIZE: int = settings.user_lookup.USER_LOOKUP_CHUNK_SIZE
+    LOOKUP_CONCURRENCY: int = settings.user_lookup.USER_LOOKUP_CONCURRENCY
+    # Один на процесс: LOOKUP_CONCURRENCY ограничивает один запрос, а это - все запросы вместе
+    LOOKUP_CONNECTIONS: asyncio.Semaphore = asyncio.Semaphore(settings.user_lookup.USER_LOOKUP_MAX_CONNECTIONS)
 
     def __init__(self, uow=None):
         self.uow = uow if uow else get_unit_of_work()
@@ -27,11 +46,53 @@ class UserService:
 
             raise UserNotFoundError
 
-    async def get_multi_users_by_id(self, user_oids: list[str]) -> list[DomainUser]:
+    @staticmethod
+    def unique_user_oids(user_oids: list[str]) -> list[UUID]:
+        """
+        Уникальные идентификаторы в порядке запроса.
+        Строки, не являющиеся UUID, не совпадут ни с одним пользователем и отбрасываются до запроса в БД.
+        """
+        unique: dict[UUID, None] = {}
+        for user_oid in user_oids:
+            try:
+                unique[UUID(user_oid)] = None
+            except (ValueError, TypeError, AttributeError):
+                continue
+        return list(unique)
+
+    async def get_multi_users_by_id(self, user_oids: list[UUID]) -> list[DomainUser]:
         async with self.uow:
             users: list[DomainUser] = await self.uow.users.get_multi(user_oids)
         return users
 
+    async def iter_users_by_ids(self, user_oids: list[UUID]) -> AsyncIterator[list[DomainUser]]:
+        """
+        Пакетный поиск: пачки по LOOKUP_CHUNK_SIZE идентификаторов, не больше LOOKUP_CONCURRENCY запросов
+        одновременно, каждый в своей сессии (одна AsyncSession не выполняет запросы параллельно).
+        Пачки отдаются в порядке запроса, в памяти одновременно не больше LOOKUP_CONCURRENCY пачек.
+        Соединение под пачку берётся только внутри LOOKUP_CONNECTIONS, общего для всех запросов процесса.
+        """
+        async def load(chunk: list[UUID]) -> list[DomainUser]:
+            async with self.LOOKUP_CONNECTIONS:
+                uow: AbstractUnitOfWork = get_unit_of_work(isolated=True)
+                async with uow:
+                    return await uow.users.get_multi(chunk)
+
+        pending: deque[asyncio.Task] = deque()
+        try:
+            for start in range(0, len(user_oids), self.LOOKUP_CHUNK_SIZE):
+                pending.append(asyncio.create_task(load(user_oids[start:start + self.LOOKUP_CHUNK_SIZE])))
+                if len(pending) >= self.LOOKUP_CONCURRENCY:
+                    yield await pending.popleft()
+
+            while pending:
+                yield await pending.popleft()
+
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
     async def get_user_by_all_params(self, params: dict[str, Any]) -> Optional[DomainUser]:
         async with self.uow:
             user: Optional[DomainUser] = await self.uow.users.get_one_by_any_params(params=params)
@@ -45,18 +106,35 @@ class UserService:
             users: list[DomainUser] = await self.uow.users.all()
         return users
 
-    async def update_user(self, user_oid: str, new_user: DomainUser) -> DomainUser:
-        new_user.oid = user_oid
+    async def update_user_status(self, email: str, status: Status) -> str:
+        async with self.uow:
+            user_oid: Optional[str] = await self.uow.users.update_status_by_email(email=email, status=status)
+            if not user_oid:
+                raise UserNotFoundError
+
+            await self.uow.commit()
+        return user_oid
+
+    async def update_users_status(self, statuses: dict[str, Status]) -> dict[str, str]:
+        """
+        Смена статусов пачкой, по каждому email применяется последний статус.
+        Возвращает email -> oid; email без пользователя в ответ не попадают.
+        """
+        if not statuses:
+            return {}
+
         async with self.uow:
-            await self.uow.users.update(new_user)
+            updated: dict[str, str] = await self.uow.users.update_statuses_by_email(statuses=statuses)
             await self.uow.commit()
-        return new_user
+        return updated
 
     async def delete_user_by_id(self, user_oid: str) -> None:
         await self.get_user_by_id(user_oid)
         async with self.uow:
             await self.uow.users.delete(user_oid)
             await self.uow.commit()
+        # объявления пользователя удалены каскадом
+        advertisement_response_cache.invalidate()
 
     async def create_user(self, user: DomainUser) -> DomainUser:
         params_search = {"email": user.email.value, "number_phone": user.number_phone.value}
@@ -71,6 +149,30 @@ class UserService:
             logger.info(f"Пользователь с id {user.oid} успешно создан. Status: 201")
         return user
 
+    async def create_users(self, users: list[DomainUser]) -> list[UserIngestStatus]:
+        """
+        Пакетная регистрация: один INSERT ... ON CONFLICT вместо проверки существования и коммита на каждого.
+        Исход возвращается по каждому пользователю в порядке входного списка.
+        """
+        if not users:
+            return []
+
+        async with self.uow:
+            created_oids: set[str] = await self.uow.users.add_many(users)
+            await self.uow.commit()
+
+        outcomes: list[UserIngestStatus] = []
+        for user in users:
+            if user.oid in created_oids:
+                created_oids.discard(user.oid)
+                outcomes.append(UserIngestStatus.CREATED)
+                await self._on_after_create_user(user)
+            else:
+                outcomes.append(UserIngestStatus.ALREADY_EXISTS)
+
+        logger.info(f"Пакетная регистрация: {outcomes.count(UserIngestStatus.CREATED)} из {len(users)} создано")
+        return outcomes
+
     @staticmethod
     async def _on_after_create_user(user_schema: DomainUser) -> None:
         pass
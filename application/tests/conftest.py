@@ -0,0 +1,40 @@
+"""
+Настройки приложения читаются при импорте модулей, поэтому окружение для тестов заполняется здесь,
+до первого импорта application.*. Уже заданные переменные не перезаписываются.
+БД и Kafka тестам не нужны: движок SQLAlchemy создаётся лениво и к серверу не подключается.
+"""
+import os
+import tempfile
+from pathlib import Path
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+TEST_ENVIRONMENT: dict[str, str] = {
+    "DB_HOST": "localhost", "DB_PORT": "5432", "DB_NAME": "postgres", "DB_USER": "postgres", "DB_PASS": "postgres",
+    "ECHO": "False", "ECHO_POOL": "False", "POOL_SIZE": "5", "MAX_OVERFLOW": "5",
+    "COOKIE_SESSION_KEY": "test", "COOKIE_SESSION_TIME": "600",
+    "ACCESS_TOKEN_EXPIRE_MINUTE": "60", "REFRESH_TOKEN_EXPIRE_MINUTE": "600",
+    "EXCLUDE_PATHS": "/sign-up,/api/docs,/openapi.json,/login,/search,/all",
+    "KAFKA_HOST": "localhost", "KAFKA_PORT": "9093", "USER_TOPIC": "user", "TOKEN_TOPIC": "token", "GROUP_ID": "test",
+}
+
+
+def write_jwt_keys(directory: Path) -> dict[str, str]:
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_path: Path = directory / "jwt-private.pem"
+    public_path: Path = directory / "jwt-public.pem"
+    private_path.write_bytes(private_key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    ))
+    public_path.write_bytes(private_key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    ))
+    return {"PRIVATE_KEY": str(private_path), "PUBLIC_KEY": str(public_path)}
+
+
+for name, value in TEST_ENVIRONMENT.items():
+    os.environ.setdefault(name, value)
+
+if "PUBLIC_KEY" not in os.environ:
+    os.environ.update(write_jwt_keys(Path(tempfile.mkdtemp(prefix="avido-tests-"))))
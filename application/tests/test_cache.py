@@ -0,0 +1,68 @@
+import time
+
+from application.infrastructure.cache import TTLCache
+
+
+def far_future() -> float:
+    return time.time() + 60
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache: TTLCache[str, bytes] = TTLCache(maxsize=2)
+    cache.set("a", b"1", far_future())
+    cache.set("b", b"2", far_future())
+    cache.get("a")
+    cache.set("c", b"3", far_future())
+
+    assert cache.get("b") is None
+    assert cache.get("a") == b"1"
+    assert cache.get("c") == b"3"
+
+
+def test_ttl_cache_drops_expired_entries():
+    cache: TTLCache[str, bytes] = TTLCache(maxsize=2)
+    cache.set("a", b"1", time.time() - 1)
+
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_ttl_cache_counts_hits_and_misses():
+    cache: TTLCache[str, bytes] = TTLCache(maxsize=2)
+    cache.set("a", b"1", far_future())
+    cache.get("a")
+    cache.get("a")
+    cache.get("b")
+
+    assert cache.stats() == {"hits": 2, "misses": 1, "size": 1, "bytes": 0}
+
+
+def test_ttl_cache_respects_max_bytes():
+    cache: TTLCache[str, bytes] = TTLCache(maxsize=10, max_bytes=10)
+    cache.set("a", b"1234", far_future())
+    cache.set("b", b"5678", far_future())
+    cache.set("c", b"90ab", far_future())
+
+    assert cache.get("a") is None
+    assert cache.stats()["bytes"] == 8
+
+    cache.set("b", b"5", far_future())
+    assert cache.stats()["bytes"] == 5
+
+
+def test_ttl_cache_skips_value_larger_than_max_bytes():
+    cache: TTLCache[str, bytes] = TTLCache(maxsize=10, max_bytes=4)
+    cache.set("a", b"1234", far_future())
+    cache.set("b", b"12345", far_future())
+
+    assert cache.get("b") is None
+    assert cache.get("a") == b"1234"
+    assert cache.stats()["bytes"] == 4
+
+
+def test_ttl_cache_releases_bytes_of_expired_entries():
+    cache: TTLCache[str, bytes] = TTLCache(maxsize=10, max_bytes=10)
+    cache.set("a", b"1234", time.time() - 1)
+    cache.get("a")
+
+    assert cache.stats()["bytes"] == 0
@@ -0,0 +1,97 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import Select
+from starlette.datastructures import Headers
+
+from application.benchmarks.entities import make_row
+from application.infrastructure.database import engine
+from application.repos.ad import SQLAlchemyAdvertisementRepository
+from application.repos.models import Advertisement
+from application.web.services.conditional.conditional import (
+    has_conditions, is_not_modified, make_etag, validator_headers
+)
+
+UPDATED_AT = datetime(2024, 5, 1, 12, 30, 15, 500000)
+
+
+class RecordingSession:
+    """Запоминает запрос вместо обращения к БД"""
+
+    query: Select
+
+    async def execute(self, query: Select) -> Any:
+        self.query = query
+        return self
+
+    def one_or_none(self) -> None:
+        return None
+
+
+@pytest.fixture
+def etag() -> str:
+    return make_etag("oid", UPDATED_AT)
+
+
+def test_etag_changes_with_version(etag):
+    assert etag.startswith('W/"oid-')
+    assert make_etag("oid", UPDATED_AT + timedelta(microseconds=1)) != etag
+    assert make_etag("oid", UPDATED_AT.replace(tzinfo=timezone.utc)) == etag
+
+
+def test_weak_etag_matches_if_none_match(etag):
+    assert is_not_modified(Headers({"if-none-match": f'"other", {etag}'}), etag, UPDATED_AT)
+    assert is_not_modified(Headers({"if-none-match": etag[2:]}), etag, UPDATED_AT)
+    assert is_not_modified(Headers({"if-none-match": "*"}), etag, UPDATED_AT)
+    assert not is_not_modified(Headers({"if-none-match": '"other"'}), etag, UPDATED_AT)
+
+
+def test_if_none_match_takes_precedence_over_if_modified_since(etag):
+    last_modified: str = validator_headers(etag, UPDATED_AT)["Last-Modified"]
+
+    assert not is_not_modified(Headers({"if-none-match": '"other"', "if-modified-since": last_modified}),
+                               etag, UPDATED_AT)
+
+
+def test_if_modified_since_uses_whole_seconds(etag):
+    last_modified: str = validator_headers(etag, UPDATED_AT)["Last-Modified"]
+
+    assert is_not_modified(Headers({"if-modified-since": last_modified}), etag, UPDATED_AT)
+    assert not is_not_modified(Headers({"if-modified-since": last_modified}), etag,
+                               UPDATED_AT + timedelta(seconds=1))
+
+
+@pytest.mark.parametrize("value", ["yesterday", "Wed, 01 May 2024 12:30:15"])
+def test_invalid_if_modified_since_is_ignored(etag, value):
+    assert not is_not_modified(Headers({"if-modified-since": value}), etag, UPDATED_AT)
+
+
+def test_has_conditions():
+    assert has_conditions(Headers({"if-none-match": "*"}))
+    assert has_conditions(Headers({"if-modified-since": "Wed, 01 May 2024 12:30:15 GMT"}))
+    assert not has_conditions(Headers({"accept": "application/json"}))
+
+
+@pytest.mark.parametrize("edited", ["updated_at", "author_updated_at", "category_updated_at"])
+def test_version_includes_author_and_category(edited):
+    row = make_row(1)._replace(updated_at=UPDATED_AT, author_updated_at=UPDATED_AT, category_updated_at=UPDATED_AT)
+    edited_row = row._replace(**{edited: UPDATED_AT + timedelta(seconds=1)})
+
+    version: datetime = Advertisement.from_row(row).version_updated_at()
+    edited_version: datetime = Advertisement.from_row(edited_row).version_updated_at()
+
+    assert edited_version == UPDATED_AT + timedelta(seconds=1)
+    assert make_etag("oid", edited_version) != make_etag("oid", version)
+
+
+async def test_version_query_takes_greatest_of_three_rows():
+    session = RecordingSession()
+
+    await SQLAlchemyAdvertisementRepository(session).get_version(str(uuid4()))
+
+    sql: str = str(session.query.compile(dialect=engine.dialect))
+    assert "greatest(advertisement.updated_at, \"user\".updated_at, category.updated_at) AS updated_at" in sql
+    assert "JOIN \"user\" ON advertisement.author_id = \"user\".oid" in sql
+    assert "JOIN category ON advertisement.category_id = category.oid" in sql
@@ -0,0 +1,20 @@
+"""
+Те же случаи, что в application.benchmarks.domain, через фикстуру benchmark (pytest-benchmark).
+В обычном прогоне тестов каждый случай выполняется один раз; замер и сравнение между коммитами:
+
+    pytest application/tests/test_domain_benchmarks.py --benchmark-enable --benchmark-autosave
+    pytest application/tests/test_domain_benchmarks.py --benchmark-enable --benchmark-compare
+"""
+from typing import Any, Callable
+
+import pytest
+
+from application.benchmarks.domain import build_cases
+
+CASES: dict[str, Callable[[], Any]] = build_cases()
+
+
+@pytest.mark.benchmark(group="domain")
+@pytest.mark.parametrize("name", list(CASES))
+def test_domain_operation(benchmark, name):
+    benchmark(CASES[name])
@@ -0,0 +1,137 @@
+from decimal import Decimal
+from typing import Any
+
+import pytest
+
+from application.benchmarks.entities import make_row, validated_from_row
+from application.domain.entities.ad import Advertisement as DomainAdvertisement
+from application.domain.entities.category_ad import Category as DomainCategory
+from application.domain.entities.user import User as DomainUser
+from application.domain.value_objects.ad import Photo, Status
+from application.domain.value_objects.user import Email
+from application.repos.models import Advertisement
+
+USER_JSON: dict[str, Any] = {
+    "first_name": "Иван", "last_name": "Петров", "middle_name": "Иванович", "email": "ivan.petrov@mail.ru",
+    "number_phone": "79991234567", "time_call": "10-18", "status": "ACTIVE",
+}
+CATEGORY_JSON: dict[str, Any] = {"title": "Спорт и отдых", "description": "Велосипеды, лыжи, палатки"}
+
+
+@pytest.fixture
+def advertisement() -> DomainAdvertisement:
+    return DomainAdvertisement.from_json({
+        "title": "Велосипед", "city": "Москва", "description": "Почти новый", "price": "15000.00",
+        "photo": ["https://img/1.jpg", "https://img/2.jpg"],
+        "author": DomainUser.from_json(USER_JSON), "category": DomainCategory.from_json(CATEGORY_JSON),
+    })
+
+
+@pytest.mark.parametrize("number", [0, 1, 42])
+def test_from_row_matches_validated_construction(number):
+    row = make_row(number)
+
+    assert Advertisement.from_row(row) == validated_from_row(row)
+
+
+def test_from_row_builds_nested_entities():
+    row = make_row(1)
+    advertisement: DomainAdvertisement = Advertisement.from_row(row)
+
+    assert advertisement.oid == str(row.oid)
+    assert advertisement.author.oid == str(row.author_oid)
+    assert advertisement.author.email == Email(row.author_email)
+    assert advertisement.category.code == row.category_code
+    assert advertisement.photo.value == row.photo
+
+
+def test_trusted_fills_defaults():
+    category: DomainCategory = DomainCategory.trusted(title="Спорт", code="sport")
+
+    assert category.oid and category.created_at
+    assert category.description == ""
+    assert category.model_fields_set == {"oid", "created_at", "title", "code", "description", "updated_at"}
+
+
+def test_trusted_instances_do_not_share_defaults():
+    first: DomainCategory = DomainCategory.trusted(title="Спорт", code="sport")
+    second: DomainCategory = DomainCategory.trusted(title="Спорт", code="sport")
+
+    assert first.oid != second.oid
+
+
+def test_trusted_value_object_skips_validation():
+    with pytest.raises(ValueError):
+        Photo([])
+
+    assert Photo.trusted([]).value == []
+
+
+def test_trusted_entity_serializes_like_validated():
+    row = make_row(7)
+    data: dict[str, Any] = Advertisement.from_row(row).model_dump()
+
+    assert data == validated_from_row(row).model_dump()
+
+
+def test_new_entity_has_no_changes(advertisement):
+    assert advertisement.changed_fields == frozenset()
+
+
+def test_changed_fields_are_tracked(advertisement):
+    advertisement.title = "Самокат"
+    advertisement.price = Decimal("900.00")
+
+    assert advertisement.changed_fields == {"title", "price"}
+
+
+def test_equal_assignment_is_not_a_change(advertisement):
+    advertisement.title = "Велосипед"
+    advertisement.price = Decimal("15000")
+
+    assert advertisement.changed_fields == frozenset()
+
+
+def test_mark_clean_resets_changes(advertisement):
+    advertisement.approve()
+    assert advertisement.changed_fields == {"status", "approved_at"}
+
+    advertisement.mark_clean()
+
+    assert advertisement.changed_fields == frozenset()
+
+
+def test_trusted_entity_tracks_changes():
+    advertisement: DomainAdvertisement = Advertisement.from_row(make_row(1))
+    assert advertisement.changed_fields == frozenset()
+
+    advertisement.city = "Казань"
+
+    assert advertisement.changed_fields == {"city"}
+
+
+def test_to_dict_maps_relations_to_columns(advertisement):
+    data: dict[str, Any] = Advertisement.to_dict(advertisement, fields=["author", "category", "photo"])
+
+    assert data == {
+        "author_id": advertisement.author.oid,
+        "category_id": advertisement.category.oid,
+        "photo": ["https://img/1.jpg", "https://img/2.jpg"],
+    }
+
+
+def test_to_dict_writes_only_changed_columns(advertisement):
+    advertisement.approve()
+
+    data: dict[str, Any] = Advertisement.to_dict(advertisement, fields=advertisement.changed_fields)
+
+    assert data == {"status": "ACTIVE", "approved_at": advertisement.approved_at}
+
+
+def test_to_dict_without_fields_returns_all_columns(advertisement):
+    data: dict[str, Any] = Advertisement.to_dict(advertisement)
+
+    assert data["status"] == Status.DRAFT.name
+    assert data["photo"] == advertisement.photo.value
+    assert {"author_id", "category_id"} <= data.keys()
+    assert not {"author", "category"} & data.keys()
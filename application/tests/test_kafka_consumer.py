@@ -0,0 +1,205 @@
+import asyncio
+from typing import Any, Optional
+
+import pytest
+from aiokafka import ConsumerRecord, TopicPartition
+
+from application.infrastructure.brokers.client.kafka.broker import KafkaConsumer, PartitionHandlers
+from application.infrastructure.brokers.consumers.utils import (
+    UNDECODABLE_MESSAGE, DecodeKafkaMessage, message_ordering_key, process_message_kafka
+)
+from application.infrastructure.metrics import kafka_message_errors, kafka_messages_skipped
+from application.infrastructure.serialization import DECODE_ERRORS, loads
+
+PARTITION = TopicPartition("user", 0)
+
+
+class FakeConsumer:
+    """Записывает commit и seek вместо обращения к брокеру"""
+
+    def __init__(self):
+        self.commits: list[dict[TopicPartition, int]] = []
+        self.seeks: list[tuple[TopicPartition, int]] = []
+
+    async def commit(self, offsets: dict[TopicPartition, int]) -> None:
+        self.commits.append(offsets)
+
+    def seek(self, partition: TopicPartition, offset: int) -> None:
+        self.seeks.append((partition, offset))
+
+    def highwater(self, partition: TopicPartition) -> Optional[int]:
+        return None
+
+
+def make_record(offset: int, value: Any, key: Optional[bytes] = None) -> ConsumerRecord:
+    return ConsumerRecord(
+        topic=PARTITION.topic, partition=PARTITION.partition, offset=offset, timestamp=0, timestamp_type=0,
+        key=key, value=value, checksum=None, serialized_key_size=0, serialized_value_size=0, headers=(),
+    )
+
+
+def make_consumer() -> KafkaConsumer:
+    consumer = KafkaConsumer(group_id="test", topics=(PARTITION.topic,), enable_auto_commit=False)
+    consumer.consumer = FakeConsumer()
+    return consumer
+
+
+def make_handlers(failing: frozenset[int] = frozenset(), handled: Optional[list[int]] = None,
+                  batch_types: Optional[dict[int, str]] = None, attempts: Optional[list[int]] = None,
+                  failures_before_success: int = 0) -> PartitionHandlers:
+    async def handling_message(record: ConsumerRecord) -> None:
+        await asyncio.sleep(0)
+        if attempts is not None:
+            attempts.append(record.offset)
+        if record.offset in failing:
+            if failures_before_success == 0 or attempts.count(record.offset) <= failures_before_success:
+                raise RuntimeError(f"failed at {record.offset}")
+        if handled is not None:
+            handled.append(record.offset)
+
+    async def handling_batch(records: list[ConsumerRecord]) -> None:
+        for record in records:
+            if record.offset in failing:
+                raise RuntimeError(f"batch failed at {record.offset}")
+        for record in records:
+            await handling_message(record)
+
+    return PartitionHandlers(
+        handling_message=handling_message,
+        ordering_key=lambda record: record.key,
+        semaphore=asyncio.Semaphore(4),
+        batch_type=(lambda record: batch_types.get(record.offset)) if batch_types is not None else None,
+        handling_batch=handling_batch,
+        max_attempts=3,
+        retry_backoff=0,
+    )
+
+
+async def process(consumer: KafkaConsumer, records: list[ConsumerRecord], **handlers: Any) -> None:
+    await consumer._process_partition(PARTITION, records, make_handlers(**handlers))
+
+
+def test_split_segments_groups_consecutive_records_of_one_type():
+    records: list[ConsumerRecord] = [make_record(offset, None) for offset in range(6)]
+    types: dict[int, Optional[str]] = {0: None, 1: "create", 2: "create", 3: None, 4: None, 5: "create"}
+
+    segments = KafkaConsumer._split_segments(records, lambda record: types[record.offset])
+
+    assert [(segment_type, [record.offset for record in segment]) for segment_type, segment in segments] == [
+        (None, [0]), ("create", [1, 2]), (None, [3, 4]), ("create", [5])
+    ]
+
+
+def test_split_segments_without_batch_type_is_one_segment():
+    records: list[ConsumerRecord] = [make_record(offset, None) for offset in range(3)]
+
+    assert KafkaConsumer._split_segments(records, None) == [(None, records)]
+
+
+async def test_successful_partition_commits_next_offset():
+    consumer: KafkaConsumer = make_consumer()
+    records: list[ConsumerRecord] = [make_record(offset, None, key=b"a") for offset in range(10, 13)]
+
+    await process(consumer, records)
+
+    assert consumer.consumer.commits == [{PARTITION: 13}]
+    assert consumer.consumer.seeks == []
+
+
+async def test_records_with_one_key_are_handled_in_offset_order():
+    consumer: KafkaConsumer = make_consumer()
+    handled: list[int] = []
+    records: list[ConsumerRecord] = [make_record(offset, None, key=b"a") for offset in range(10, 20)]
+
+    await process(consumer, records, handled=handled)
+
+    assert handled == list(range(10, 20))
+
+
+def skipped_messages() -> float:
+    return kafka_messages_skipped._values.get((PARTITION.topic, str(PARTITION.partition)), 0.0)
+
+
+async def test_failing_message_is_skipped_after_retries_and_committed_past():
+    consumer: KafkaConsumer = make_consumer()
+    handled: list[int] = []
+    attempts: list[int] = []
+    keys: list[bytes] = [b"a", b"b", b"a", b"b", b"a"]
+    records: list[ConsumerRecord] = [make_record(10 + index, None, key=key) for index, key in enumerate(keys)]
+    before: float = skipped_messages()
+
+    await process(consumer, records, failing=frozenset({12}), handled=handled, attempts=attempts)
+
+    assert attempts.count(12) == 3
+    assert consumer.consumer.commits == [{PARTITION: 15}]
+    assert consumer.consumer.seeks == []
+    assert skipped_messages() == before + 1
+    # Цепочка ключа a продолжилась после пропущенной записи
+    assert sorted(handled) == [10, 11, 13, 14]
+
+
+async def test_transient_failure_is_retried():
+    consumer: KafkaConsumer = make_consumer()
+    handled: list[int] = []
+    attempts: list[int] = []
+    records: list[ConsumerRecord] = [make_record(offset, None, key=b"a") for offset in range(10, 13)]
+    before: float = skipped_messages()
+
+    await process(consumer, records, failing=frozenset({10}), handled=handled, attempts=attempts,
+                  failures_before_success=1)
+
+    assert attempts.count(10) == 2
+    assert handled == [10, 11, 12]
+    assert consumer.consumer.commits == [{PARTITION: 13}]
+    assert skipped_messages() == before
+
+
+async def test_failed_bulk_segment_falls_back_to_single_messages():
+    consumer: KafkaConsumer = make_consumer()
+    handled: list[int] = []
+    records: list[ConsumerRecord] = [make_record(offset, None, key=b"a") for offset in range(10, 15)]
+    before: float = skipped_messages()
+
+    await process(consumer, records, failing=frozenset({13}), handled=handled,
+                  batch_types={12: "create", 13: "create", 14: "create"})
+
+    assert handled == [10, 11, 12, 14]
+    assert consumer.consumer.commits == [{PARTITION: 15}]
+    assert skipped_messages() == before + 1
+
+
+@pytest.mark.parametrize("record, expected", [
+    (make_record(0, {"message": {"email": "user@mail.ru"}}, key=b"key"), b"key"),
+    (make_record(0, {"message": {"email": "user@mail.ru"}}), "user@mail.ru"),
+    (make_record(0, {"message": "text"}), ""),
+    (make_record(0, {}), ""),
+    (make_record(0, UNDECODABLE_MESSAGE), ""),
+])
+def test_message_ordering_key(record, expected):
+    assert message_ordering_key(record) == expected
+
+
+def test_decode_returns_dict():
+    assert DecodeKafkaMessage().decode(b'{"type": "create", "message": {}}') == {"type": "create", "message": {}}
+
+
+@pytest.mark.parametrize("value", [b"{not json", b"[1, 2]", b"\"text\"", b"\xff", b"", None])
+def test_undecodable_value_becomes_sentinel(value):
+    assert DecodeKafkaMessage().decode(value) is UNDECODABLE_MESSAGE
+
+
+def test_decode_errors_cover_none_value():
+    with pytest.raises(DECODE_ERRORS):
+        loads(None)
+
+
+def invalid_messages() -> float:
+    return kafka_message_errors._values.get(("unknown", "invalid"), 0.0)
+
+
+async def test_undecodable_message_is_skipped_and_counted():
+    before: float = invalid_messages()
+
+    await process_message_kafka(make_record(0, UNDECODABLE_MESSAGE))
+
+    assert invalid_messages() == before + 1
@@ -0,0 +1,32 @@
+import socket
+
+import aiohttp
+from aiohttp import web
+
+from application.infrastructure.metrics import CONTENT_TYPE, start_metrics_server
+from application.web.app import app
+
+
+def free_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+async def test_metrics_are_served_on_internal_port():
+    port: int = free_port()
+    runner: web.AppRunner = await start_metrics_server("127.0.0.1", port)
+    try:
+        async with aiohttp.ClientSession() as session:
+            async with session.get(f"http://127.0.0.1:{port}/metrics") as response:
+                body: bytes = await response.read()
+                content_type: str = response.headers["Content-Type"]
+    finally:
+        await runner.cleanup()
+
+    assert content_type == CONTENT_TYPE
+    assert b"# TYPE kafka_message_errors counter" in body
+
+
+def test_public_app_does_not_serve_metrics():
+    assert not [route for route in app.routes if getattr(route, "path", "").endswith("/metrics")]
@@ -0,0 +1,45 @@
+import base64
+import json
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+
+from application.domain.value_objects.pagination import Cursor
+from application.exceptions.domain import InvalidCursorError
+
+
+def encode_raw(value: object) -> str:
+    return base64.urlsafe_b64encode(json.dumps(value).encode("utf-8")).decode("ascii")
+
+
+@pytest.mark.parametrize("cursor", [
+    Cursor(approved_at=datetime(2024, 5, 1, 12, 30, 15, 123456), oid=str(uuid4())),
+    Cursor(approved_at=None, oid=str(uuid4())),
+    Cursor(approved_at=datetime(2024, 5, 1), oid=str(uuid4()), rank=0.0759),
+])
+def test_cursor_round_trip(cursor):
+    assert Cursor.decode(cursor.encode()) == cursor
+
+
+def test_cursor_oid_is_normalized():
+    oid = uuid4()
+
+    assert Cursor.decode(encode_raw([None, str(oid).upper(), None])).oid == str(oid)
+
+
+@pytest.mark.parametrize("token", [
+    "",
+    "not base64!",
+    base64.urlsafe_b64encode(b"not json").decode("ascii"),
+    encode_raw({"approved_at": None, "oid": str(uuid4())}),
+    encode_raw([None, str(uuid4())]),
+    encode_raw([None, "not-a-uuid", None]),
+    encode_raw(["yesterday", str(uuid4()), None]),
+    encode_raw([None, str(uuid4()), "high"]),
+    encode_raw([None, None, None]),
+    "кириллица",
+])
+def test_invalid_cursor(token):
+    with pytest.raises(InvalidCursorError):
+        Cursor.decode(token)
@@ -0,0 +1,50 @@
+from decimal import Decimal
+
+import pytest
+
+from application.services.ad.cache import AdvertisementResponseCache
+
+
+@pytest.fixture
+def cache() -> AdvertisementResponseCache:
+    return AdvertisementResponseCache(ttl=60, max_entries=10, max_bytes=1024)
+
+
+def test_make_key_drops_empty_values_and_sorts():
+    first = AdvertisementResponseCache.make_key("search", title="", city="Москва", limit=20, category=None)
+    second = AdvertisementResponseCache.make_key("search", limit=20, city="Москва")
+
+    assert first == second == ("search", (("city", "Москва"), ("limit", "20")))
+
+
+@pytest.mark.parametrize("price", [Decimal("100"), Decimal("100.00"), Decimal("1E+2")])
+def test_make_key_normalizes_decimal(price):
+    assert AdvertisementResponseCache.make_key("search", price_from=price) == ("search", (("price_from", "100"),))
+
+
+def test_make_key_separates_endpoints():
+    make_key = AdvertisementResponseCache.make_key
+
+    assert make_key("all", limit=20) != make_key("search", limit=20)
+
+
+def test_invalidate_clears_stored_responses(cache):
+    key = cache.make_key("all", limit=20)
+    cache.put(key, b"[]", cache.generation)
+    assert cache.get(key) == b"[]"
+
+    cache.invalidate()
+
+    assert cache.get(key) is None
+
+
+def test_response_built_before_invalidation_is_dropped(cache):
+    key = cache.make_key("all", limit=20)
+    generation: int = cache.generation
+
+    cache.invalidate()
+    cache.put(key, b"[]", generation)
+    assert cache.get(key) is None
+
+    cache.put(key, b"[]", cache.generation)
+    assert cache.get(key) == b"[]"
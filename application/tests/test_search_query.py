@@ -0,0 +1,52 @@
+from datetime import datetime
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import Select, select
+
+from application.domain.value_objects.pagination import Cursor
+from application.infrastructure.database import engine
+from application.repos.ad import SQLAlchemyAdvertisementRepository, status_filter
+from application.repos.explain import compile_as_sent
+from application.repos.models import Advertisement
+
+
+def sent_sql(query: Select) -> str:
+    """SQL так, как его готовит asyncpg"""
+    return str(query.compile(dialect=engine.dialect, compile_kwargs={"render_postcompile": True}))
+
+
+@pytest.mark.parametrize("params, cursor", [
+    ({}, None),
+    ({"city": "Москва", "category_id": uuid4(), "price_from": Decimal("100")}, None),
+    ({"city": "Москва"}, Cursor(approved_at=datetime(2024, 5, 1), oid=str(uuid4()))),
+    ({"q": "велосипед"}, Cursor(approved_at=None, oid=str(uuid4()), rank=0.5)),
+])
+def test_search_status_is_a_literal_matching_partial_indexes(params, cursor):
+    sql: str = sent_sql(SQLAlchemyAdvertisementRepository.build_search_query(params=params, limit=21, cursor=cursor))
+
+    assert "advertisement.status = 'ACTIVE'" in sql
+    assert "status = $" not in sql
+
+
+def test_other_filters_stay_parameters():
+    sql: str = sent_sql(SQLAlchemyAdvertisementRepository.build_search_query(params={"city": "Москва"}, limit=21))
+
+    assert "advertisement.city = $1" in sql
+    assert "Москва" not in sql
+
+
+def test_status_filter_with_several_statuses():
+    sql: str = sent_sql(select(Advertisement.oid).where(status_filter(("ACTIVE", "REMOVED"))))
+
+    assert "advertisement.status IN ('ACTIVE', 'REMOVED')" in sql
+
+
+def test_explain_checks_the_sent_statement():
+    query: Select = SQLAlchemyAdvertisementRepository.build_search_query(params={"city": "Москва"}, limit=21)
+
+    sql, arguments = compile_as_sent(query)
+
+    assert sql == sent_sql(query)
+    assert arguments == ["'Москва'", "21"]
@@ -0,0 +1,55 @@
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from uuid import UUID
+
+import pytest
+
+from application.benchmarks.entities import make_row
+from application.domain.value_objects.pagination import Page
+from application.infrastructure.serialization import dumps, loads
+from application.repos.models import Advertisement
+from application.web.views.ad.schemas import AdvertisementPageOutput
+
+OID = UUID("6f1c2b9e-4a3d-4c5b-9e8f-0a1b2c3d4e5f")
+
+
+@pytest.mark.parametrize("value, expected", [
+    (Decimal("15000.00"), '"15000.00"'),
+    (OID, f'"{OID}"'),
+    (date(2024, 5, 1), '"2024-05-01"'),
+    (datetime(2024, 5, 1, 12, 30), '"2024-05-01T12:30:00"'),
+    (datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc), '"2024-05-01T12:30:00Z"'),
+    (datetime(2024, 5, 1, 12, 30, tzinfo=timezone(timedelta(hours=3))), '"2024-05-01T12:30:00+03:00"'),
+    ("Велосипед", '"Велосипед"'),
+])
+def test_dumps_matches_pydantic_json_mode(value, expected):
+    assert dumps(value).decode("utf-8") == expected
+
+
+def test_round_trip():
+    value = {"title": "Велосипед", "photo": ["https://img/1.jpg"], "views": 3, "price": None}
+
+    assert loads(dumps(value)) == value
+
+
+def test_unsupported_type_is_rejected():
+    with pytest.raises(TypeError):
+        dumps(object())
+
+
+def test_page_dict_serializes_like_the_pydantic_schema():
+    page: Page = Page(items=[Advertisement.from_row(make_row(number)) for number in range(3)], next_cursor="next")
+
+    assert loads(dumps(AdvertisementPageOutput.to_dict(page))) == loads(
+        AdvertisementPageOutput.to_schema(page).model_dump_json()
+    )
+
+
+def test_aware_datetimes_serialize_like_the_pydantic_schema():
+    advertisement = Advertisement.from_row(make_row(1))
+    advertisement.approved_at = datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=timezone.utc)
+    page: Page = Page(items=[advertisement])
+
+    expected: bytes = AdvertisementPageOutput.to_schema(page).model_dump_json().encode("utf-8")
+
+    assert dumps(AdvertisementPageOutput.to_dict(page)) == expected
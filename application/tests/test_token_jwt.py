@@ -0,0 +1,62 @@
+import time
+from typing import Any
+
+import jwt
+import pytest
+
+from application.config import settings
+from application.exceptions.domain import InvalidTokenError
+from application.infrastructure.cache import TTLCache
+from application.web.services.token.token_jwt import TokenJWTService
+
+
+def issue_token(**claims: Any) -> str:
+    return jwt.encode(claims, settings.auth_jwt.PRIVATE_KEY.read_text(), algorithm=settings.auth_jwt.ALGORITHM)
+
+
+@pytest.fixture(autouse=True)
+def token_cache(monkeypatch) -> TTLCache:
+    cache: TTLCache[bytes, dict] = TTLCache(maxsize=2)
+    monkeypatch.setattr(TokenJWTService, "verified_tokens", cache)
+    return cache
+
+
+def test_verified_payload_is_cached_until_exp():
+    token: str = issue_token(sub="user", exp=int(time.time()) + 60)
+
+    assert TokenJWTService.decode_token(token)["sub"] == "user"
+    assert TokenJWTService.decode_token(token.encode())["sub"] == "user"
+
+    assert TokenJWTService.cache_stats() == {"hits": 1, "misses": 1, "size": 1, "bytes": 0}
+
+
+def test_token_without_exp_is_not_cached():
+    token: str = issue_token(sub="user")
+
+    TokenJWTService.decode_token(token)
+    TokenJWTService.decode_token(token)
+
+    assert TokenJWTService.cache_stats() == {"hits": 0, "misses": 2, "size": 0, "bytes": 0}
+
+
+def test_expired_token_is_rejected():
+    with pytest.raises(InvalidTokenError):
+        TokenJWTService.decode_token(issue_token(sub="user", exp=int(time.time()) - 60))
+
+
+def test_token_with_bad_signature_is_not_cached():
+    token: str = issue_token(sub="user", exp=int(time.time()) + 60)
+    header, payload, signature = token.split(".")
+    forged: str = ".".join([header, payload, signature[:-4] + ("AAAA" if signature[-4:] != "AAAA" else "BBBB")])
+
+    with pytest.raises(jwt.InvalidTokenError):
+        TokenJWTService.decode_token(forged)
+
+    assert TokenJWTService.cache_stats()["size"] == 0
+
+
+def test_cached_payload_is_returned_as_a_copy():
+    token: str = issue_token(sub="user", exp=int(time.time()) + 60)
+    TokenJWTService.decode_token(token)["sub"] = "admin"
+
+    assert TokenJWTService.decode_token(token)["sub"] == "user"
@@ -0,0 +1,144 @@
+import asyncio
+from typing import Any, AsyncIterator
+from uuid import UUID, uuid4
+
+import pytest
+
+from application.infrastructure.serialization import loads
+from application.services.user import user as user_module
+from application.services.user.user import UserService
+from application.web.responses import stream_json_array
+
+
+class FakeUserRepository:
+    """get_multi отдаёт только известных пользователей; пачки из blocked ждут release"""
+
+    def __init__(self, known: list[UUID], blocked: frozenset[UUID] = frozenset()):
+        self.known = set(known)
+        self.blocked = blocked
+        self.release = asyncio.Event()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.cancelled = 0
+
+    async def get_multi(self, user_oids: list[UUID]) -> list[dict[str, str]]:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.blocked.intersection(user_oids):
+                await self.release.wait()
+            await asyncio.sleep(0)
+            return [{"oid": str(user_oid)} for user_oid in user_oids if user_oid in self.known]
+
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+
+        finally:
+            self.in_flight -= 1
+
+
+class FakeUnitOfWork:
+    def __init__(self, users: FakeUserRepository):
+        self.users = users
+
+    async def __aenter__(self) -> None:
+        pass
+
+    async def __aexit__(self, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def make_service(monkeypatch):
+    def make(users: FakeUserRepository, chunk_size: int = 2, concurrency: int = 2, connections: int = 8):
+        monkeypatch.setattr(user_module, "get_unit_of_work", lambda isolated=False: FakeUnitOfWork(users))
+        monkeypatch.setattr(UserService, "LOOKUP_CHUNK_SIZE", chunk_size)
+        monkeypatch.setattr(UserService, "LOOKUP_CONCURRENCY", concurrency)
+        monkeypatch.setattr(UserService, "LOOKUP_CONNECTIONS", asyncio.Semaphore(connections))
+        return UserService(uow=FakeUnitOfWork(users))
+    return make
+
+
+async def collect_body(chunks: AsyncIterator[list[Any]]) -> bytes:
+    return b"".join([part async for part in stream_json_array(chunks)])
+
+
+def test_unique_user_oids_keeps_request_order_and_drops_duplicates():
+    first, second = uuid4(), uuid4()
+    user_oids: list[Any] = [str(second), "not-a-uuid", str(first), str(second).upper(), None, 42, str(first)]
+
+    assert UserService.unique_user_oids(user_oids) == [second, first]
+
+
+def test_unique_user_oids_all_invalid():
+    assert UserService.unique_user_oids(["", "123", "user"]) == []
+
+
+async def test_iter_users_by_ids_yields_chunks_in_request_order(make_service):
+    user_oids: list[UUID] = [uuid4() for _ in range(7)]
+    service: UserService = make_service(FakeUserRepository(known=user_oids), chunk_size=2, concurrency=3)
+
+    chunks: list[list[dict[str, str]]] = [chunk async for chunk in service.iter_users_by_ids(user_oids)]
+
+    assert [len(chunk) for chunk in chunks] == [2, 2, 2, 1]
+    assert [item["oid"] for chunk in chunks for item in chunk] == [str(user_oid) for user_oid in user_oids]
+
+
+@pytest.mark.parametrize("chunks, expected", [
+    ([], []),
+    ([[]], []),
+    ([[], [], []], []),
+    ([[{"a": 1}]], [{"a": 1}]),
+    ([[], [{"a": 1}], [], [{"a": 2}, {"a": 3}], []], [{"a": 1}, {"a": 2}, {"a": 3}]),
+])
+async def test_stream_json_array_is_valid_json(chunks, expected):
+    async def iterate() -> AsyncIterator[list[Any]]:
+        for chunk in chunks:
+            yield chunk
+
+    assert loads(await collect_body(iterate())) == expected
+
+
+async def test_streamed_body_with_unknown_ids_is_an_empty_array(make_service):
+    user_oids: list[UUID] = [uuid4() for _ in range(5)]
+    service: UserService = make_service(FakeUserRepository(known=[]))
+
+    assert await collect_body(service.iter_users_by_ids(user_oids)) == b"[]"
+
+
+async def test_streamed_body_with_all_invalid_ids_is_an_empty_array(make_service):
+    service: UserService = make_service(FakeUserRepository(known=[]))
+    user_oids: list[UUID] = service.unique_user_oids(["x", "y", "z"])
+
+    assert await collect_body(service.iter_users_by_ids(user_oids)) == b"[]"
+
+
+async def test_client_disconnect_cancels_pending_lookups(make_service):
+    user_oids: list[UUID] = [uuid4() for _ in range(6)]
+    users = FakeUserRepository(known=user_oids, blocked=frozenset(user_oids[2:]))
+    service: UserService = make_service(users, chunk_size=2, concurrency=3, connections=8)
+
+    chunks = service.iter_users_by_ids(user_oids)
+    first: list[dict[str, str]] = await chunks.__anext__()
+    # Starlette закрывает генератор тела, когда клиент отключился
+    await chunks.aclose()
+
+    assert [item["oid"] for item in first] == [str(user_oid) for user_oid in user_oids[:2]]
+    assert users.cancelled == 2
+    assert users.in_flight == 0
+    assert UserService.LOOKUP_CONNECTIONS._value == 8
+
+
+async def test_lookups_share_the_process_wide_connection_limit(make_service):
+    user_oids: list[UUID] = [uuid4() for _ in range(40)]
+    users = FakeUserRepository(known=user_oids)
+    service: UserService = make_service(users, chunk_size=2, concurrency=4, connections=3)
+
+    async def lookup() -> list[dict[str, str]]:
+        return [item async for chunk in service.iter_users_by_ids(user_oids) for item in chunk]
+
+    results: list[list[dict[str, str]]] = await asyncio.gather(*(lookup() for _ in range(4)))
+
+    assert users.max_in_flight == 3
+    assert all(len(result) == len(user_oids) for result in results)
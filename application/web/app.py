@@ -1,16 +1,44 @@
 import logging
+from contextlib import asynccontextmanager
 from datetime import datetime
+from typing import AsyncIterator, Optional
 
+from aiohttp import web
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi import FastAPI
 from fastapi.responses import JSONResponse
 
 from application.exceptions.base import ApplicationException
-from application.infrastructure.middlewares import AuthMiddleware
+from application.config import settings
+from application.infrastructure.database import engine, replica_engine
+from application.infrastructure.instrumentation import register_engine_events
+from application.infrastructure.serialization import JSON_BACKEND
+from application.infrastructure.middlewares import (
+    AuthMiddleware, DBSessionMiddleware, InstrumentationMiddleware, MetricsMiddleware
+)
+from application.services.ad.views import view_counter
 from application.web import router as router_v1
+from application.web.metrics import start_web_metrics_server
+from application.web.responses import FastJSONResponse
 
 logger = logging.getLogger(__name__)
-app = FastAPI(version="1.1.1", title="Avido", docs_url="/api/docs", debug=True)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    logger.info(f"JSON backend: {JSON_BACKEND}")
+    metrics_runner: Optional[web.AppRunner] = None
+    if settings.monitoring.METRICS_ENABLED:
+        metrics_runner = await start_web_metrics_server()
+    view_counter.start()
+    yield
+    await view_counter.stop()
+    if metrics_runner:
+        await metrics_runner.cleanup()
+
+
+app = FastAPI(version="1.1.1", title="Avido", docs_url="/api/docs", debug=True, lifespan=lifespan,
+              default_response_class=FastJSONResponse)
 
 
 @app.exception_handler(ApplicationException)
@@ -22,6 +50,7 @@ async def application_exception_handler(exc: ApplicationException):
 
 app.include_router(router_v1, prefix="/api/v1")
 
+app.add_middleware(DBSessionMiddleware)
 app.add_middleware(AuthMiddleware)
 app.add_middleware(
     CORSMiddleware,
@@ -36,3 +65,10 @@ app.add_middleware(
         "Authorization",
     ],
 )
+
+if settings.monitoring.INSTRUMENTATION_ENABLED:
+    register_engine_events(engine, replica_engine)
+    app.add_middleware(InstrumentationMiddleware)
+
+if settings.monitoring.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
@@ -0,0 +1,25 @@
+"""
+Метрики веб-процесса: реестр отдаётся на внутреннем METRICS_PORT, публичное приложение /metrics не обслуживает
+"""
+from aiohttp import web
+
+from application.config import settings
+from application.infrastructure.metrics import LabelValues, registry, start_metrics_server
+from application.services.ad.cache import advertisement_response_cache
+from application.web.services.token.token_jwt import TokenJWTService
+
+
+def collect_cache_statistics() -> dict[LabelValues, float]:
+    caches: dict[str, dict[str, int]] = {
+        "verified_tokens": TokenJWTService.cache_stats(),
+        "advertisement_responses": advertisement_response_cache.stats(),
+    }
+    return {(name, stat): value for name, stats in caches.items() for stat, value in stats.items()}
+
+
+registry.gauge("app_cache", "In-process cache hits, misses, entries and bytes", ("cache", "stat"),
+               collect=collect_cache_statistics)
+
+
+async def start_web_metrics_server() -> web.AppRunner:
+    return await start_metrics_server(settings.monitoring.METRICS_HOST, settings.monitoring.METRICS_PORT)
@@ -0,0 +1,34 @@
+from typing import Any, AsyncIterator
+
+from fastapi.responses import JSONResponse
+
+from application.infrastructure.instrumentation import track
+from application.infrastructure.serialization import dumps
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse на быстром сериализаторе (orjson/msgspec, иначе stdlib).
+    Отданный напрямую из эндпоинта, минует повторную валидацию response_model.
+    """
+
+    def render(self, content: Any) -> bytes:
+        with track("serialization_time"):
+            return dumps(content)
+
+
+async def stream_json_array(chunks: AsyncIterator[list[Any]]) -> AsyncIterator[bytes]:
+    """
+    JSON-массив по частям: каждая пачка сериализуется и отправляется сразу, весь результат в памяти не собирается
+    """
+    yield b"["
+    first: bool = True
+    async for chunk in chunks:
+        if not chunk:
+            continue
+
+        with track("serialization_time"):
+            body: bytes = dumps(chunk)[1:-1]
+        yield body if first else b"," + body
+        first = False
+    yield b"]"
@@ -0,0 +1,61 @@
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+from starlette.datastructures import Headers
+
+
+def make_etag(oid: str, updated_at: datetime) -> str:
+    """
+    Слабый ETag из версии объявления вместе с автором и категорией (самый поздний updated_at из трёх):
+    он означает то же содержимое, а не побайтово тот же ответ
+    """
+    version: int = int(_as_utc(updated_at).timestamp() * 1_000_000)
+    return f'W/"{oid}-{version:x}"'
+
+
+def validator_headers(etag: str, updated_at: datetime) -> dict[str, str]:
+    return {
+        "ETag": etag,
+        "Last-Modified": format_datetime(_as_utc(updated_at).replace(microsecond=0), usegmt=True),
+        "Cache-Control": "no-cache",
+    }
+
+
+def is_not_modified(headers: Headers, etag: str, updated_at: datetime) -> bool:
+    """
+    RFC 9110: при наличии If-None-Match сравниваются только ETag (слабое сравнение),
+    If-Modified-Since учитывается лишь без него
+    """
+    if_none_match: Optional[str] = headers.get("if-none-match")
+    if if_none_match is not None:
+        candidates: set[str] = {_opaque_tag(tag) for tag in if_none_match.split(",")}
+        return "*" in candidates or _opaque_tag(etag) in candidates
+
+    if_modified_since: Optional[str] = headers.get("if-modified-since")
+    if if_modified_since is None:
+        return False
+
+    try:
+        since: datetime = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+
+    if since.tzinfo is None:
+        return False
+
+    return _as_utc(updated_at).replace(microsecond=0) <= since
+
+
+def has_conditions(headers: Headers) -> bool:
+    return "if-none-match" in headers or "if-modified-since" in headers
+
+
+def _opaque_tag(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def _as_utc(value: datetime) -> datetime:
+    """В БД время хранится в UTC без таймзоны"""
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
@@ -1,10 +1,13 @@
+import hashlib
 from abc import ABC, abstractmethod
+from typing import Optional
 
 import jwt
 from fastapi import Request
 
 from application.config import settings
 from application.exceptions.domain import InvalidTokenError
+from application.infrastructure.cache import TTLCache
 
 ACCESS_TOKEN_TYPE = "access"
 
@@ -21,15 +24,35 @@ class TokenJWTService(TokenAbstractService):
     """
     PUBLIC_KEY: str = settings.auth_jwt.PUBLIC_KEY.read_text()
     ALGORITHM: str = settings.auth_jwt.ALGORITHM
+    # PEM разбирается один раз при старте, а не в каждом jwt.decode
+    PUBLIC_KEY_OBJECT = jwt.algorithms.get_default_algorithms()[ALGORITHM].prepare_key(PUBLIC_KEY)
+    # Проверенные payload по sha256 токена, запись живёт до exp самого токена
+    verified_tokens: TTLCache[bytes, dict] = TTLCache(maxsize=settings.auth_jwt.TOKEN_CACHE_SIZE)
 
     @classmethod
     def decode_token(cls, token: bytes | str) -> dict:
+        """
+        Вызывающий получает свою копию payload: изменения в ней не попадают в кэш и в другие запросы
+        """
+        token_hash: bytes = hashlib.sha256(token.encode() if isinstance(token, str) else token).digest()
+        payload: Optional[dict] = cls.verified_tokens.get(token_hash)
+        if payload is not None:
+            return dict(payload)
+
         try:
-            return jwt.decode(jwt=token, key=cls.PUBLIC_KEY, algorithms=[cls.ALGORITHM])
+            payload = jwt.decode(jwt=token, key=cls.PUBLIC_KEY_OBJECT, algorithms=[cls.ALGORITHM])
 
         except jwt.ExpiredSignatureError:
             raise InvalidTokenError
 
+        if payload.get("exp"):
+            cls.verified_tokens.set(token_hash, payload, expires_at=float(payload["exp"]))
+        return dict(payload)
+
+    @classmethod
+    def cache_stats(cls) -> dict[str, int]:
+        return cls.verified_tokens.stats()
+
 
 class TokenManager:
     """
@@ -40,15 +63,20 @@ class TokenManager:
         self.token_service = token_service
 
     async def get_current_token_payload(self, request: Request) -> dict:
+        return self.get_token_payload(authorization=request.headers.get('Authorization'))
+
+    def get_token_payload(self, authorization: str | None) -> dict:
+        """
+        Payload из значения заголовка Authorization, без объекта Request (для ASGI middleware)
+        """
         try:
-            payload: str | None = request.headers.get('Authorization')
-            if not payload:
+            if not authorization:
                 raise InvalidTokenError
 
-            token: str = payload.split()[1]
+            token: str = authorization.split()[1]
             return self.token_service.decode_token(token=token)
 
-        except jwt.InvalidTokenError:
+        except (jwt.InvalidTokenError, IndexError):
             raise InvalidTokenError
 
     @staticmethod
@@ -1,34 +1,86 @@
+from datetime import datetime
 from decimal import Decimal
-from typing import Annotated
+from typing import Annotated, Awaitable, Callable, Hashable, Optional
 
-from fastapi import APIRouter, status, Query, Depends
+from fastapi import APIRouter, status, Query, Depends, Request, Response
 
+from application.context import get_payload_current_user
+from application.domain.entities.ad import Advertisement as DomainAdvertisement
+from application.domain.value_objects.ad import Version
+from application.domain.value_objects.pagination import Page
+from application.infrastructure.instrumentation import track
+from application.infrastructure.serialization import dumps
 from application.services.ad import AdvertisementService, get_ad_service
+from application.services.ad.cache import advertisement_response_cache
 from application.services.category_ad import CategoryAdService, get_category_ad_service
 from application.services.user import UserService, get_user_service
-from application.web.views.ad.schemas import AdvertisementOutput, AdvertisementInput, AdvertisementInputUpdate
+from application.web.responses import FastJSONResponse
+from application.web.services.conditional.conditional import (
+    has_conditions, is_not_modified, make_etag, validator_headers
+)
+from application.web.views.ad.schemas import (
+    AdvertisementOutput, AdvertisementInput,
+    AdvertisementInputUpdate, AdvertisementPageOutput
+)
 
 router = APIRouter(prefix="/advertisement",
                    tags=["Advertisement"])
 
 
+async def page_response(cache_key: Hashable,
+                        load_page: Callable[[], Awaitable[Page[DomainAdvertisement]]]) -> Response:
+    """
+    Ответ со страницей объявлений; анонимные запросы обслуживаются из кэша готовых JSON-байтов
+    """
+    cacheable: bool = not get_payload_current_user()
+    body: Optional[bytes] = advertisement_response_cache.get(cache_key) if cacheable else None
+    if body is None:
+        generation: int = advertisement_response_cache.generation
+        page: Page[DomainAdvertisement] = await load_page()
+        with track("serialization_time"):
+            body = dumps(AdvertisementPageOutput.to_dict(page))
+        if cacheable:
+            advertisement_response_cache.put(cache_key, body, generation)
+
+    return Response(content=body, media_type="application/json")
+
+
 @router.get(path="/",
             summary="Получение объявления",
             status_code=status.HTTP_200_OK,
             response_model=AdvertisementOutput)
 async def get_advertisement(ad_service: Annotated[AdvertisementService, Depends(get_ad_service)],
-                            advertisement_oid: str) -> AdvertisementOutput:
-    advertisement = await ad_service.get_advertisement_by_id(advertisement_oid)
-    return AdvertisementOutput.to_schema(advertisement)
+                            advertisement_oid: str,
+                            request: Request) -> Response:
+    if has_conditions(request.headers):
+        version: Optional[Version] = await ad_service.get_published_version(advertisement_oid)
+        if version:
+            etag: str = make_etag(version.oid, version.updated_at)
+            if is_not_modified(request.headers, etag, version.updated_at):
+                ad_service.register_view(version.oid)
+                return Response(status_code=status.HTTP_304_NOT_MODIFIED,
+                                headers=validator_headers(etag, version.updated_at))
+
+    advertisement = await ad_service.view_advertisement_by_id(advertisement_oid)
+    headers: Optional[dict[str, str]] = None
+    updated_at: Optional[datetime] = advertisement.version_updated_at()
+    if updated_at:
+        headers = validator_headers(make_etag(advertisement.oid, updated_at), updated_at)
+
+    return FastJSONResponse(content=AdvertisementOutput.to_dict(advertisement), headers=headers)
 
 
 @router.get(path="/all",
             summary="Получение всех объявлений",
             status_code=status.HTTP_200_OK,
-            response_model=list[AdvertisementOutput])
-async def get_all_ad(ad_service: Annotated[AdvertisementService, Depends(get_ad_service)]) -> list[AdvertisementOutput]:
-    advertisements = await ad_service.get_all_advertisements()
-    return [AdvertisementOutput.to_schema(ad) for ad in advertisements]
+            response_model=AdvertisementPageOutput)
+async def get_all_ad(ad_service: Annotated[AdvertisementService, Depends(get_ad_service)],
+                     limit: int = Query(default=20, ge=1, le=100),
+                     cursor: str = Query(default=None)) -> Response:
+    return await page_response(
+        cache_key=advertisement_response_cache.make_key("all", limit=limit, cursor=cursor),
+        load_page=lambda: ad_service.get_all_advertisements(limit=limit, cursor=cursor)
+    )
 
 
 @router.post(path="/",
@@ -91,17 +143,24 @@ async def update_status_advertisement(ad_service: Annotated[AdvertisementService
 @router.get(path="/search",
             summary="Поиск объявлений по фильтрам",
             status_code=status.HTTP_200_OK,
-            response_model=list[AdvertisementOutput])
+            response_model=AdvertisementPageOutput)
 async def search_advertisement(ad_service: Annotated[AdvertisementService, Depends(get_ad_service)],
                                price_from: Decimal = Query(ge=0, default=0, decimal_places=2),
                                price_to: Decimal = Query(ge=0, default=0, decimal_places=2),
                                category: str = Query(default=None),
-                               city: str = Query(default=None)) -> list[AdvertisementOutput]:
+                               city: str = Query(default=None),
+                               q: str = Query(default=None, min_length=1, max_length=200,
+                                              description="Полнотекстовый поиск по названию и описанию"),
+                               limit: int = Query(default=20, ge=1, le=100),
+                               cursor: str = Query(default=None)) -> Response:
     search_params = {
         "city": city,
         "category": category,
         "price_to": price_to,
-        "price_from": price_from
+        "price_from": price_from,
+        "q": q
     }
-    advertisements = await ad_service.search_advertisements_by_filters(**search_params)
-    return [AdvertisementOutput.to_schema(ad) for ad in advertisements]
+    return await page_response(
+        cache_key=advertisement_response_cache.make_key("search", limit=limit, cursor=cursor, **search_params),
+        load_page=lambda: ad_service.search_advertisements_by_filters(limit=limit, cursor=cursor, **search_params)
+    )
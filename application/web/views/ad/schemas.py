@@ -1,12 +1,13 @@
 from datetime import datetime
 from decimal import Decimal
-from typing import Optional
+from typing import Any, Optional
 
 from pydantic import BaseModel, Field as f, field_validator
 
 from application.domain.entities.ad import Advertisement as DomainAdvertisement
 from application.domain.entities.category_ad import Category as DomainCategory
 from application.domain.entities.user import User as DomainUser
+from application.domain.value_objects.pagination import Page
 from application.exceptions.domain import PhotoValidationError
 from application.web.views.category_ad.schemas import CategoryOutput
 from application.web.views.user.schemas import UserOutput
@@ -57,11 +58,44 @@ class AdvertisementOutput(AdvertisementInput):
             city=ad.city,
             description=ad.description,
             price=ad.price,
-            photo=ad.photo,
+            photo=ad.photo.value,
             status=ad.status.name,
             approved_at=ad.approved_at,
             author=UserOutput.to_schema(ad.author),
             category=CategoryOutput.to_schema(ad.category)
         )
 
+    @staticmethod
+    def to_dict(ad: DomainAdvertisement) -> dict[str, Any]:
+        """Та же форма, что у to_schema, но обычным dict без построения и валидации моделей"""
+        return {
+            "title": ad.title,
+            "city": ad.city,
+            "description": ad.description,
+            "price": ad.price,
+            "photo": ad.photo.value,
+            "author": UserOutput.to_dict(ad.author),
+            "category": CategoryOutput.to_dict(ad.category),
+            "oid": ad.oid,
+            "status": ad.status.name,
+            "approved_at": ad.approved_at
+        }
+
+
+class AdvertisementPageOutput(BaseModel):
+    items: list[AdvertisementOutput] = f(title="Объявления")
+    next_cursor: str | None = f(title="Курсор следующей страницы", default=None)
 
+    @staticmethod
+    def to_schema(page: Page[DomainAdvertisement]) -> "AdvertisementPageOutput":
+        return AdvertisementPageOutput(
+            items=[AdvertisementOutput.to_schema(ad) for ad in page.items],
+            next_cursor=page.next_cursor
+        )
+
+    @staticmethod
+    def to_dict(page: Page[DomainAdvertisement]) -> dict[str, Any]:
+        return {
+            "items": [AdvertisementOutput.to_dict(ad) for ad in page.items],
+            "next_cursor": page.next_cursor
+        }
@@ -1,3 +1,5 @@
+from typing import Any
+
 from pydantic import BaseModel, Field as f
 
 from application.domain.entities.category_ad import Category as DomainCategory
@@ -23,3 +25,13 @@ class CategoryOutput(CategoryInput):
             code=category.code,
             description=category.description
         )
+
+    @staticmethod
+    def to_dict(category: DomainCategory) -> dict[str, Any]:
+        """Та же форма, что у to_schema, но обычным dict без построения и валидации модели"""
+        return {
+            "title": category.title,
+            "description": category.description,
+            "oid": category.oid,
+            "code": category.code
+        }
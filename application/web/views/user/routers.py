@@ -1,11 +1,13 @@
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, status
+from fastapi.responses import StreamingResponse
 
 from application.context import get_payload_current_user
 from application.exceptions.domain import AccessDeniedError
 
 from application.services.user import UserService, get_user_service
+from application.web.responses import FastJSONResponse, stream_json_array
 from application.web.views.user.schemas import UserOutput
 
 
@@ -44,9 +46,18 @@ async def get_current_auth_user(current_user: Annotated[dict, Depends(get_payloa
              response_model=list[UserOutput],
              status_code=status.HTTP_200_OK)
 async def search_users(user_service: Annotated[UserService, Depends(get_user_service)],
-                       user_oids: list[str]) -> list[UserOutput]:
-    users = await user_service.get_multi_users_by_id(user_oids)
-    return [UserOutput.to_schema(user) for user in users]
+                       user_oids: list[str]) -> FastJSONResponse | StreamingResponse:
+    unique_oids = user_service.unique_user_oids(user_oids)
+    if len(unique_oids) <= user_service.LOOKUP_CHUNK_SIZE:
+        users = await user_service.get_multi_users_by_id(unique_oids)
+        return FastJSONResponse(content=[UserOutput.to_dict(user) for user in users])
+
+    # Пакетный режим для больших списков: параллельные запросы пачками и потоковый ответ
+    chunks = (
+        [UserOutput.to_dict(user) for user in users]
+        async for users in user_service.iter_users_by_ids(unique_oids)
+    )
+    return StreamingResponse(stream_json_array(chunks), media_type="application/json")
 
 
 @router.delete(path="/",
@@ -1,9 +1,10 @@
-import re
+from typing import Any
 
 from pydantic import BaseModel, field_validator, Field as f
 
 from application.constants import EMAIL_ERROR
 from application.domain.entities.user import User as DomainUser
+from application.domain.value_objects.user import EMAIL_PATTERN, FULL_NAME_PATTERN
 from application.exceptions.domain import (
     FullNameValidationError, PhoneValidationError,
     EmailValidationError
@@ -26,8 +27,7 @@ class UserBase(BaseModel):
     @field_validator("first_name", "last_name", "middle_name")
     @classmethod
     def validate_full_name(cls, value_field: str) -> str:
-        username_regex = r"^[А-ЯЁ][а-яё]+$|^[A-Z][a-z]+$"
-        if not re.match(username_regex, value_field) or len(value_field) > 100:
+        if len(value_field) > 100 or not FULL_NAME_PATTERN.match(value_field):
             raise FullNameValidationError(value_field)
         return value_field
 
@@ -41,9 +41,8 @@ class UserBase(BaseModel):
     @field_validator("email")
     @classmethod
     def validate_email(cls, email):
-        EMAIL_REGEX = r"^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$"
         # Проверка формата email
-        if not re.match(EMAIL_REGEX, email):
+        if not EMAIL_PATTERN.match(email):
             raise EmailValidationError(EMAIL_ERROR)
         return email
 
@@ -73,3 +72,18 @@ class UserOutput(UserBase):
             role=user.role.name,
             status=user.status.value
         )
+
+    @staticmethod
+    def to_dict(user: DomainUser) -> dict[str, Any]:
+        """Та же форма, что у to_schema, но обычным dict без построения и валидации модели"""
+        return {
+            "first_name": user.first_name.value,
+            "last_name": user.last_name.value,
+            "middle_name": user.middle_name.value if user.middle_name else None,
+            "email": user.email.value,
+            "number_phone": user.number_phone.value,
+            "time_call": user.time_call,
+            "oid": user.oid,
+            "role": user.role.name,
+            "status": user.status.value
+        }